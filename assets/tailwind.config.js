@@ -0,0 +1,21 @@
+// Configuration du build Tailwind (manage.py build_assets).
+// Même thème que la configuration inline des layouts (mode CDN).
+module.exports = {
+  darkMode: 'class',
+  content: [
+    './templates/**/*.html',
+    './website/**/*.py',
+    // Classes saisies en admin, extraites de la base par build_assets
+    process.env.TAILWIND_EXTRA_CONTENT || './assets/build/db-classes.txt',
+  ],
+  theme: {
+    extend: {
+      colors: { nuit: '#051536', gold: '#ffa600' },
+      fontFamily: {
+        sans: ['Inter', 'system-ui', 'sans-serif'],
+        heading: ['Poppins', 'system-ui', 'sans-serif'],
+      },
+      boxShadow: { 'soft-gold': '0 18px 45px rgba(255,166,0,0.18)' },
+    },
+  },
+};
@@ -16,6 +16,13 @@ if [ "${RUN_MIGRATIONS}" = "1" ]; then
   python manage.py migrate --noinput
 fi
 
+# CSS purgé + icônes réduites (lit les icônes saisies en base) ; en cas d'échec
+# les templates retombent sur les CDN.
+if [ "${RUN_BUILD_ASSETS}" = "1" ]; then
+  echo "Building CSS assets..."
+  python manage.py build_assets || echo "build_assets failed, falling back to CDN assets"
+fi
+
 if [ "${RUN_COLLECTSTATIC}" = "1" ]; then
   echo "Running collectstatic..."
   python manage.py collectstatic --noinput
@@ -0,0 +1,11 @@
+# gunicorn.conf.py
+# Les options de ligne de commande (docker-compose.yml) restent prioritaires ;
+# ce fichier ne sert qu'aux hooks.
+
+
+def post_worker_init(worker):
+    """Compile les gabarits et amorce les caches avant la première requête."""
+    from website.warmup import warm_up
+
+    elapsed = warm_up()
+    worker.log.info("Worker %s préchauffé en %.0f ms", worker.pid, elapsed * 1000)
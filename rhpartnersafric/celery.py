@@ -0,0 +1,10 @@
+# rhpartnersafric/celery.py
+import os
+
+from celery import Celery
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "rhpartnersafric.settings")
+
+app = Celery("rhpartnersafric")
+app.config_from_object("django.conf:settings", namespace="CELERY")
+app.autodiscover_tasks()
@@ -72,6 +72,9 @@ TEMPLATES = [
                 "django.template.context_processors.request",
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
+                # Trou CSRF pour le cache de pages anonymes
+                "website.context_processors.page_cache",
+                "website.context_processors.assets",
             ],
         },
     },
@@ -136,6 +139,14 @@ STATIC_ROOT = os.path.join(BASE_DIR, "staticfiles")  # dossier cible de collects
 
 # (facultatif) si tu as un dossier /static dans le code source pour tes assets non collectés
 STATICFILES_DIRS = [os.path.join(BASE_DIR, "static")]
+
+# CSS de build (manage.py build_assets) : Tailwind purgé + sous-ensemble Font Awesome,
+# servis sous le préfixe « build/ » à la place des CDN quand BUILT_ASSETS=1.
+ASSETS_BUILD_DIR = os.environ.get("ASSETS_BUILD_DIR", os.path.join(BASE_DIR, "assets", "build"))
+TAILWIND_CLI = os.environ.get("TAILWIND_CLI", "tailwindcss")
+WEBSITE_BUILT_ASSETS = os.environ.get("BUILT_ASSETS", "0") == "1"
+if os.path.isdir(ASSETS_BUILD_DIR):
+    STATICFILES_DIRS.append(("build", ASSETS_BUILD_DIR))
 STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
@@ -153,6 +164,11 @@ CACHES = {
     }
 }
 
+# Durée de vie des blocs de contenu versionnés (home, etc.)
+WEBSITE_CONTENT_CACHE_TIMEOUT = int(os.environ.get("WEBSITE_CONTENT_CACHE_TIMEOUT", 60 * 60 * 24))
+# Pages complètes servies aux visiteurs anonymes (/, /recrutement/...)
+WEBSITE_PAGE_CACHE_TIMEOUT = int(os.environ.get("WEBSITE_PAGE_CACHE_TIMEOUT", 60 * 60))
+
 # -------------
 # Celery + Redis
 # -------------
@@ -173,6 +189,94 @@ CELERY_TIMEZONE = TIME_ZONE
 # Pour django_celery_results
 CELERY_RESULT_EXTENDED = True
 
+# Tâches périodiques (recopiées en base par le DatabaseScheduler de beat)
+CELERY_BEAT_SCHEDULE = {
+    "ingest-contact-requests": {
+        "task": "website.tasks.ingest_contact_requests",
+        "schedule": 5.0,
+    },
+    "relay-outbox": {
+        "task": "website.tasks.relay_outbox",
+        "schedule": 10.0,
+    },
+    "send-due-newsletter-campaigns": {
+        "task": "website.tasks.send_due_campaigns",
+        "schedule": 60.0,
+    },
+    "flush-newsletter-engagement": {
+        "task": "website.tasks.flush_engagement",
+        "schedule": 60.0,
+    },
+    "purge-stale-uploads": {
+        "task": "website.tasks.purge_stale_uploads",
+        "schedule": 60.0 * 60,
+    },
+    "collect-orphan-documents": {
+        "task": "website.tasks.collect_orphan_documents",
+        "schedule": 60.0 * 60 * 24,
+    },
+    "expire-job-offers": {
+        "task": "website.tasks.expire_job_offers",
+        "schedule": 60.0 * 5,
+    },
+}
+
+# Demandes de contact : flux Redis + insertion par lots (website/ingest.py)
+WEBSITE_CONTACT_WRITE_BEHIND = os.environ.get("CONTACT_WRITE_BEHIND", "1") == "1"
+WEBSITE_CONTACT_BATCH_SIZE = int(os.environ.get("CONTACT_BATCH_SIZE", "200"))
+WEBSITE_CONTACT_MAX_BATCHES = 50
+
+# -------------
+# Email (envoyés uniquement via la boîte d'envoi, website/outbox.py)
+# -------------
+EMAIL_BACKEND = os.environ.get("EMAIL_BACKEND", "django.core.mail.backends.smtp.EmailBackend")
+EMAIL_HOST = os.environ.get("EMAIL_HOST", "localhost")
+EMAIL_PORT = int(os.environ.get("EMAIL_PORT", "25"))
+EMAIL_HOST_USER = os.environ.get("EMAIL_HOST_USER", "")
+EMAIL_HOST_PASSWORD = os.environ.get("EMAIL_HOST_PASSWORD", "")
+EMAIL_USE_TLS = os.environ.get("EMAIL_USE_TLS", "0") == "1"
+EMAIL_TIMEOUT = 20
+EMAIL_FILE_PATH = os.environ.get("EMAIL_FILE_PATH", str(BASE_DIR / "tmp" / "emails"))
+DEFAULT_FROM_EMAIL = os.environ.get("DEFAULT_FROM_EMAIL", "RH Partners Afric <no-reply@rhpartnersafric.com>")
+
+# URL publique du site (liens absolus des emails : désinscription, suivi)
+WEBSITE_BASE_URL = os.environ.get("SITE_URL", "https://rhpartnersafric.com").rstrip("/")
+
+# Consultants prévenus des nouvelles demandes de contact (séparés par des virgules)
+WEBSITE_CONTACT_NOTIFY_EMAILS = [
+    email.strip() for email in os.environ.get("CONTACT_NOTIFY_EMAILS", "").split(",") if email.strip()
+]
+WEBSITE_OUTBOX_BATCH_SIZE = 100
+WEBSITE_OUTBOX_MAX_BATCHES = 20
+WEBSITE_OUTBOX_MAX_ATTEMPTS = 8
+
+# Newsletter : taille des tranches (une tâche Celery chacune) et plafond
+# d'envois par minute, tous workers confondus (0 = illimité)
+WEBSITE_NEWSLETTER_CHUNK_SIZE = int(os.environ.get("NEWSLETTER_CHUNK_SIZE", "500"))
+WEBSITE_NEWSLETTER_RATE_PER_MINUTE = int(os.environ.get("NEWSLETTER_RATE_PER_MINUTE", "600"))
+# Reprise d'un envoi refusée tant qu'une tranche progresse ou a été planifiée
+# depuis moins de ce délai (secondes)
+WEBSITE_NEWSLETTER_RESUME_AFTER = 15 * 60
+# Pixel d'ouverture + redirection des liens (website/tracking.py)
+WEBSITE_NEWSLETTER_TRACKING = os.environ.get("NEWSLETTER_TRACKING", "1") == "1"
+
+# Documents de candidature téléversés par morceaux (website/uploads.py)
+WEBSITE_UPLOAD_MAX_SIZE = int(os.environ.get("UPLOAD_MAX_SIZE", 10 * 1024 * 1024))
+WEBSITE_UPLOAD_CHUNK_SIZE = 512 * 1024  # taille utilisée par le navigateur
+WEBSITE_UPLOAD_CHUNK_MAX = 2 * 1024 * 1024  # plafond accepté par PATCH
+WEBSITE_UPLOAD_TTL = 60 * 60 * 24  # téléversements inactifs purgés après 24 h
+WEBSITE_UPLOAD_MAX_SESSIONS_PER_CLIENT = 10  # téléversements ouverts par adresse IP
+# Octets annoncés par l'ensemble des téléversements en cours (disque du volume média)
+WEBSITE_UPLOAD_MAX_PENDING_BYTES = int(os.environ.get("UPLOAD_MAX_PENDING_BYTES", 2 * 1024 ** 3))
+# Proxys inverses devant gunicorn : l'adresse du client est lue dans X-Forwarded-For
+WEBSITE_TRUSTED_PROXY_HOPS = int(os.environ.get("TRUSTED_PROXY_HOPS", "0"))
+# Formulaire de candidature envoyé d'un bloc (sans JavaScript) : CV + lettre
+WEBSITE_APPLICATION_MAX_REQUEST_SIZE = 2 * WEBSITE_UPLOAD_MAX_SIZE + 256 * 1024
+# Extraction du texte des documents (website/extraction.py), dans un
+# sous-processus : durée maximale par document (secondes) et mémoire (octets)
+WEBSITE_TEXT_EXTRACTION_TIMEOUT = int(os.environ.get("TEXT_EXTRACTION_TIMEOUT", "30"))
+WEBSITE_TEXT_EXTRACTION_MEMORY = int(os.environ.get("TEXT_EXTRACTION_MEMORY", 512 * 1024 * 1024))
+
 # -------------
 # REST Framework
 # -------------
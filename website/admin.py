@@ -2,9 +2,28 @@ from django.contrib import admin
 
 # Register your models here.
 # website/admin.py
-from django.contrib import admin
+import io
+
+from django.conf import settings
+from django.contrib import admin, messages
+from django.contrib.admin.views.main import ORDER_VAR, ChangeList
+from django.core.exceptions import PermissionDenied
+from django.http import FileResponse, Http404, StreamingHttpResponse
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
+from django.urls import path, reverse
+from django.utils import timezone
+from django.utils.formats import date_format
+from django.utils.html import format_html, format_html_join
+
 from .models import Service, PricingPlan, Testimonial, FAQ, ContactRequest, NewsletterCampaign, JobOffer, \
-    JobApplication, NewsletterSubscriber
+    JobApplication, NewsletterSubscriber, HeroSlide, OutboxEmail, CampaignEngagement
+from .forms import SubscriberImportForm
+from .documents import DOCUMENT_FIELDS
+from .exports import iter_applications_zip
+from .newsletter import delivery_stats, is_delivery_active
+from .search import APPLICATIONS, JOB_OFFERS
+from .subscribers import export_active_subscribers, import_subscribers
 
 
 class BaseTimestampedAdmin(admin.ModelAdmin):
@@ -13,6 +32,28 @@ class BaseTimestampedAdmin(admin.ModelAdmin):
     ordering = ("-created_at",)
 
 
+class RankedSearchChangeList(ChangeList):
+    """Résultats d'une recherche plein texte triés par pertinence, sauf tri choisi par colonne."""
+
+    def get_ordering(self, request, queryset):
+        if self.query.strip() and ORDER_VAR not in self.params:
+            return ["-rank", "-pk"]
+        return super().get_ordering(request, queryset)
+
+
+class FullTextSearchAdmin(BaseTimestampedAdmin):
+    """Recherche de l'admin déléguée à un index plein texte (search.py)."""
+    search_index = None
+
+    def get_changelist(self, request, **kwargs):
+        return RankedSearchChangeList
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return queryset, False
+        return self.search_index.search(search_term, queryset, highlight=False), False
+
+
 @admin.register(Service)
 class ServiceAdmin(BaseTimestampedAdmin):
     list_display = (
@@ -124,6 +165,52 @@ class FAQAdmin(BaseTimestampedAdmin):
     )
 
 
+@admin.register(HeroSlide)
+class HeroSlideAdmin(BaseTimestampedAdmin):
+    list_display = ("pair_key", "position", "title", "order", "is_active", "updated_at")
+    list_filter = ("is_active", "position", "theme_variant")
+    search_fields = ("pair_key", "title", "highlighted_text", "visual_title")
+    list_editable = ("order", "is_active")
+    ordering = ("order", "pair_key", "position")
+    fieldsets = (
+        (None, {
+            "fields": ("pair_key", "position", "order", "is_active", "theme_variant")
+        }),
+        ("Texte", {
+            "fields": ("badge_label", "badge_icon", "title", "highlighted_text", "subtitle"),
+        }),
+        ("Boutons", {
+            "fields": (
+                ("primary_label", "primary_url", "primary_icon"),
+                ("secondary_label", "secondary_url", "secondary_icon"),
+            ),
+            "classes": ("collapse",),
+        }),
+        ("Chiffres clés", {
+            "fields": (("stat_1_value", "stat_1_label"), ("stat_2_value", "stat_2_label"),
+                       ("stat_3_value", "stat_3_label")),
+            "classes": ("collapse",),
+        }),
+        ("Visuel", {
+            "fields": ("image", "visual_title", "visual_subtitle", "visual_badge"),
+        }),
+        ("Métadonnées", {
+            "fields": ("created_at", "updated_at"),
+            "classes": ("collapse",),
+        }),
+    )
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if obj.is_active and obj.partner is None:
+            self.message_user(
+                request,
+                f"La paire « {obj.pair_key} » est incomplète : elle ne sera affichée "
+                f"qu'une fois sa slide texte et sa slide visuelle créées.",
+                level=messages.WARNING,
+            )
+
+
 @admin.register(ContactRequest)
 class ContactRequestAdmin(BaseTimestampedAdmin):
     list_display = (
@@ -162,15 +249,54 @@ class NewsletterSubscriberAdmin(admin.ModelAdmin):
     search_fields = ("email", "full_name")
     date_hierarchy = "created_at"
     list_editable = ("is_active",)
+    change_list_template = "admin/website/newslettersubscriber/change_list.html"
+
+    def get_urls(self):
+        urls = [
+            path("import/", self.admin_site.admin_view(self.import_view), name="website_newslettersubscriber_import"),
+            path("export/", self.admin_site.admin_view(self.export_view), name="website_newslettersubscriber_export"),
+        ]
+        return urls + super().get_urls()
+
+    def import_view(self, request):
+        if not self.has_add_permission(request):
+            raise PermissionDenied
+        form = SubscriberImportForm(request.POST or None, request.FILES or None)
+        if request.method == "POST" and form.is_valid():
+            lines = io.TextIOWrapper(form.cleaned_data["file"].file, encoding="utf-8-sig", newline="")
+            stats = import_subscribers(lines)
+            self.message_user(
+                request,
+                f"Import terminé : {stats['inserted']} ajouté(s), {stats['reactivated']} réactivé(s), "
+                f"{stats['unchanged']} déjà actif(s), {stats['invalid']} ligne(s) invalide(s).",
+                level=messages.WARNING if stats["invalid"] else messages.SUCCESS,
+            )
+            return redirect("admin:website_newslettersubscriber_changelist")
+        context = {
+            **self.admin_site.each_context(request),
+            "opts": self.model._meta,
+            "title": "Importer des abonnés (CSV)",
+            "form": form,
+        }
+        return TemplateResponse(request, "admin/website/newslettersubscriber/import.html", context)
+
+    def export_view(self, request):
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        response = StreamingHttpResponse(export_active_subscribers(), content_type="text/csv; charset=utf-8")
+        filename = f"abonnes-actifs-{timezone.localdate():%Y%m%d}.csv"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
 
 
 @admin.register(NewsletterCampaign)
 class NewsletterCampaignAdmin(admin.ModelAdmin):
-    list_display = ("title", "subject", "status", "scheduled_at", "sent_at", "created_at")
+    list_display = ("title", "subject", "status", "scheduled_at", "sent_at", "recipients_total", "created_at")
     list_filter = ("status", "scheduled_at", "created_at")
     search_fields = ("title", "subject", "body_html")
     date_hierarchy = "scheduled_at"
-    actions = ["mark_as_scheduled", "mark_as_draft"]
+    readonly_fields = ("delivery_started_at", "delivery_progress", "engagement_summary")
+    actions = ["mark_as_scheduled", "mark_as_draft", "send_now"]
 
     def mark_as_scheduled(self, request, queryset):
         updated = queryset.update(status=NewsletterCampaign.STATUS_SCHEDULED)
@@ -179,19 +305,73 @@ class NewsletterCampaignAdmin(admin.ModelAdmin):
     mark_as_scheduled.short_description = "Marquer comme planifiées"
 
     def mark_as_draft(self, request, queryset):
+        # Sur une campagne en cours d'envoi, les tranches restantes s'arrêtent.
         updated = queryset.update(status=NewsletterCampaign.STATUS_DRAFT)
         self.message_user(request, f"{updated} campagne(s) repassée(s) en brouillon.")
 
     mark_as_draft.short_description = "Repasser en brouillon"
 
+    def send_now(self, request, queryset):
+        from .tasks import send_newsletter_campaign
+
+        campaigns = list(queryset.exclude(status=NewsletterCampaign.STATUS_SENT).values_list("pk", flat=True))
+        # Un envoi qui progresse encore n'est pas relancé (start_delivery le refuserait)
+        active = [campaign_id for campaign_id in campaigns if is_delivery_active(campaign_id)]
+        for campaign_id in campaigns:
+            if campaign_id not in active:
+                send_newsletter_campaign.delay(campaign_id)
+        self.message_user(request, f"Envoi lancé (ou repris) pour {len(campaigns) - len(active)} campagne(s).")
+        if active:
+            self.message_user(
+                request,
+                f"{len(active)} campagne(s) ignorée(s) : envoi en cours, reprise possible après "
+                f"{settings.WEBSITE_NEWSLETTER_RESUME_AFTER // 60} minutes sans progression.",
+                level=messages.WARNING,
+            )
+
+    send_now.short_description = "Envoyer maintenant / reprendre l'envoi"
+
+    @admin.display(description="Progression de l'envoi")
+    def delivery_progress(self, obj):
+        if obj.pk is None or obj.delivery_started_at is None:
+            return "—"
+        stats = delivery_stats(obj)
+        rate = f"{stats['rate']:.1f} msg/s" if stats["rate"] else "—"
+        return (
+            f"{stats['sent']} / {obj.recipients_total} envoyés, {stats['failed']} échec(s) · "
+            f"tranches {obj.chunks_done}/{obj.chunks_total} · débit moyen {rate}"
+        )
+
+    @admin.display(description="Ouvertures & clics")
+    def engagement_summary(self, obj):
+        engagement = CampaignEngagement.objects.filter(campaign_id=obj.pk).first() if obj.pk else None
+        if engagement is None:
+            return "—"
+        rate = ""
+        if obj.recipients_total:
+            rate = f" ({engagement.unique_opens / obj.recipients_total:.0%} d'ouverture)"
+        links = obj.link_clicks.all()[:5]
+        return format_html(
+            "{} ouvertures, {} ouvreurs uniques{}<br>{} clics, {} cliqueurs uniques{}"
+            "<br><small>Mis à jour le {} (report toutes les minutes)</small>",
+            engagement.opens, engagement.unique_opens, rate,
+            engagement.clicks, engagement.unique_clicks,
+            format_html_join("", "<br>• {} : {}", ((link.url, link.clicks) for link in links)),
+            date_format(timezone.localtime(engagement.updated_at), "DATETIME_FORMAT"),
+        )
+
 
 @admin.register(JobOffer)
-class JobOfferAdmin(BaseTimestampedAdmin):
+class JobOfferAdmin(FullTextSearchAdmin):
     list_display = ("title", "location", "contract_type", "is_published", "published_at", "closing_date")
     list_filter = ("is_published", "contract_type", "location")
-    search_fields = ("title", "short_description", "description")
+    # Recherche plein texte indexée (search.py) au lieu de ILIKE sur la description
+    search_fields = ("title",)
+    search_index = JOB_OFFERS
+    search_help_text = "Recherche plein texte : titre, résumé et description."
     prepopulated_fields = {"slug": ("title",)}
     list_editable = ("is_published",)
+    actions = ["export_applications"]
     fieldsets = (
         (None, {
             "fields": ("title", "slug", "short_description", "description")
@@ -205,12 +385,32 @@ class JobOfferAdmin(BaseTimestampedAdmin):
         }),
     )
 
+    def export_applications(self, request, queryset):
+        if not request.user.has_perm("website.view_jobapplication"):
+            raise PermissionDenied
+        if queryset.count() != 1:
+            self.message_user(request, "Sélectionner une seule offre à exporter.", level=messages.WARNING)
+            return None
+        offer = queryset.get()
+        response = StreamingHttpResponse(
+            iter_applications_zip(JobApplication.objects.filter(job_offer=offer)),
+            content_type="application/zip",
+        )
+        filename = f"candidatures-{offer.slug}-{timezone.localdate():%Y%m%d}.zip"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+    export_applications.short_description = "Télécharger les candidatures (ZIP : CV, lettres et liste CSV)"
+
 
 @admin.register(JobApplication)
-class JobApplicationAdmin(BaseTimestampedAdmin):
+class JobApplicationAdmin(FullTextSearchAdmin):
     list_display = ("last_name", "first_name", "job_offer", "email", "phone", "status", "processed", "created_at")
     list_filter = ("job_offer", "status", "processed", "created_at")
-    search_fields = ("last_name", "first_name", "email", "phone", "notes")
+    # Recherche plein texte indexée : candidat, notes et texte du CV / de la lettre
+    search_fields = ("last_name",)
+    search_index = APPLICATIONS
+    search_help_text = "Recherche plein texte : nom, prénom, email, téléphone, notes, CV et lettre de motivation."
     list_editable = ("status", "processed")
     date_hierarchy = "created_at"
     fieldsets = (
@@ -218,7 +418,7 @@ class JobApplicationAdmin(BaseTimestampedAdmin):
             "fields": ("job_offer", "first_name", "last_name", "email", "phone"),
         }),
         ("Documents", {
-            "fields": ("cv", "cover_letter"),
+            "fields": ("cv_link", "cover_letter_link"),
         }),
         ("Notes & suivi", {
             "fields": ("notes", "status", "processed"),
@@ -228,3 +428,82 @@ class JobApplicationAdmin(BaseTimestampedAdmin):
             "classes": ("collapse",),
         }),
     )
+    readonly_fields = BaseTimestampedAdmin.readonly_fields + ("cv_link", "cover_letter_link")
+
+    def get_urls(self):
+        urls = [
+            path(
+                "<int:pk>/document/<str:field>/",
+                self.admin_site.admin_view(self.document_view),
+                name="website_jobapplication_document",
+            ),
+        ]
+        return urls + super().get_urls()
+
+    def document_view(self, request, pk, field):
+        """Téléchargement d'un document sous son nom d'origine (stocké sous son SHA-256)."""
+        application = self.get_object(request, pk)
+        if field not in DOCUMENT_FIELDS or application is None or not self.has_view_permission(request, application):
+            raise PermissionDenied
+        blob = getattr(application, field)
+        if blob is None:
+            raise Http404
+        filename = getattr(application, f"{field}_filename") or blob.sha256
+        return FileResponse(blob.file.open("rb"), as_attachment=True, filename=filename)
+
+    def _document_link(self, obj, field):
+        if obj is None or obj.pk is None or getattr(obj, f"{field}_id") is None:
+            return "—"
+        url = reverse("admin:website_jobapplication_document", args=[obj.pk, field])
+        return format_html('<a href="{}">{}</a>', url, getattr(obj, f"{field}_filename") or "Télécharger")
+
+    @admin.display(description="CV")
+    def cv_link(self, obj):
+        return self._document_link(obj, "cv")
+
+    @admin.display(description="Lettre de motivation")
+    def cover_letter_link(self, obj):
+        return self._document_link(obj, "cover_letter")
+
+
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(BaseTimestampedAdmin):
+    list_display = ("subject", "category", "status", "attempts", "next_attempt_at", "sent_at", "created_at")
+    list_filter = ("status", "category", "created_at")
+    search_fields = ("subject", "to", "last_error")
+    date_hierarchy = "created_at"
+    readonly_fields = (
+        "category", "from_email", "to", "reply_to", "subject", "body_text", "body_html",
+        "status", "attempts", "next_attempt_at", "last_error", "sent_at", "created_at", "updated_at",
+    )
+    actions = ["retry_now"]
+    fieldsets = (
+        (None, {
+            "fields": ("category", "from_email", "to", "reply_to", "subject"),
+        }),
+        ("Contenu", {
+            "fields": ("body_text", "body_html"),
+            "classes": ("collapse",),
+        }),
+        ("Envoi", {
+            "fields": ("status", "attempts", "next_attempt_at", "sent_at", "last_error"),
+        }),
+        ("Métadonnées", {
+            "fields": ("created_at", "updated_at"),
+            "classes": ("collapse",),
+        }),
+    )
+
+    def has_add_permission(self, request):
+        return False
+
+    def retry_now(self, request, queryset):
+        # Un email en cours d'envoi sera enregistré par le relais qui le détient
+        updated = queryset.exclude(status__in=[OutboxEmail.STATUS_SENT, OutboxEmail.STATUS_SENDING]).update(
+            status=OutboxEmail.STATUS_RETRY,
+            next_attempt_at=timezone.now(),
+            updated_at=timezone.now(),
+        )
+        self.message_user(request, f"{updated} email(s) remis dans la file d'envoi.")
+
+    retry_now.short_description = "Renvoyer maintenant"
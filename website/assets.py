@@ -0,0 +1,149 @@
+# website/assets.py
+"""
+Pipeline CSS de build (manage.py build_assets).
+
+Remplace, à l'exécution, le compilateur Tailwind du CDN et la feuille
+Font Awesome complète par :
+- un CSS Tailwind purgé et minifié (CLI Tailwind autonome), généré à partir
+  des templates, des widgets de formulaires et des classes saisies en base ;
+- un sous-ensemble Font Awesome : uniquement les règles des icônes
+  utilisées, et des polices WOFF2 réduites à ces glyphes (fontTools).
+
+Les fichiers sont écrits dans ASSETS_BUILD_DIR (préfixe statique « build/ »)
+puis hashés par collectstatic (CompressedManifestStaticFilesStorage) et
+servis en cache immuable par WhiteNoise.
+"""
+import importlib.util
+import os
+import re
+import subprocess
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+
+BUILT_CSS = "build/css/site.css"
+BUILT_ICONS_CSS = "build/css/icons.css"
+
+ICON_NAME_RE = re.compile(r"\bfa-([a-z0-9]+(?:-[a-z0-9]+)*)\b")
+ICON_RULE_SELECTOR_RE = re.compile(r"^\.fa-([a-z0-9-]+)(?::{1,2}before)?$")
+CONTENT_RE = re.compile(r'(?:content|--fa)\s*:\s*"\\([0-9a-fA-F]+)"')
+FONT_URL_RE = re.compile(r"url\(([^)]+\.woff2)\)")
+
+
+@lru_cache(maxsize=1)
+def built_assets_available():
+    """Vrai si les CSS de build sont activés et présents dans le manifeste."""
+    if not getattr(settings, "WEBSITE_BUILT_ASSETS", False):
+        return False
+    try:
+        staticfiles_storage.url(BUILT_CSS)
+        staticfiles_storage.url(BUILT_ICONS_CSS)
+    except ValueError:
+        return False
+    return True
+
+
+def content_files():
+    """Fichiers où des classes CSS peuvent apparaître (templates, widgets)."""
+    base_dir = Path(settings.BASE_DIR)
+    files = list((base_dir / "templates").rglob("*.html"))
+    files += list((base_dir / "website").rglob("*.py"))
+    return [path for path in files if "migrations" not in path.parts]
+
+
+def database_classes():
+    """Classes saisies en admin (icônes des services et des slides)."""
+    from .models import Service, HeroSlide
+
+    values = list(Service.objects.values_list("icon_class", flat=True))
+    for row in HeroSlide.objects.values_list("badge_icon", "primary_icon", "secondary_icon"):
+        values.extend(row)
+    return sorted({token for value in values if value for token in value.split()})
+
+
+def used_icon_names(texts):
+    return {match for text in texts for match in ICON_NAME_RE.findall(text)}
+
+
+def build_tailwind(output, extra_content, cli=None):
+    """Lance la CLI Tailwind autonome avec assets/tailwind.config.js."""
+    base_dir = Path(settings.BASE_DIR)
+    cli = cli or settings.TAILWIND_CLI
+    command = [
+        cli,
+        "-c", str(base_dir / "assets" / "tailwind.config.js"),
+        "-i", str(base_dir / "assets" / "css" / "site.css"),
+        "-o", str(output),
+        "--minify",
+    ]
+    env = {**os.environ, "TAILWIND_EXTRA_CONTENT": str(extra_content)}
+    subprocess.run(command, cwd=base_dir, env=env, check=True, capture_output=True)
+
+
+def fontawesome_dir():
+    spec = importlib.util.find_spec("fontawesomefree")
+    if spec is None or not spec.submodule_search_locations:
+        return None
+    return Path(list(spec.submodule_search_locations)[0]) / "static" / "fontawesomefree"
+
+
+def _top_level_blocks(css):
+    """Découpe une feuille CSS en blocs de premier niveau (prélude, corps)."""
+    depth, start, prelude = 0, 0, ""
+    for index, char in enumerate(css):
+        if char == "{":
+            if depth == 0:
+                prelude = css[start:index].strip()
+                start = index + 1
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                yield prelude, css[start:index]
+                start = index + 1
+
+
+def subset_fontawesome(icon_names, css_output, fonts_dir, source_dir=None):
+    """
+    Écrit un CSS Font Awesome réduit aux icônes `icon_names` et des polices
+    WOFF2 ne contenant que leurs glyphes. Renvoie le nombre d'icônes gardées.
+    """
+    from fontTools import subset
+
+    source_dir = Path(source_dir or fontawesome_dir())
+    css = (source_dir / "css" / "all.min.css").read_text(encoding="utf-8")
+
+    kept_rules, codepoints, kept_icons = [], set(), set()
+    for prelude, body in _top_level_blocks(css):
+        selectors = [selector.strip() for selector in prelude.split(",")]
+        icon_matches = [ICON_RULE_SELECTOR_RE.match(selector) for selector in selectors]
+        is_icon_rule = all(icon_matches) and CONTENT_RE.search(body)
+        if is_icon_rule:
+            selectors = [s for s, m in zip(selectors, icon_matches) if m.group(1) in icon_names]
+            if not selectors:
+                continue
+            kept_icons.update(ICON_RULE_SELECTOR_RE.match(s).group(1) for s in selectors)
+            codepoints.update(int(code, 16) for code in CONTENT_RE.findall(body))
+        elif prelude.startswith("@font-face"):
+            # Seul le WOFF2 est conservé (tous les navigateurs ciblés le lisent).
+            body = re.sub(r"src:[^;}]+", lambda m: "src:" + ",".join(
+                f'url({url}) format("woff2")' for url in FONT_URL_RE.findall(m.group(0))
+            ), body)
+        kept_rules.append(f"{','.join(selectors)}{{{body}}}")
+
+    fonts_dir.mkdir(parents=True, exist_ok=True)
+    options = subset.Options()
+    options.flavor = "woff2"
+    options.layout_features = ["*"]
+    for font_path in (source_dir / "webfonts").glob("*.woff2"):
+        font = subset.load_font(str(font_path), options)
+        subsetter = subset.Subsetter(options)
+        subsetter.populate(unicodes=codepoints)
+        subsetter.subset(font)
+        subset.save_font(font, str(fonts_dir / font_path.name), options)
+
+    css_output.parent.mkdir(parents=True, exist_ok=True)
+    css_output.write_text("".join(kept_rules), encoding="utf-8")
+    return len(kept_icons)
@@ -0,0 +1,229 @@
+# website/cache.py
+"""
+Cache du contenu éditorial du site (Redis via django_redis).
+
+Chaque « scope » possède un numéro de version stocké dans le cache. Les
+signaux (voir website/signals.py) incrémentent cette version à chaque
+modification en admin : les clés de contenu incluent la version, donc une
+édition rend immédiatement l'ancien contenu inaccessible, sans purge.
+"""
+import hashlib
+import time
+from datetime import datetime, timezone as dt_timezone
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.db.models import Max
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.template.loader import render_to_string
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+
+from .models import Service, PricingPlan, Testimonial, FAQ, HeroSlide, JobOffer
+
+HOME_SCOPE = "home"
+JOBS_SCOPE = "jobs"
+
+# Scope -> modèles dont une modification invalide le contenu (et les pages).
+SCOPE_MODELS = {
+    HOME_SCOPE: (Service, PricingPlan, Testimonial, FAQ, HeroSlide),
+    JOBS_SCOPE: (JobOffer,),
+}
+
+CONTENT_VERSION_KEY = "website:content-version:{scope}"
+LAST_MODIFIED_KEY = "website:last-modified:{scope}:v{version}"
+PAGE_KEY = "website:page:{scope}:v{version}:{digest}"
+
+# Trous laissés dans les pages mises en cache, remplis à chaque requête.
+CSRF_TOKEN_HOLE = "__rhp_csrf_token__"
+MESSAGES_HOLE = "<!--rhp:messages-->"
+MESSAGES_TEMPLATE = "website/partials/messages.html"
+# Au-delà, un paramètre de requête ne vient pas d'un lien du site
+MAX_PARAM_LENGTH = 100
+
+
+def content_cache_timeout():
+    return getattr(settings, "WEBSITE_CONTENT_CACHE_TIMEOUT", 60 * 60 * 24)
+
+
+def get_content_version(scope=HOME_SCOPE):
+    key = CONTENT_VERSION_KEY.format(scope=scope)
+    version = cache.get(key)
+    if version is None:
+        # Base horodatée : après un flush Redis, on ne retombe jamais
+        # sur une ancienne version encore présente dans le cache.
+        cache.add(key, int(time.time()), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_content_version(scope=HOME_SCOPE):
+    key = CONTENT_VERSION_KEY.format(scope=scope)
+    try:
+        version = cache.incr(key)
+    except ValueError:
+        version = int(time.time())
+        cache.set(key, version, timeout=None)
+    # Date de l'édition : reste exacte même après une suppression, où le
+    # max(updated_at) des lignes restantes reculerait.
+    cache.set(
+        LAST_MODIFIED_KEY.format(scope=scope, version=version),
+        datetime.now(dt_timezone.utc).replace(microsecond=0),
+        content_cache_timeout(),
+    )
+    return version
+
+
+def get_content_last_modified(scope=HOME_SCOPE):
+    key = LAST_MODIFIED_KEY.format(scope=scope, version=get_content_version(scope))
+    last_modified = cache.get(key)
+    if last_modified is None:
+        dates = [
+            model.objects.aggregate(last=Max("updated_at"))["last"]
+            for model in SCOPE_MODELS[scope]
+        ]
+        dates = [date for date in dates if date is not None]
+        last_modified = max(dates) if dates else datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+        cache.set(key, last_modified, content_cache_timeout())
+    return last_modified
+
+
+def _page_timeout():
+    return getattr(settings, "WEBSITE_PAGE_CACHE_TIMEOUT", 60 * 60)
+
+
+def _is_cacheable(request):
+    return request.method in ("GET", "HEAD") and not request.user.is_authenticated
+
+
+def render_messages(request):
+    storage = get_messages(request)
+    if not len(storage):
+        return ""
+    return render_to_string(MESSAGES_TEMPLATE, {"messages": storage})
+
+
+def fill_page_holes(request, body):
+    """Injecte les parties propres au visiteur (jeton CSRF, messages flash)."""
+    if CSRF_TOKEN_HOLE in body:
+        body = body.replace(CSRF_TOKEN_HOLE, get_token(request))
+    if MESSAGES_HOLE in body:
+        body = body.replace(MESSAGES_HOLE, render_messages(request))
+    return body
+
+
+def page_cache_key(request, scope, query_params=(), uncached_params=()):
+    """
+    Clé de la page ``request``, ou None si elle ne doit pas être mise en cache.
+
+    Seuls le chemin et les paramètres ``query_params`` (ceux que lit la vue)
+    entrent dans la clé : les autres sont ignorés, une chaîne de requête
+    arbitraire ne crée pas d'entrée. Pas de cache pour une recherche libre
+    (``uncached_params``) ni pour une valeur anormalement longue.
+    """
+    params = request.GET
+    if any(params.get(name) for name in uncached_params):
+        return None
+    values = []
+    for name in query_params:
+        value = params.get(name, "")
+        if len(value) > MAX_PARAM_LENGTH:
+            return None
+        if value:
+            values.append(f"{name}={value}")
+    identity = "?".join([request.path, "&".join(values)])
+    digest = hashlib.md5(identity.encode()).hexdigest()
+    return PAGE_KEY.format(scope=scope, version=get_content_version(scope), digest=digest)
+
+
+def cache_anonymous_page(scope, query_params=(), uncached_params=()):
+    """
+    Cache de réponse complète pour les GET anonymes.
+
+    Le rendu mis en cache contient des trous à la place du jeton CSRF et des
+    messages (voir context_processors.page_cache et le tag flash_messages) ;
+    une réponse servie depuis le cache ne coûte qu'un get Redis et deux
+    remplacements de chaînes. Clé : voir page_cache_key.
+    """
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def _wrapped_view(request, *args, **kwargs):
+            key = page_cache_key(request, scope, query_params, uncached_params) if _is_cacheable(request) else None
+            if key is None:
+                return view_func(request, *args, **kwargs)
+
+            body = cache.get(key)
+            if body is not None:
+                return HttpResponse(fill_page_holes(request, body))
+
+            request.page_cache_holes = True
+            try:
+                response = view_func(request, *args, **kwargs)
+                if hasattr(response, "render") and callable(response.render):
+                    response.render()
+            finally:
+                request.page_cache_holes = False
+
+            if response.streaming:
+                return response
+
+            body = response.content.decode(response.charset)
+            if response.status_code == 200:
+                cache.set(key, body, _page_timeout())
+            response.content = fill_page_holes(request, body)
+            return response
+
+        return _wrapped_view
+
+    return decorator
+
+
+def _has_pending_messages(request):
+    return bool(len(get_messages(request)))
+
+
+def conditional_page(scope):
+    """
+    ETag / Last-Modified dérivés de la version de contenu du scope (aucune
+    requête SQL en régime établi) ; les visites répétées reçoivent un 304.
+
+    L'ETag inclut une empreinte du cookie CSRF : la page contient un jeton
+    lié à ce cookie, une copie gardée par le navigateur ne doit pas être
+    réutilisée si le cookie a changé. Pas de validateurs quand des messages
+    flash sont en attente.
+    """
+
+    def etag_func(request, *args, **kwargs):
+        if not _is_cacheable(request) or _has_pending_messages(request):
+            return None
+        csrf_cookie = request.COOKIES.get(settings.CSRF_COOKIE_NAME, "")
+        return "%s-%s-%s" % (
+            scope,
+            get_content_version(scope),
+            hashlib.md5(csrf_cookie.encode()).hexdigest()[:8],
+        )
+
+    def last_modified_func(request, *args, **kwargs):
+        if not _is_cacheable(request) or _has_pending_messages(request):
+            return None
+        return get_content_last_modified(scope)
+
+    def decorator(view_func):
+        conditional_view = condition(etag_func=etag_func, last_modified_func=last_modified_func)(view_func)
+
+        @wraps(view_func)
+        def _wrapped_view(request, *args, **kwargs):
+            response = conditional_view(request, *args, **kwargs)
+            if _is_cacheable(request):
+                # Revalidation systématique : le navigateur garde la page
+                # mais redemande (304) au lieu d'utiliser une copie périmée.
+                patch_cache_control(response, private=True, no_cache=True)
+            return response
+
+        return _wrapped_view
+
+    return decorator
@@ -0,0 +1,345 @@
+# website/campaigns.py
+"""
+Compilation des campagnes newsletter.
+
+compile_campaign fait, une fois par campagne, tout le travail coûteux :
+CSS des blocs <style> recopié dans les attributs style (les clients mail
+ignorent souvent <style>), version texte, puis message MIME complet sérialisé
+avec des marqueurs à la place des valeurs propres au destinataire. Le rendu
+d'un destinataire se réduit à une concaténation d'octets et à la signature de
+son jeton de désinscription.
+
+Variables disponibles dans body_html : {{ full_name }}, {{ email }},
+{{ unsubscribe_url }} (ajoutée en pied de message si absente).
+Avec WEBSITE_NEWSLETTER_TRACKING, les liens http(s) passent par l'endpoint de
+clic et un pixel d'ouverture est ajouté (voir tracking.py).
+"""
+import html
+import re
+import time
+from email.utils import formatdate
+from functools import lru_cache
+
+from django.conf import settings
+from django.core import signing
+from django.core.mail import EmailMessage, EmailMultiAlternatives
+from django.core.mail.message import sanitize_address
+from django.core.mail.utils import DNS_NAME
+from django.urls import reverse
+from django.utils.html import strip_tags
+
+UNSUBSCRIBE_SALT = "website.newsletter.unsubscribe"
+CLICK_SALT = "website.newsletter.click"
+
+VARIABLE_RE = re.compile(r"\{\{\s*(full_name|email|unsubscribe_url)\s*\}\}")
+SLOT_RE = re.compile(rb"RHPSLOT([a-z_]+)X")
+
+UNSUBSCRIBE_FOOTER = (
+    '\n<p style="font-size:11px;color:#64748b">Vous recevez cet email car vous êtes inscrit '
+    'à la newsletter RH Partners Afric. <a href="{{ unsubscribe_url }}">Se désinscrire</a></p>\n'
+)
+
+# Marqueurs ASCII : ils traversent la sérialisation MIME (8bit) intacts.
+SLOT_TO = "rhpslot-to@rhp.invalid"
+
+
+def _slot(name):
+    return f"RHPSLOT{name}X"
+
+
+def unsubscribe_signer():
+    return signing.Signer(salt=UNSUBSCRIBE_SALT)
+
+
+def unsubscribe_url(subscriber_id, signer=None):
+    token = (signer or unsubscribe_signer()).sign(str(subscriber_id))
+    return settings.WEBSITE_BASE_URL + reverse("website:newsletter_unsubscribe", args=[token])
+
+
+# ---------------------------------------------------------------------------
+# CSS inline
+# ---------------------------------------------------------------------------
+
+STYLE_BLOCK_RE = re.compile(r"<style[^>]*>(.*?)</style>", re.S | re.I)
+CSS_COMMENT_RE = re.compile(r"/\*.*?\*/", re.S)
+CSS_RULE_RE = re.compile(r"([^{}@]+)\{([^{}]*)\}")
+SIMPLE_SELECTOR_RE = re.compile(r"^(?P<tag>[a-z][a-z0-9]*)?(?:\.(?P<cls>[\w-]+)|#(?P<id>[\w-]+))?$", re.I)
+START_TAG_RE = re.compile(r"<(?P<tag>[a-zA-Z][a-zA-Z0-9]*)(?P<attrs>(?:[^>\"']|\"[^\"]*\"|'[^']*')*)>")
+SKIPPED_TAGS = {"html", "head", "meta", "title", "style", "link", "script", "base"}
+
+
+def _attr(attrs, name):
+    match = re.search(rf"\s{name}\s*=\s*(\"[^\"]*\"|'[^']*'|[^\s>]+)", attrs, re.I)
+    if not match:
+        return None, match
+    return match.group(1).strip("\"'"), match
+
+
+def _parse_rules(css):
+    """Règles à sélecteur simple (tag, .classe, #id, tag.classe) ; le reste est gardé tel quel."""
+    rules, kept = [], []
+    css = CSS_COMMENT_RE.sub("", css)
+    # @media & co : à garder dans <style>, inapplicables en ligne
+    depth, start, plain = 0, 0, []
+    for index, char in enumerate(css):
+        if char == "@" and depth == 0:
+            plain.append(css[start:index])
+            start = index
+            depth = -1
+        elif char == ";" and depth == -1:
+            # @import, @charset… : instruction sans bloc
+            kept.append(css[start:index + 1])
+            start, depth = index + 1, 0
+        elif char == "{" and depth != 0:
+            depth = 1 if depth == -1 else depth + 1
+        elif char == "}" and depth > 0:
+            depth -= 1
+            if depth == 0:
+                kept.append(css[start:index + 1])
+                start = index + 1
+    plain.append(css[start:] if depth == 0 else "")
+
+    order = 0
+    for match in CSS_RULE_RE.finditer("".join(plain)):
+        declarations = " ".join(match.group(2).split()).strip().rstrip(";")
+        for selector in match.group(1).split(","):
+            selector = selector.strip()
+            simple = SIMPLE_SELECTOR_RE.match(selector)
+            if not selector or not simple:
+                kept.append(f"{selector} {{ {declarations} }}")
+                continue
+            tag, cls, id_ = simple.group("tag"), simple.group("cls"), simple.group("id")
+            specificity = (1 if id_ else 0, 1 if cls else 0, 1 if tag else 0)
+            rules.append((specificity, order, tag and tag.lower(), cls, id_, declarations))
+            order += 1
+    rules.sort(key=lambda rule: (rule[0], rule[1]))
+    return rules, kept
+
+
+def inline_css(body_html):
+    """Recopie les règles simples des blocs <style> dans les attributs style."""
+    css = "\n".join(STYLE_BLOCK_RE.findall(body_html))
+    if not css.strip():
+        return body_html
+    rules, kept = _parse_rules(css)
+    body_html = STYLE_BLOCK_RE.sub("", body_html)
+    if kept:
+        style = "<style>\n" + "\n".join(kept) + "\n</style>"
+        body_html, count = re.subn(r"</head>", style + "</head>", body_html, count=1, flags=re.I)
+        if not count:
+            body_html = style + body_html
+
+    def apply(match):
+        tag, attrs = match.group("tag").lower(), match.group("attrs")
+        if tag in SKIPPED_TAGS:
+            return match.group(0)
+        classes = set((_attr(attrs, "class")[0] or "").split())
+        element_id = _attr(attrs, "id")[0]
+        declarations = [
+            decl for _spec, _order, r_tag, r_cls, r_id, decl in rules
+            if (r_tag is None or r_tag == tag)
+            and (r_cls is None or r_cls in classes)
+            and (r_id is None or r_id == element_id)
+        ]
+        if not declarations:
+            return match.group(0)
+        inline, style_match = _attr(attrs, "style")
+        if inline:
+            declarations.append(inline.strip().rstrip(";"))
+        style = html.escape("; ".join(declarations), quote=True)
+        if style_match:
+            attrs = attrs[:style_match.start()] + attrs[style_match.end():]
+        closing = "/" if attrs.rstrip().endswith("/") else ""
+        attrs = attrs.rstrip().rstrip("/")
+        return f'<{match.group("tag")}{attrs} style="{style}"{closing}>'
+
+    return START_TAG_RE.sub(apply, body_html)
+
+
+# ---------------------------------------------------------------------------
+# Texte brut
+# ---------------------------------------------------------------------------
+
+LINK_RE = re.compile(r"<a\s[^>]*href=[\"']([^\"']+)[\"'][^>]*>(.*?)</a>", re.S | re.I)
+BLOCK_END_RE = re.compile(r"<br\s*/?>|</(p|div|h[1-6]|li|tr|table|blockquote)>", re.I)
+
+
+def html_to_text(body_html):
+    text = re.sub(r"<(style|script|head)[^>]*>.*?</\1>", "", body_html, flags=re.S | re.I)
+    text = re.sub(r"<li[^>]*>", "\n- ", text, flags=re.I)
+
+    def link(match):
+        label = strip_tags(match.group(2)).strip()
+        href = match.group(1)
+        return href if not label or label == href else f"{label} ({href})"
+
+    text = LINK_RE.sub(link, text)
+    text = BLOCK_END_RE.sub("\n", text)
+    text = html.unescape(strip_tags(text))
+    lines = [" ".join(line.split()) for line in text.splitlines()]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip() + "\n"
+
+
+def _wrap_long_lines(text, limit=500):
+    """Garde chaque ligne sous la limite RFC 5322 (998) pour rester en 8bit."""
+    out = []
+    for line in text.splitlines():
+        while len(line) > limit:
+            cut = line.rfind(" ", 0, limit)
+            if cut <= 0:
+                cut = line.rfind(">", 0, limit) + 1
+            if cut <= 0:
+                break
+            out.append(line[:cut])
+            line = line[cut:].lstrip(" ")
+        out.append(line)
+    return "\n".join(out)
+
+
+# ---------------------------------------------------------------------------
+# Message compilé
+# ---------------------------------------------------------------------------
+
+class RenderedMessage:
+    """Remplace email.message.Message pour les backends : octets déjà prêts (CRLF)."""
+
+    def __init__(self, data):
+        self.data = data
+
+    def as_bytes(self, unixfrom=False, linesep="\n"):
+        return self.data if linesep == "\r\n" else self.data.replace(b"\r\n", linesep.encode())
+
+    def as_string(self, unixfrom=False, linesep="\n"):
+        return self.as_bytes(linesep=linesep).decode("utf-8", "replace")
+
+
+class CompiledEmail(EmailMessage):
+    def __init__(self, raw, subject, from_email, to, connection=None):
+        super().__init__(subject=subject, from_email=from_email, to=to, connection=connection)
+        self.raw = raw
+
+    def message(self):
+        return RenderedMessage(self.raw)
+
+
+class CompiledCampaign:
+    def __init__(self, campaign_id, subject, from_email, parts):
+        self.campaign_id = campaign_id
+        self.subject = subject
+        self.from_email = from_email
+        self.parts = parts
+        self.signer = unsubscribe_signer()
+        # reverse() coûte plus que tout le reste du rendu : résolu une fois.
+        url = settings.WEBSITE_BASE_URL + reverse("website:newsletter_unsubscribe", args=["TOKEN"])
+        self.unsubscribe_prefix, self.unsubscribe_suffix = url.rsplit("TOKEN", 1)
+        self.domain = str(DNS_NAME)
+        self.localtime = settings.EMAIL_USE_LOCALTIME
+        self._date = (0, b"")
+
+    def _date_header(self):
+        now = int(time.time())
+        if self._date[0] != now:
+            self._date = (now, formatdate(now, localtime=self.localtime).encode())
+        return self._date[1]
+
+    def render_bytes(self, subscriber_id, email, full_name=""):
+        token = self.signer.sign(str(subscriber_id))
+        url = self.unsubscribe_prefix + token + self.unsubscribe_suffix
+        values = {
+            "subscriber_token": token.encode(),
+            "to": (email if email.isascii() else sanitize_address(email, "utf-8")).encode(),
+            "msgid": f"<nl{self.campaign_id}.{subscriber_id}.{time.time_ns()}@{self.domain}>".encode(),
+            "date": self._date_header(),
+            "unsubscribe_url": url.encode(),
+            "full_name_html": html.escape(full_name).encode(),
+            "full_name_text": full_name.encode(),
+            "email_html": html.escape(email).encode(),
+            "email_text": email.encode(),
+        }
+        parts = self.parts
+        return b"".join(
+            [parts[i] if i % 2 == 0 else values[parts[i]] for i in range(len(parts))]
+        )
+
+    def render(self, subscriber, connection=None):
+        raw = self.render_bytes(subscriber.pk, subscriber.email, subscriber.full_name)
+        return CompiledEmail(raw, self.subject, self.from_email, [subscriber.email], connection)
+
+
+def _slots_for(source, suffix):
+    def replace(match):
+        name = match.group(1)
+        return _slot(name if name == "unsubscribe_url" else f"{name}_{suffix}")
+
+    return VARIABLE_RE.sub(replace, source)
+
+
+TRACKED_HREF_RE = re.compile(r"(<a\s[^>]*?href=)([\"'])(https?://[^\"']+)\2", re.I)
+
+
+def click_token(campaign_id, url):
+    return signing.dumps({"c": campaign_id, "u": url}, salt=CLICK_SALT, compress=True)
+
+
+def _add_tracking(body_html, campaign_id):
+    """Liens http(s) redirigés via l'endpoint de clic, pixel d'ouverture en fin de corps."""
+    base = settings.WEBSITE_BASE_URL
+    subscriber = "?s=" + _slot("subscriber_token")
+
+    def track(match):
+        url = html.unescape(match.group(3))
+        click = base + reverse("website:newsletter_click", args=[click_token(campaign_id, url)]) + subscriber
+        return f"{match.group(1)}{match.group(2)}{click}{match.group(2)}"
+
+    body_html = TRACKED_HREF_RE.sub(track, body_html)
+    pixel = (
+        f'<img src="{base}{reverse("website:newsletter_open", args=[campaign_id])}{subscriber}" '
+        f'width="1" height="1" alt="" style="display:block;border:0">'
+    )
+    body_html, count = re.subn(r"</body>", pixel + "</body>", body_html, count=1, flags=re.I)
+    return body_html if count else body_html + pixel
+
+
+@lru_cache(maxsize=8)
+def _compile(campaign_id, subject, body_html, from_email):
+    if not re.search(r"\{\{\s*unsubscribe_url\s*\}\}", body_html):
+        body_html, count = re.subn(r"</body>", UNSUBSCRIBE_FOOTER + "</body>", body_html, count=1, flags=re.I)
+        if not count:
+            body_html += UNSUBSCRIBE_FOOTER
+    text = _wrap_long_lines(html_to_text(body_html), limit=76)
+    if settings.WEBSITE_NEWSLETTER_TRACKING:
+        body_html = _add_tracking(body_html, campaign_id)
+    inlined = _wrap_long_lines(inline_css(body_html))
+
+    skeleton = EmailMultiAlternatives(
+        subject=subject,
+        body=_slots_for(text, "text"),
+        from_email=from_email,
+        to=[SLOT_TO],
+        headers={
+            "Message-ID": _slot("msgid"),
+            "Date": _slot("date"),
+            "List-Unsubscribe": f"<{_slot('unsubscribe_url')}>",
+            "List-Unsubscribe-Post": "List-Unsubscribe=One-Click",
+        },
+    )
+    skeleton.attach_alternative(_slots_for(inlined, "html"), "text/html")
+    message = skeleton.message()
+    # L'encodage de chaque partie est choisi d'après le gabarit : un corps ASCII
+    # serait déclaré 7bit, alors que noms et adresses y sont insérés en UTF-8.
+    # Lignes déjà coupées (_wrap_long_lines) : jamais de quoted-printable ici.
+    for part in message.walk():
+        if part.get("Content-Transfer-Encoding") == "7bit":
+            part.replace_header("Content-Transfer-Encoding", "8bit")
+    raw = message.as_bytes(linesep="\r\n").replace(SLOT_TO.encode(), _slot("to").encode())
+
+    # [statique, créneau, statique, créneau, ..., statique]
+    parts = SLOT_RE.split(raw)
+    for index in range(1, len(parts), 2):
+        parts[index] = parts[index].decode()
+    return CompiledCampaign(campaign_id, subject, from_email, parts)
+
+
+def compile_campaign(campaign):
+    """Campagne compilée, mise en cache par processus tant que son contenu ne change pas."""
+    return _compile(campaign.pk, campaign.subject, campaign.body_html, settings.DEFAULT_FROM_EMAIL)
@@ -0,0 +1,15 @@
+# website/context_processors.py
+from .assets import built_assets_available
+from .cache import CSRF_TOKEN_HOLE
+
+
+def page_cache(request):
+    """Remplace le jeton CSRF par un trou lorsque la page part en cache."""
+    if getattr(request, "page_cache_holes", False):
+        return {"csrf_token": CSRF_TOKEN_HOLE}
+    return {}
+
+
+def assets(request):
+    """CSS de build (Tailwind purgé, icônes réduites) ou CDN en repli."""
+    return {"built_assets": built_assets_available()}
@@ -0,0 +1,177 @@
+# website/documents.py
+"""
+Documents de candidature : rattachement aux DocumentBlob et collecte des
+contenus orphelins.
+
+attach_document stocke le fichier reçu sous son SHA-256 (lien physique, sans
+copie, quand il est déjà sur le volume média) et incrémente ref_count dans la
+transaction de la candidature ; le fichier reçu n'est supprimé qu'à la
+validation de celle-ci. La suppression d'une candidature décrémente ref_count
+(signals.py) puis planifie collect_orphan_blobs.
+
+Le verrou de ligne sur le DocumentBlob sérialise rattachement et collecte :
+un contenu n'est supprimé que s'il n'est plus référencé au moment où la
+collecte le verrouille, et un rattachement qui suit réécrit le fichier s'il
+a disparu entre-temps.
+
+Le texte des documents (extraction.py) est extrait une fois par contenu puis
+recopié dans JobApplication.document_text, indexé pour la recherche.
+"""
+import logging
+import os
+from datetime import timedelta
+
+from celery.exceptions import SoftTimeLimitExceeded
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, F, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce, Concat, Trim
+from django.utils import timezone
+
+from .extraction import ExtractionError, UnsupportedDocument, extract_file_text
+from .models import DocumentBlob, JobApplication
+from .storage import blob_name, document_storage, file_sha256
+
+logger = logging.getLogger(__name__)
+
+DOCUMENT_FIELDS = ("cv", "cover_letter")
+
+
+def store_blob(content):
+    """Stocke ``content`` (fichier Django) et renvoie son DocumentBlob, référence comptée."""
+    sha256 = file_sha256(content)
+    name = blob_name(sha256)
+    with transaction.atomic():
+        # Ligne verrouillée ou créée : collect_orphan_blobs peut la supprimer
+        # entre les deux, d'où la boucle.
+        while True:
+            blob = DocumentBlob.objects.select_for_update().filter(pk=sha256).first()
+            if blob is not None:
+                break
+            try:
+                with transaction.atomic():
+                    blob = DocumentBlob.objects.create(sha256=sha256, file=name, size=content.size)
+                break
+            except IntegrityError:
+                continue  # créée par une requête concurrente
+        # Écrit (lien physique du fichier reçu) sauf pour un doublon
+        document_storage.save(name, content)
+        DocumentBlob.objects.filter(pk=sha256).update(ref_count=F("ref_count") + 1)
+    if hasattr(content, "temporary_file_path"):
+        # Fichier reçu supprimé seulement si la candidature est enregistrée :
+        # après une annulation, le téléversement reste réutilisable.
+        transaction.on_commit(lambda: _remove_received(content))
+    return blob
+
+
+def _remove_received(content):
+    content.close()
+    try:
+        os.remove(content.temporary_file_path())
+    except FileNotFoundError:
+        pass
+
+
+def attach_document(application, field, content):
+    """Rattache le fichier reçu ``content`` au champ ``field`` (cv / cover_letter)."""
+    setattr(application, field, store_blob(content))
+    setattr(application, f"{field}_filename", (content.name or "")[-255:])
+
+
+def release_documents(application):
+    """Décrémente les références d'une candidature supprimée."""
+    for field in DOCUMENT_FIELDS:
+        sha256 = getattr(application, f"{field}_id")
+        if sha256:
+            DocumentBlob.objects.filter(pk=sha256, ref_count__gt=0).update(ref_count=F("ref_count") - 1)
+
+
+def collect_orphan_blobs(limit=500):
+    """Supprime les contenus plus référencés (fichier puis ligne) ; renvoie leur nombre."""
+    referenced = JobApplication.objects.filter(Q(cv=OuterRef("pk")) | Q(cover_letter=OuterRef("pk")))
+    collected = 0
+    with transaction.atomic():
+        orphans = (
+            DocumentBlob.objects.select_for_update(skip_locked=True)
+            .filter(ref_count=0)
+            .filter(~Exists(referenced))[:limit]
+        )
+        for blob in orphans:
+            document_storage.delete(blob.file.name)
+            blob.delete()
+            collected += 1
+    if collected:
+        logger.info("%s document(s) orphelin(s) supprimé(s)", collected)
+    return collected
+
+
+def collect_unreferenced_blob_files(max_age=None):
+    """
+    Supprime les fichiers de contenu sans DocumentBlob ; renvoie leur nombre.
+
+    Laissés par une transaction annulée après store_blob ; l'âge minimal
+    (WEBSITE_UPLOAD_TTL) écarte ceux d'une transaction encore en cours.
+    """
+    max_age = max_age if max_age is not None else timedelta(seconds=settings.WEBSITE_UPLOAD_TTL)
+    cutoff = (timezone.now() - max_age).timestamp()
+    root = document_storage.location
+    collected = 0
+    for directory, _subdirectories, filenames in os.walk(root):
+        candidates = {
+            filename for filename in filenames
+            if os.path.getmtime(os.path.join(directory, filename)) <= cutoff
+        }
+        known = set(DocumentBlob.objects.filter(pk__in=candidates).values_list("pk", flat=True))
+        for filename in candidates - known:
+            os.remove(os.path.join(directory, filename))
+            collected += 1
+    if collected:
+        logger.info("%s fichier(s) de document sans référence supprimé(s)", collected)
+    return collected
+
+
+def extract_blob_text(sha256):
+    """
+    Extrait le texte d'un contenu encore en attente ; renvoie son statut.
+
+    Sans effet (hors lecture) si le texte a déjà été traité : un même CV
+    envoyé pour plusieurs offres n'est analysé qu'une fois.
+    """
+    blob = DocumentBlob.objects.filter(pk=sha256).only("file", "text_status").first()
+    if blob is None or blob.text_status != DocumentBlob.TEXT_PENDING:
+        return blob and blob.text_status
+    text, status = "", DocumentBlob.TEXT_EXTRACTED
+    try:
+        text = extract_file_text(
+            blob.file.path,
+            timeout=settings.WEBSITE_TEXT_EXTRACTION_TIMEOUT,
+            memory_limit=settings.WEBSITE_TEXT_EXTRACTION_MEMORY,
+        )
+    except UnsupportedDocument as exc:
+        logger.info("Texte non extrait de %s : %s", sha256, exc)
+        status = DocumentBlob.TEXT_UNSUPPORTED
+    except SoftTimeLimitExceeded:
+        raise  # traitée par la tâche extract_document_text
+    except (ExtractionError, OSError) as exc:
+        # Fichier corrompu, malformé ou pathologique (sous-processus tué)
+        logger.warning("Échec de l'extraction du texte de %s : %s", sha256, exc)
+        status = DocumentBlob.TEXT_FAILED
+    mark_blob_text(sha256, status, text)
+    return status
+
+
+def mark_blob_text(sha256, status, text=""):
+    DocumentBlob.objects.filter(pk=sha256, text_status=DocumentBlob.TEXT_PENDING).update(
+        text=text, text_status=status
+    )
+
+
+def refresh_document_text(sha256):
+    """Recopie le texte des documents dans les candidatures qui référencent ``sha256``."""
+    def blob_text(field):
+        text = DocumentBlob.objects.filter(pk=OuterRef(f"{field}_id")).values("text")[:1]
+        return Coalesce(Subquery(text), Value(""))
+
+    return JobApplication.objects.filter(Q(cv=sha256) | Q(cover_letter=sha256)).update(
+        document_text=Trim(Concat(blob_text("cv"), Value(" "), blob_text("cover_letter")))
+    )
@@ -0,0 +1,151 @@
+# website/exports.py
+"""
+Export des candidatures d'une offre : archive ZIP produite en flux.
+
+L'archive est écrite par zipfile dans un tampon non « seekable » (en-têtes
+locaux suivis d'un descripteur de données) et vidée vers la réponse au fil de
+l'écriture : rien n'est assemblé en mémoire ni sur disque, le téléchargement
+commence aussitôt et la mémoire utilisée ne dépend pas du nombre de dossiers.
+Les PDF, DOCX et ODT, déjà compressés, sont stockés tels quels.
+"""
+import csv
+import io
+import logging
+import os
+import zipfile
+
+from django.utils import timezone
+from django.utils.text import get_valid_filename
+
+from .documents import DOCUMENT_FIELDS
+
+logger = logging.getLogger(__name__)
+
+READ_SIZE = 64 * 1024
+MANIFEST_NAME = "candidatures.csv"
+# Formats déjà compressés : les recompresser coûte du CPU sans rien gagner
+STORED_EXTENSIONS = (".pdf", ".docx", ".odt")
+DOCUMENT_LABELS = {"cv": "CV", "cover_letter": "Lettre"}
+MANIFEST_HEADER = [
+    "id", "nom", "prénom", "email", "téléphone", "statut", "traité", "reçue le", "cv", "lettre de motivation", "notes",
+]
+# Début de cellule interprété comme une formule par Excel ou LibreOffice
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+class _ZipBuffer:
+    """Sortie de ZipFile sans seek() : les octets écrits sont repris par le générateur."""
+
+    def __init__(self):
+        self._chunks = []
+        self._offset = 0
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._offset
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _folder(application):
+    return get_valid_filename(f"{application.pk}_{application.last_name}_{application.first_name}")
+
+
+def document_entry_name(application, field):
+    """Chemin du document dans l'archive, ou "" si la candidature n'en a pas."""
+    blob_id = getattr(application, f"{field}_id")
+    if blob_id is None:
+        return ""
+    filename = os.path.basename(getattr(application, f"{field}_filename") or "")
+    filename = get_valid_filename(filename) if filename.strip(" .") else blob_id
+    return f"{_folder(application)}/{DOCUMENT_LABELS[field]}_{filename}"
+
+
+def _zip_info(name, moment, compress_type, size=None):
+    info = zipfile.ZipInfo(name, date_time=timezone.localtime(moment).timetuple()[:6])
+    info.compress_type = compress_type
+    info.external_attr = 0o644 << 16
+    if size is not None:
+        # Taille connue d'avance : zipfile choisit seul le format (ZIP64 ou non)
+        info.file_size = size
+    return info
+
+
+def csv_cell(value):
+    """Valeur saisie par un tiers, neutralisée contre l'injection de formule."""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _manifest_row(application):
+    row = [
+        application.pk,
+        application.last_name,
+        application.first_name,
+        application.email,
+        application.phone,
+        application.status,
+        "oui" if application.processed else "non",
+        timezone.localtime(application.created_at).strftime("%Y-%m-%d %H:%M"),
+        *(document_entry_name(application, field) for field in DOCUMENT_FIELDS),
+        application.notes,
+    ]
+    return [csv_cell(value) for value in row]
+
+
+def iter_applications_zip(applications, chunk_size=500):
+    """
+    Octets de l'archive ZIP des candidatures ``applications`` (queryset).
+
+    Le manifeste CSV vient en premier, puis les documents de chaque candidature ;
+    le queryset est parcouru deux fois, par paquets côté serveur.
+    """
+    return (data for data in _zip_chunks(applications, chunk_size) if data)
+
+
+def _zip_chunks(applications, chunk_size):
+    applications = applications.select_related("cv", "cover_letter").order_by("pk")
+    buffer = _ZipBuffer()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        info = _zip_info(MANIFEST_NAME, timezone.now(), zipfile.ZIP_DEFLATED)
+        with archive.open(info, "w") as entry:
+            # utf-8-sig et « ; » : ouverture directe dans Excel en français
+            manifest = io.TextIOWrapper(entry, encoding="utf-8-sig", newline="")
+            writer = csv.writer(manifest, delimiter=";")
+            writer.writerow(MANIFEST_HEADER)
+            for application in applications.iterator(chunk_size=chunk_size):
+                writer.writerow(_manifest_row(application))
+                yield buffer.drain()
+            manifest.close()
+        yield buffer.drain()
+
+        for application in applications.iterator(chunk_size=chunk_size):
+            for field in DOCUMENT_FIELDS:
+                name = document_entry_name(application, field)
+                if not name:
+                    continue
+                blob = getattr(application, field)
+                try:
+                    source = blob.file.open("rb")
+                except FileNotFoundError:
+                    logger.warning("Document %s introuvable, absent de l'export", blob.pk)
+                    continue
+                compress_type = zipfile.ZIP_STORED if name.lower().endswith(STORED_EXTENSIONS) else zipfile.ZIP_DEFLATED
+                with source, archive.open(_zip_info(name, application.created_at, compress_type, blob.size), "w") as entry:
+                    for data in iter(lambda: source.read(READ_SIZE), b""):
+                        entry.write(data)
+                        yield buffer.drain()
+                yield buffer.drain()
+    # Répertoire central
+    yield buffer.drain()
@@ -0,0 +1,165 @@
+# website/extraction.py
+"""
+Extraction du texte des documents de candidature, pour la recherche plein
+texte de l'admin (search.APPLICATIONS).
+
+Parseurs en pur Python : pypdf pour les PDF, lecture directe du XML (zip)
+pour DOCX et ODT. Les anciens .doc (OLE) ne sont pas pris en charge. Le
+travail est fait par la tâche Celery extract_document_text, qui appelle
+extract_file_text : le document est analysé dans un sous-processus Python
+(ce fichier exécuté comme script) borné en mémoire (RLIMIT_AS) et en temps
+CPU, et tué passé le délai. Une boucle dans du code natif ou une allocation
+démesurée de pypdf, que la limite « soft » de Celery n'interrompt pas, ne
+coûte que ce sous-processus.
+
+Ce module n'importe rien de Django : le sous-processus démarre sans lui.
+"""
+import os
+import re
+import subprocess
+import sys
+import unicodedata
+import zipfile
+from xml.etree import ElementTree
+
+ZIP_MAGIC = b"PK\x03\x04"
+OLE_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+
+# Texte conservé par document (le tsvector PostgreSQL est limité à 1 Mo)
+MAX_TEXT_LENGTH = 100_000
+MAX_PDF_PAGES = 50
+# Taille décompressée maximale d'une partie XML (bombe zip)
+MAX_XML_SIZE = 20 * 1024 * 1024
+
+WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+ODF_TEXT_NS = "{urn:oasis:names:tc:opendocument:xmlns:text:1.0}"
+
+CONTROL_CHARS_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f\u00ad\u200b-\u200f\ufeff]")
+HYPHENATED_BREAK_RE = re.compile(r"(\w)-\s*\n\s*(\w)")
+SPACES_RE = re.compile(r"\s+")
+
+
+# Codes de sortie du sous-processus d'extraction
+EXIT_UNSUPPORTED = 3
+
+
+class UnsupportedDocument(Exception):
+    """Format de document dont le texte n'est pas extrait (ex. .doc)."""
+
+
+class ExtractionError(Exception):
+    """Échec du sous-processus d'extraction (document malformé, délai ou mémoire dépassés)."""
+
+
+def normalize_text(text):
+    """Texte indexable : NFKC, sans caractères de contrôle, césures recollées, espaces réduits."""
+    text = unicodedata.normalize("NFKC", text or "")
+    text = CONTROL_CHARS_RE.sub("", text)
+    text = HYPHENATED_BREAK_RE.sub(r"\1\2", text)
+    return SPACES_RE.sub(" ", text).strip()[:MAX_TEXT_LENGTH]
+
+
+def _pdf_text(fileobj):
+    from pypdf import PdfReader
+
+    reader = PdfReader(fileobj)
+    if reader.is_encrypted and not reader.decrypt(""):
+        raise UnsupportedDocument("PDF protégé par mot de passe")
+    parts, length = [], 0
+    for page in reader.pages[:MAX_PDF_PAGES]:
+        text = page.extract_text() or ""
+        parts.append(text)
+        length += len(text)
+        if length >= MAX_TEXT_LENGTH:
+            break
+    return "\n".join(parts)
+
+
+def _xml_text(archive, member, paragraph_tags, tab_tags=()):
+    """Texte d'une partie XML du zip, un paragraphe par ligne, lu en flux."""
+    if archive.getinfo(member).file_size > MAX_XML_SIZE:
+        raise UnsupportedDocument("document trop volumineux une fois décompressé")
+    parts = []
+    with archive.open(member) as source:
+        for _, element in ElementTree.iterparse(source):
+            if element.tag in paragraph_tags:
+                parts.append("".join(element.itertext()))
+                element.clear()
+            elif element.tag in tab_tags:
+                element.tail = " " + (element.tail or "")
+    return "\n".join(parts)
+
+
+def _zip_text(fileobj):
+    with zipfile.ZipFile(fileobj) as archive:
+        names = set(archive.namelist())
+        if "word/document.xml" in names:
+            return _xml_text(archive, "word/document.xml", {f"{WORD_NS}p"}, {f"{WORD_NS}tab"})
+        if "content.xml" in names:
+            return _xml_text(archive, "content.xml", {f"{ODF_TEXT_NS}p", f"{ODF_TEXT_NS}h"}, {f"{ODF_TEXT_NS}tab"})
+    raise UnsupportedDocument("archive zip sans document texte")
+
+
+def extract_text(fileobj):
+    """
+    Texte normalisé d'un document PDF, DOCX ou ODT (fichier binaire ouvert).
+
+    Le format est reconnu à la signature du contenu, pas au nom. Lève
+    UnsupportedDocument pour un format non pris en charge.
+    """
+    head = fileobj.read(8)
+    fileobj.seek(0)
+    if head.startswith(b"%PDF-"):
+        text = _pdf_text(fileobj)
+    elif head.startswith(ZIP_MAGIC):
+        text = _zip_text(fileobj)
+    elif head.startswith(OLE_MAGIC):
+        raise UnsupportedDocument("format .doc non pris en charge")
+    else:
+        raise UnsupportedDocument("format inconnu")
+    return normalize_text(text)
+
+
+def extract_file_text(path, timeout, memory_limit):
+    """
+    Texte normalisé du document ``path``, extrait dans un sous-processus.
+
+    ``timeout`` : secondes avant que le sous-processus soit tué ;
+    ``memory_limit`` : octets d'espace d'adressage. Lève UnsupportedDocument
+    ou ExtractionError.
+    """
+    command = [sys.executable, "-I", os.path.abspath(__file__), path, str(memory_limit), str(timeout)]
+    try:
+        result = subprocess.run(command, capture_output=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        raise ExtractionError(f"délai de {timeout} s dépassé")
+    message = result.stderr.decode("utf-8", "replace").strip()[-500:]
+    if result.returncode == EXIT_UNSUPPORTED:
+        raise UnsupportedDocument(message)
+    if result.returncode:
+        raise ExtractionError(message or f"code de sortie {result.returncode}")
+    return result.stdout.decode("utf-8")
+
+
+def _main(path, memory_limit, timeout):
+    import resource
+
+    resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+    resource.setrlimit(resource.RLIMIT_CPU, (timeout, timeout + 1))
+    try:
+        with open(path, "rb") as source:
+            text = extract_text(source)
+    except UnsupportedDocument as exc:
+        sys.stderr.write(str(exc))
+        return EXIT_UNSUPPORTED
+    except Exception as exc:
+        # Les parseurs lèvent toutes sortes d'exceptions (MemoryError comprise)
+        sys.stderr.write(f"{type(exc).__name__}: {exc}")
+        return 1
+    sys.stdout.write(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.stdout.reconfigure(encoding="utf-8")
+    sys.exit(_main(sys.argv[1], int(sys.argv[2]), int(sys.argv[3])))
@@ -1,6 +1,7 @@
 # website/forms.py
 from django import forms
 from .models import ContactRequest, NewsletterSubscriber, JobApplication
+from .uploads import is_ready
 
 
 class ContactForm(forms.ModelForm):
@@ -61,12 +62,42 @@ class NewsletterSubscribeForm(forms.ModelForm):
             "full_name": "",
         }
 
+    def clean_email(self):
+        return NewsletterSubscriber.normalize_email(self.cleaned_data["email"])
+
+    def validate_unique(self):
+        # Un email déjà inscrit n'est pas une erreur : la vue fait un upsert.
+        pass
+
+
+class SubscriberImportForm(forms.Form):
+    file = forms.FileField(
+        label="Fichier CSV",
+        help_text="Colonnes « email » et, optionnellement, « full_name » (UTF-8). "
+                  "Sans en-tête : email puis nom.",
+    )
+
+
 class JobApplicationForm(forms.ModelForm):
+    # Jetons des documents téléversés par morceaux (website/uploads.py). Le
+    # navigateur les renseigne et n'envoie alors plus les fichiers eux-mêmes ;
+    # sans JavaScript, le formulaire multipart classique reste utilisable.
+    UPLOAD_FIELDS = {"cv": "cv_upload", "cover_letter": "cover_letter_upload"}
+
+    cv_upload = forms.UUIDField(required=False, widget=forms.HiddenInput)
+    cover_letter_upload = forms.UUIDField(required=False, widget=forms.HiddenInput)
+    # Documents stockés par contenu (website/documents.py) : rattachés par la vue
+    cv = forms.FileField(label="CV (PDF, DOC, etc.)", required=False, widget=forms.ClearableFileInput(attrs={
+        "class": "w-full text-xs",
+    }))
+    cover_letter = forms.FileField(label="Lettre de motivation", required=False, widget=forms.ClearableFileInput(attrs={
+        "class": "w-full text-xs",
+    }))
+
     class Meta:
         model = JobApplication
         fields = [
-            "first_name", "last_name", "email", "phone",
-            "cv", "cover_letter", "notes",
+            "first_name", "last_name", "email", "phone", "notes",
         ]
         widgets = {
             "first_name": forms.TextInput(attrs={
@@ -81,12 +112,6 @@ class JobApplicationForm(forms.ModelForm):
             "phone": forms.TextInput(attrs={
                 "class": "w-full rounded-xl border border-slate-300 bg-white px-3 py-2 text-xs dark:border-slate-600 dark:bg-slate-900/60 dark:text-slate-100",
             }),
-            "cv": forms.ClearableFileInput(attrs={
-                "class": "w-full text-xs",
-            }),
-            "cover_letter": forms.ClearableFileInput(attrs={
-                "class": "w-full text-xs",
-            }),
             "notes": forms.Textarea(attrs={
                 "rows": 4,
                 "class": "w-full rounded-xl border border-slate-300 bg-white px-3 py-2 text-xs dark:border-slate-600 dark:bg-slate-900/60 dark:text-slate-100",
@@ -97,7 +122,32 @@ class JobApplicationForm(forms.ModelForm):
             "last_name": "Nom",
             "email": "Email",
             "phone": "Téléphone",
-            "cv": "CV (PDF, DOC, etc.)",
-            "cover_letter": "Lettre de motivation",
             "notes": "Message au recruteur (optionnel)",
-        }
\ No newline at end of file
+        }
+
+    def clean(self):
+        cleaned_data = super().clean()
+        for field, token_field in self.UPLOAD_FIELDS.items():
+            token = cleaned_data.get(token_field)
+            if token:
+                if not is_ready(token):
+                    self.add_error(field, "Téléversement incomplet ou expiré, merci de joindre le fichier à nouveau.")
+            elif not cleaned_data.get(field) and field not in self.errors:
+                self.add_error(field, forms.Field.default_error_messages["required"])
+        return cleaned_data
+
+    def uploaded_documents(self):
+        """{champ: fichier} des documents joints directement au formulaire."""
+        return {
+            field: self.cleaned_data[field]
+            for field, token_field in self.UPLOAD_FIELDS.items()
+            if self.cleaned_data.get(field) and not self.cleaned_data.get(token_field)
+        }
+
+    def upload_tokens(self):
+        """{champ fichier: jeton} des documents téléversés par morceaux."""
+        return {
+            field: self.cleaned_data[token_field]
+            for field, token_field in self.UPLOAD_FIELDS.items()
+            if self.cleaned_data.get(token_field)
+        }
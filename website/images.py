@@ -0,0 +1,114 @@
+# website/images.py
+"""
+Déclinaisons responsives des images uploadées (Pillow).
+
+Pour une image source on produit, à plusieurs largeurs, une version AVIF
+(ou JPEG si Pillow n'a pas le support AVIF) et une version WebP, plus un
+placeholder flou de quelques centaines d'octets encodé en data URI. Le
+résultat (URLs + dimensions) est stocké en JSON sur le modèle et consommé
+par le tag {% responsive_image %}.
+
+Quand l'image change, les déclinaisons précédentes sont supprimées une fois
+les nouvelles enregistrées (delete_derivatives) ; le placeholder, inline dans
+le JSON, est remplacé avec lui.
+"""
+import base64
+import io
+import os
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageFilter, ImageOps, features
+
+DERIVATIVE_WIDTHS = (480, 768, 1100, 1600)
+PLACEHOLDER_WIDTH = 24
+MIME_EXTENSIONS = {"image/avif": "avif", "image/jpeg": "jpg", "image/webp": "webp"}
+
+
+def _derivative_name(source, width, extension):
+    directory, basename = os.path.split(os.path.splitext(source)[0])
+    return f"{directory}/derivatives/{basename}-{width}w.{extension}"
+
+
+def _formats():
+    primary = ("image/avif", "AVIF", "avif", {"quality": 55}) if features.check("avif") \
+        else ("image/jpeg", "JPEG", "jpg", {"quality": 80, "optimize": True, "progressive": True})
+    return [
+        primary,
+        ("image/webp", "WEBP", "webp", {"quality": 78, "method": 6}),
+    ]
+
+
+def _encode(image, pil_format, options):
+    buffer = io.BytesIO()
+    if pil_format == "JPEG" and image.mode != "RGB":
+        image = image.convert("RGB")
+    image.save(buffer, pil_format, **options)
+    return buffer.getvalue()
+
+
+def _placeholder(image):
+    height = max(1, round(image.height * PLACEHOLDER_WIDTH / image.width))
+    small = image.convert("RGB").resize((PLACEHOLDER_WIDTH, height), Image.LANCZOS)
+    small = small.filter(ImageFilter.GaussianBlur(1.5))
+    data = _encode(small, "JPEG", {"quality": 40})
+    return "data:image/jpeg;base64," + base64.b64encode(data).decode("ascii")
+
+
+def generate_derivatives(field_file, widths=DERIVATIVE_WIDTHS, storage=default_storage):
+    """
+    Génère les déclinaisons de `field_file` et renvoie le dict à stocker :
+    {"source", "width", "height", "placeholder", "sources": {mime: [{url, width, height}]}}.
+    """
+    field_file.open("rb")
+    try:
+        image = Image.open(field_file)
+        image = ImageOps.exif_transpose(image)
+        image.load()
+    finally:
+        field_file.close()
+
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+
+    target_widths = sorted({w for w in widths if w < image.width} | {min(image.width, max(widths))})
+
+    sources = {}
+    for mime, pil_format, extension, options in _formats():
+        variants = []
+        for width in target_widths:
+            height = round(image.height * width / image.width)
+            resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+            name = _derivative_name(field_file.name, width, extension)
+            if storage.exists(name):
+                storage.delete(name)
+            name = storage.save(name, ContentFile(_encode(resized, pil_format, options)))
+            variants.append({"name": name, "url": storage.url(name), "width": width, "height": height})
+        sources[mime] = variants
+
+    return {
+        "source": field_file.name,
+        "width": image.width,
+        "height": image.height,
+        "placeholder": _placeholder(image),
+        "sources": sources,
+    }
+
+
+def derivative_names(derivatives):
+    """Noms de stockage des fichiers décrits par ``derivatives``."""
+    names = set()
+    for mime, variants in derivatives.get("sources", {}).items():
+        for variant in variants:
+            # Déclinaisons antérieures à l'enregistrement du nom : reconstruit
+            name = variant.get("name") or _derivative_name(
+                derivatives["source"], variant["width"], MIME_EXTENSIONS.get(mime, "")
+            )
+            names.add(name)
+    return names
+
+
+def delete_derivatives(derivatives, keep=(), storage=default_storage):
+    """Supprime les fichiers de ``derivatives``, sauf ceux de ``keep`` (noms)."""
+    for name in derivative_names(derivatives) - set(keep):
+        storage.delete(name)
@@ -0,0 +1,123 @@
+# website/ingest.py
+"""
+Ingestion différée (write-behind) des demandes de contact.
+
+La vue valide le formulaire, pousse les données dans un flux Redis (XADD) et
+répond aussitôt. La tâche ingest_contact_requests lit le flux par lots via un
+groupe de consommateurs, insère avec bulk_create et n'acquitte (XACK) qu'après
+le commit. Livraison « au moins une fois » : une entrée non acquittée (worker
+tué en cours de lot) est reprise par XAUTOCLAIM, et la clé unique
+submission_key absorbe les relivraisons.
+"""
+import json
+import logging
+import uuid
+
+from django.conf import settings
+from django.db import transaction
+from django_redis import get_redis_connection
+from redis.exceptions import ResponseError
+
+from .models import ContactRequest
+from .signals import contact_requests_received
+
+logger = logging.getLogger(__name__)
+
+CONTACT_STREAM = "rhp:stream:contact"
+CONTACT_GROUP = "contact-ingest"
+CONTACT_FIELDS = ("full_name", "company", "email", "phone", "service", "message", "consent")
+
+# Garde-fou mémoire si les workers sont arrêtés longtemps (troncature approximative).
+STREAM_MAXLEN = 100_000
+# Au-delà, une entrée lue mais non acquittée est considérée orpheline.
+RECLAIM_IDLE_MS = 60_000
+
+
+def _redis():
+    return get_redis_connection("default")
+
+
+def enqueue_contact_request(cleaned_data):
+    """Pousse une soumission validée dans le flux ; renvoie sa clé d'idempotence."""
+    key = uuid.uuid4()
+    payload = {name: cleaned_data.get(name) for name in CONTACT_FIELDS}
+    _redis().xadd(
+        CONTACT_STREAM,
+        {"key": str(key), "data": json.dumps(payload)},
+        maxlen=STREAM_MAXLEN,
+        approximate=True,
+    )
+    return key
+
+
+def _ensure_group(conn):
+    try:
+        conn.xgroup_create(CONTACT_STREAM, CONTACT_GROUP, id="0", mkstream=True)
+    except ResponseError as exc:
+        if "BUSYGROUP" not in str(exc):
+            raise
+
+
+def _read_batch(conn, consumer, count):
+    # Les entrées orphelines d'abord, puis les nouvelles.
+    claimed = conn.xautoclaim(
+        CONTACT_STREAM, CONTACT_GROUP, consumer, RECLAIM_IDLE_MS, start_id="0-0", count=count
+    )
+    entries = claimed[1]
+    if entries:
+        return entries
+    response = conn.xreadgroup(CONTACT_GROUP, consumer, {CONTACT_STREAM: ">"}, count=count)
+    return response[0][1] if response else []
+
+
+def _to_request(entry_id, fields):
+    try:
+        key = uuid.UUID(fields[b"key"].decode())
+        data = json.loads(fields[b"data"])
+        return ContactRequest(
+            submission_key=key,
+            **{name: data[name] for name in CONTACT_FIELDS if name in data},
+        )
+    except (KeyError, TypeError, ValueError):
+        logger.error("Entrée %s du flux contact illisible, ignorée", entry_id)
+        return None
+
+
+def ingest_contact_batch(consumer, count=None):
+    """
+    Traite un lot du flux pour le consommateur ``consumer``.
+
+    Renvoie le nombre d'entrées lues (0 quand le flux est vide).
+    """
+    conn = _redis()
+    _ensure_group(conn)
+    entries = _read_batch(conn, consumer, count or settings.WEBSITE_CONTACT_BATCH_SIZE)
+    if not entries:
+        return 0
+
+    pending = {}
+    for entry_id, fields in entries:
+        # fields vide : entrée supprimée du flux (MAXLEN) avant d'être traitée
+        request = _to_request(entry_id, fields) if fields else None
+        if request is not None:
+            pending[request.submission_key] = request
+
+    if pending:
+        with transaction.atomic():
+            known = set(
+                ContactRequest.objects.filter(submission_key__in=pending)
+                .values_list("submission_key", flat=True)
+            )
+            ContactRequest.objects.bulk_create(
+                [req for key, req in pending.items() if key not in known],
+                ignore_conflicts=True,
+            )
+            created = list(
+                ContactRequest.objects.filter(submission_key__in=pending.keys() - known)
+            )
+            if created:
+                contact_requests_received.send(sender=ContactRequest, requests=created)
+        logger.info("%s demande(s) de contact ingérée(s)", len(created))
+
+    conn.xack(CONTACT_STREAM, CONTACT_GROUP, *[entry_id for entry_id, _ in entries])
+    return len(entries)
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from website.models import HeroSlide
+from website.tasks import generate_hero_slide_derivatives
+
+
+class Command(BaseCommand):
+    help = "Génère les déclinaisons responsives manquantes des images de HeroSlide."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true", help="Régénère aussi les images déjà traitées.")
+        parser.add_argument(
+            "--async",
+            action="store_true",
+            dest="use_celery",
+            help="Délègue à Celery au lieu de traiter dans ce processus.",
+        )
+
+    def handle(self, *args, **options):
+        slides = HeroSlide.objects.exclude(image="").exclude(image__isnull=True)
+        count = 0
+        for slide in slides.iterator():
+            if not (options["force"] or slide.image_derivatives_stale):
+                continue
+            if options["use_celery"]:
+                generate_hero_slide_derivatives.delay(slide.pk, force=options["force"])
+            else:
+                generate_hero_slide_derivatives(slide.pk, force=options["force"])
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f"{count} slide(s) traitée(s)."))
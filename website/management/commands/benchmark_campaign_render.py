@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from website.campaigns import compile_campaign
+from website.models import NewsletterCampaign
+
+SAMPLE_BODY = """<html><head><style>
+  body { font-family: Arial, sans-serif; color: #0f172a; }
+  .title { color: #051536; font-size: 20px; }
+  a { color: #ffa600; }
+  @media (max-width: 600px) { .title { font-size: 16px; } }
+</style></head><body>
+<h1 class="title">Bonjour {{ full_name }},</h1>
+<p>Les nouveautés RH et paie du mois, sélectionnées par nos consultants.</p>
+<p><a href="https://rhpartnersafric.com/recrutement/">Voir nos offres</a></p>
+</body></html>"""
+
+
+class Command(BaseCommand):
+    help = "Mesure le rendu personnalisé d'une campagne compilée (objectif : 100k en quelques secondes)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("-n", "--count", type=int, default=100_000)
+        parser.add_argument("--campaign", type=int, help="Campagne existante (sinon un exemple).")
+
+    def handle(self, *args, **options):
+        if options["campaign"]:
+            campaign = NewsletterCampaign.objects.get(pk=options["campaign"])
+        else:
+            campaign = NewsletterCampaign(pk=0, subject="Newsletter RH Partners Afric", body_html=SAMPLE_BODY)
+
+        started = time.perf_counter()
+        compiled = compile_campaign(campaign)
+        compile_time = time.perf_counter() - started
+
+        count = options["count"]
+        size = 0
+        started = time.perf_counter()
+        for index in range(count):
+            size += len(compiled.render_bytes(index, f"abonne{index}@example.com", f"Abonné {index}"))
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(f"Compilation : {compile_time * 1000:.1f} ms")
+        self.stdout.write(self.style.SUCCESS(
+            f"{count} messages rendus en {elapsed:.2f} s "
+            f"({count / elapsed:,.0f} msg/s, {size / count:.0f} octets/message)"
+        ))
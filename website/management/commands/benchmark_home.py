@@ -0,0 +1,45 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.template.loader import render_to_string
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from website.forms import ContactForm
+from website.snapshot import build_home_snapshot, get_home_snapshot
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare la latence de rendu de la page d'accueil : requêtes ORM à chaque "
+        "hit (avant) contre lecture du snapshot (après). Le cache de pages est contourné."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("-n", "--iterations", type=int, default=200)
+
+    def _measure(self, label, get_context, iterations):
+        request = RequestFactory().get("/")
+        timings = []
+        with CaptureQueriesContext(connection) as queries:
+            for _ in range(iterations):
+                start = time.perf_counter()
+                ctx = get_context()
+                ctx["form"] = ContactForm()
+                render_to_string("website/home.html", ctx, request=request)
+                timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        self.stdout.write(
+            f"{label:<8} moy {statistics.mean(timings):7.2f} ms | "
+            f"p50 {timings[len(timings) // 2]:7.2f} ms | "
+            f"p95 {timings[int(len(timings) * 0.95) - 1]:7.2f} ms | "
+            f"{len(queries.captured_queries) / iterations:.1f} requêtes SQL / hit"
+        )
+
+    def handle(self, *args, **options):
+        iterations = max(options["iterations"], 1)
+        get_home_snapshot()  # amorçage du cache
+        self._measure("avant", build_home_snapshot, iterations)
+        self._measure("après", get_home_snapshot, iterations)
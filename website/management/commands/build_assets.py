@@ -0,0 +1,56 @@
+import subprocess
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError
+
+from website import assets
+
+
+class Command(BaseCommand):
+    help = (
+        "Génère le CSS Tailwind purgé et le sous-ensemble Font Awesome dans "
+        "ASSETS_BUILD_DIR (à lancer avant collectstatic)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--no-db",
+            action="store_true",
+            help="N'interroge pas la base (build d'image Docker sans base disponible).",
+        )
+        parser.add_argument("--skip-tailwind", action="store_true", help="Ne génère que le sous-ensemble d'icônes.")
+
+    def handle(self, *args, **options):
+        build_dir = Path(settings.ASSETS_BUILD_DIR)
+        build_dir.mkdir(parents=True, exist_ok=True)
+
+        db_classes = []
+        if not options["no_db"]:
+            try:
+                db_classes = assets.database_classes()
+            except DatabaseError as exc:
+                raise CommandError(f"Base indisponible ({exc}) ; relancer avec --no-db.") from exc
+        extra_content = build_dir / "db-classes.txt"
+        extra_content.write_text("\n".join(db_classes), encoding="utf-8")
+
+        if not options["skip_tailwind"]:
+            try:
+                assets.build_tailwind(build_dir / "css" / "site.css", extra_content)
+            except FileNotFoundError as exc:
+                raise CommandError(f"CLI Tailwind introuvable ({settings.TAILWIND_CLI}).") from exc
+            except subprocess.CalledProcessError as exc:
+                raise CommandError(f"Échec du build Tailwind :\n{exc.stderr.decode(errors='replace')}") from exc
+            self.stdout.write(f"Tailwind : {(build_dir / 'css' / 'site.css').stat().st_size // 1024} Ko")
+
+        if assets.fontawesome_dir() is None:
+            raise CommandError("Paquet fontawesomefree introuvable (voir requirements.txt).")
+        texts = [path.read_text(encoding="utf-8", errors="ignore") for path in assets.content_files()]
+        texts.append(" ".join(db_classes))
+        icon_count = assets.subset_fontawesome(
+            assets.used_icon_names(texts),
+            css_output=build_dir / "css" / "icons.css",
+            fonts_dir=build_dir / "webfonts",
+        )
+        self.stdout.write(self.style.SUCCESS(f"Font Awesome : {icon_count} icône(s) conservée(s)."))
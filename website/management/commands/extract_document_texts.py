@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+
+from website.models import DocumentBlob
+from website.tasks import extract_document_text
+
+
+class Command(BaseCommand):
+    help = "Extrait le texte des documents de candidature encore en attente (recherche de l'admin)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--retry-failed",
+            action="store_true",
+            help="Remet aussi en attente les documents dont l'extraction a échoué.",
+        )
+        parser.add_argument(
+            "--sync",
+            action="store_true",
+            help=(
+                "Traite dans ce processus, sans limite de temps, au lieu de déléguer "
+                "aux workers Celery (un document pathologique bloque alors la commande)."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        if options["retry_failed"]:
+            DocumentBlob.objects.filter(text_status=DocumentBlob.TEXT_FAILED).update(
+                text_status=DocumentBlob.TEXT_PENDING
+            )
+        pending = DocumentBlob.objects.filter(text_status=DocumentBlob.TEXT_PENDING).order_by("created_at")
+        count = 0
+        for sha256 in pending.values_list("sha256", flat=True).iterator():
+            if options["sync"]:
+                extract_document_text(sha256)
+            else:
+                extract_document_text.delay(sha256)
+            count += 1
+        done = "traité(s)" if options["sync"] else "confié(s) aux workers Celery"
+        self.stdout.write(self.style.SUCCESS(f"{count} document(s) {done}."))
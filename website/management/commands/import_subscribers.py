@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from website.subscribers import import_subscribers
+
+
+class Command(BaseCommand):
+    help = "Importe des abonnés newsletter depuis un CSV (email[, full_name])."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Fichier CSV (UTF-8)")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Taille des lots hors PostgreSQL (défaut : 5000).",
+        )
+
+    def handle(self, *args, **options):
+        with open(options["path"], encoding="utf-8-sig", newline="") as lines:
+            stats = import_subscribers(lines, batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(
+            f"{stats['read']} ligne(s) valide(s) : {stats['inserted']} ajouté(s), "
+            f"{stats['reactivated']} réactivé(s), {stats['unchanged']} déjà actif(s) ; "
+            f"{stats['invalid']} ligne(s) invalide(s)."
+        ))
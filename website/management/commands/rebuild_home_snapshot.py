@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from website.cache import HOME_SCOPE, bump_content_version
+from website.snapshot import rebuild_home_snapshot
+
+
+class Command(BaseCommand):
+    help = "Force la reconstruction du snapshot de la page d'accueil."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--bump",
+            action="store_true",
+            help="Incrémente aussi la version de contenu (invalide les pages en cache).",
+        )
+
+    def handle(self, *args, **options):
+        if options["bump"]:
+            bump_content_version(HOME_SCOPE)
+        version = rebuild_home_snapshot()
+        self.stdout.write(self.style.SUCCESS(f"Snapshot reconstruit (version {version})."))
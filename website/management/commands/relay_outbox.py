@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from website.models import OutboxEmail
+from website.outbox import relay_batch
+
+
+class Command(BaseCommand):
+    help = "Envoie les emails dus de la boîte d'envoi (hors Celery, utile en local)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None)
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            processed = relay_batch(options["batch_size"])
+            if not processed:
+                break
+            total += processed
+        counts = {
+            status: OutboxEmail.objects.filter(status=status).count()
+            for status, _label in OutboxEmail.STATUS_CHOICES
+        }
+        summary = ", ".join(f"{status}={count}" for status, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(f"{total} email(s) traité(s) ({summary})."))
@@ -0,0 +1,50 @@
+# Generated by Django 4.2.27 on 2026-10-18 13:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HeroSlide',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('pair_key', models.SlugField(help_text='Permet d’associer une slide texte et une slide visuelle (même valeur pour les deux).', verbose_name='Clé de paire (slide 1, slide-2…)')),
+                ('position', models.CharField(choices=[('text', 'Colonne texte'), ('visual', 'Colonne visuelle')], default='text', max_length=10)),
+                ('order', models.PositiveSmallIntegerField(default=0, help_text='Plus petit = affiché en premier.', verbose_name='Ordre dans le slider')),
+                ('is_active', models.BooleanField(default=True)),
+                ('badge_label', models.CharField(blank=True, help_text="Ex: 'Cabinet RH & Paie – Afrique'", max_length=120, verbose_name='Badge')),
+                ('badge_icon', models.CharField(blank=True, help_text="Ex: 'fas fa-file-invoice-dollar' (optionnel).", max_length=80, verbose_name='Classe icône FontAwesome')),
+                ('title', models.CharField(blank=True, max_length=200, verbose_name='Titre principal')),
+                ('highlighted_text', models.CharField(blank=True, help_text="Ex: 'Ressources Humaines' ou 'bulletins de paie'", max_length=120, verbose_name='Texte mis en valeur (span gold)')),
+                ('subtitle', models.TextField(blank=True, verbose_name='Texte descriptif')),
+                ('primary_label', models.CharField(blank=True, max_length=100, verbose_name='Texte bouton principal')),
+                ('primary_url', models.CharField(blank=True, help_text='Ex: #contact, #pricing ou URL complète.', max_length=200, verbose_name='Lien bouton principal')),
+                ('primary_icon', models.CharField(blank=True, help_text="Ex: 'fas fa-calendar-check'.", max_length=80, verbose_name='Classe icône bouton principal')),
+                ('secondary_label', models.CharField(blank=True, max_length=100, verbose_name='Texte bouton secondaire')),
+                ('secondary_url', models.CharField(blank=True, max_length=200, verbose_name='Lien bouton secondaire')),
+                ('secondary_icon', models.CharField(blank=True, max_length=80, verbose_name='Classe icône bouton secondaire')),
+                ('stat_1_value', models.CharField(blank=True, max_length=50)),
+                ('stat_1_label', models.CharField(blank=True, max_length=120)),
+                ('stat_2_value', models.CharField(blank=True, max_length=50)),
+                ('stat_2_label', models.CharField(blank=True, max_length=120)),
+                ('stat_3_value', models.CharField(blank=True, max_length=50)),
+                ('stat_3_label', models.CharField(blank=True, max_length=120)),
+                ('image', models.ImageField(blank=True, help_text='Image principale (pour les slides visuelles surtout).', null=True, upload_to='hero_slides/')),
+                ('visual_title', models.CharField(blank=True, max_length=150, verbose_name='Titre visuel')),
+                ('visual_subtitle', models.CharField(blank=True, max_length=200, verbose_name='Sous-titre visuel')),
+                ('visual_badge', models.CharField(blank=True, max_length=120, verbose_name='Badge visuel / pill')),
+                ('theme_variant', models.CharField(choices=[('auto', 'Automatique (suivre le thème)'), ('light', 'Forcer clair'), ('dark', 'Forcer sombre')], default='auto', help_text='Permet d’ajuster certains contrastes si besoin.', max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['order', 'pair_key', 'position'],
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.27 on 2026-10-18 13:14
+
+from django.db import migrations, models
+
+
+def backfill_features_list(apps, schema_editor):
+    PricingPlan = apps.get_model("website", "PricingPlan")
+    plans = list(PricingPlan.objects.only("id", "features"))
+    for plan in plans:
+        plan.features_list = [
+            " ".join(line.strip().lstrip("-•*·– ").split())
+            for line in plan.features.splitlines()
+            if line.strip().lstrip("-•*·– ")
+        ]
+    PricingPlan.objects.bulk_update(plans, ["features_list"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0002_heroslide'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pricingplan',
+            name='features_list',
+            field=models.JSONField(default=list, editable=False, verbose_name='Points forts (liste)'),
+        ),
+        migrations.RunPython(backfill_features_list, migrations.RunPython.noop),
+    ]
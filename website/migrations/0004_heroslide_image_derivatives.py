@@ -0,0 +1,18 @@
+# Generated by Django 4.2.27 on 2026-10-18 13:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0003_pricingplan_features_list'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='heroslide',
+            name='image_derivatives',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name="Déclinaisons de l'image"),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.27 on 2026-10-18 13:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0004_heroslide_image_derivatives'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='heroslide',
+            options={'ordering': ['order', 'pair_key', 'position'], 'verbose_name': "Slide d'accueil", 'verbose_name_plural': "Slides d'accueil"},
+        ),
+        migrations.AddIndex(
+            model_name='heroslide',
+            index=models.Index(fields=['is_active', 'order', 'pair_key', 'position'], name='heroslide_slider_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.27 on 2026-10-18 15:02
+
+import uuid
+
+from django.db import migrations, models
+
+
+def gen_submission_keys(apps, schema_editor):
+    ContactRequest = apps.get_model("website", "ContactRequest")
+    for row in ContactRequest.objects.only("pk").iterator():
+        row.submission_key = uuid.uuid4()
+        row.save(update_fields=["submission_key"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0005_heroslide_slider_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contactrequest',
+            name='submission_key',
+            field=models.UUIDField(editable=False, null=True, verbose_name='Clé de soumission'),
+        ),
+        migrations.RunPython(gen_submission_keys, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='contactrequest',
+            name='submission_key',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, unique=True, verbose_name='Clé de soumission'),
+        ),
+    ]
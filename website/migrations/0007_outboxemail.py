@@ -0,0 +1,40 @@
+# Generated by Django 4.2.27 on 2026-10-18 13:24
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0006_contactrequest_submission_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxEmail',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('category', models.CharField(blank=True, max_length=40, verbose_name='Catégorie')),
+                ('from_email', models.CharField(blank=True, max_length=255, verbose_name='Expéditeur')),
+                ('to', models.JSONField(default=list, verbose_name='Destinataires')),
+                ('reply_to', models.JSONField(blank=True, default=list, verbose_name='Répondre à')),
+                ('subject', models.CharField(max_length=255, verbose_name='Objet')),
+                ('body_text', models.TextField(verbose_name='Texte')),
+                ('body_html', models.TextField(blank=True, verbose_name='HTML')),
+                ('status', models.CharField(choices=[('pending', 'En attente'), ('retry', 'Nouvel essai prévu'), ('sent', 'Envoyé'), ('dead', 'Abandonné')], default='pending', max_length=10, verbose_name='Statut')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Tentatives')),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Prochain essai')),
+                ('last_error', models.TextField(blank=True, verbose_name='Dernière erreur')),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='Envoyé le')),
+            ],
+            options={
+                'verbose_name': 'Email sortant',
+                'verbose_name_plural': 'Emails sortants',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='outbox_due_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 4.2.27 on 2026-10-18 13:25
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0007_outboxemail'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='newslettercampaign',
+            name='chunks_done',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='newslettercampaign',
+            name='chunks_total',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='newslettercampaign',
+            name='delivery_started_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Envoi démarré le'),
+        ),
+        migrations.AddField(
+            model_name='newslettercampaign',
+            name='recipients_total',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Destinataires'),
+        ),
+        migrations.AlterField(
+            model_name='newslettercampaign',
+            name='status',
+            field=models.CharField(choices=[('draft', 'Brouillon'), ('scheduled', 'Planifiée'), ('sending', "En cours d'envoi"), ('sent', 'Envoyée')], default='draft', max_length=20, verbose_name='Statut'),
+        ),
+        migrations.CreateModel(
+            name='NewsletterDelivery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.PositiveSmallIntegerField(choices=[(1, 'Envoyé'), (2, 'Échec')], verbose_name='Statut')),
+                ('processed_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Traité le')),
+                ('error', models.CharField(blank=True, max_length=255, verbose_name='Erreur')),
+                ('campaign', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='deliveries', to='website.newslettercampaign', verbose_name='Campagne')),
+                ('subscriber', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='deliveries', to='website.newslettersubscriber', verbose_name='Abonné')),
+            ],
+            options={
+                'verbose_name': 'Envoi newsletter',
+                'verbose_name_plural': 'Envois newsletter',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='newsletterdelivery',
+            constraint=models.UniqueConstraint(fields=('campaign', 'subscriber'), name='newsletter_delivery_unique'),
+        ),
+    ]
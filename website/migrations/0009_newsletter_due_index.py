@@ -0,0 +1,17 @@
+# Generated by Django 4.2.27 on 2026-10-18 13:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0008_newsletter_delivery'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='newslettercampaign',
+            index=models.Index(condition=models.Q(('status', 'scheduled')), fields=['scheduled_at'], name='newsletter_due_idx'),
+        ),
+    ]
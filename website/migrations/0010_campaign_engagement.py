@@ -0,0 +1,47 @@
+# Generated by Django 4.2.27 on 2026-10-18 13:32
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0009_newsletter_due_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CampaignEngagement',
+            fields=[
+                ('campaign', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='engagement', serialize=False, to='website.newslettercampaign', verbose_name='Campagne')),
+                ('opens', models.PositiveIntegerField(default=0, verbose_name='Ouvertures')),
+                ('unique_opens', models.PositiveIntegerField(default=0, verbose_name='Ouvreurs uniques')),
+                ('clicks', models.PositiveIntegerField(default=0, verbose_name='Clics')),
+                ('unique_clicks', models.PositiveIntegerField(default=0, verbose_name='Cliqueurs uniques')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Mis à jour le')),
+            ],
+            options={
+                'verbose_name': 'Statistiques de campagne',
+                'verbose_name_plural': 'Statistiques de campagnes',
+            },
+        ),
+        migrations.CreateModel(
+            name='CampaignLinkClicks',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.URLField(max_length=500, verbose_name='Lien')),
+                ('clicks', models.PositiveIntegerField(default=0, verbose_name='Clics')),
+                ('campaign', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='link_clicks', to='website.newslettercampaign', verbose_name='Campagne')),
+            ],
+            options={
+                'verbose_name': 'Clics par lien',
+                'verbose_name_plural': 'Clics par lien',
+                'ordering': ['-clicks'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='campaignlinkclicks',
+            constraint=models.UniqueConstraint(fields=('campaign', 'url'), name='campaign_link_unique'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.27 on 2026-10-18 13:34
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_published_at(apps, schema_editor):
+    # Offres publiées sans date : la pagination par clé les ignorerait.
+    JobOffer = apps.get_model("website", "JobOffer")
+    JobOffer.objects.filter(is_published=True, published_at__isnull=True).update(published_at=F("created_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0010_campaign_engagement'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_published_at, migrations.RunPython.noop),
+        migrations.AlterModelOptions(
+            name='joboffer',
+            options={'ordering': ['-published_at', '-id'], 'verbose_name': "Offre d'emploi", 'verbose_name_plural': "Offres d'emploi"},
+        ),
+        migrations.AddIndex(
+            model_name='joboffer',
+            index=models.Index(models.OrderBy(models.F('published_at'), descending=True), models.OrderBy(models.F('id'), descending=True), condition=models.Q(('is_published', True)), name='joboffer_published_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='joboffer',
+            index=models.Index(models.F('contract_type'), models.OrderBy(models.F('published_at'), descending=True), models.OrderBy(models.F('id'), descending=True), condition=models.Q(('is_published', True)), name='joboffer_contract_idx'),
+        ),
+    ]
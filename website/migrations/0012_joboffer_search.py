@@ -0,0 +1,77 @@
+# Generated by Django 4.2.27 on 2026-10-18 13:35
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+POSTGRESQL_FORWARD = [
+    """
+    CREATE FUNCTION website_joboffer_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('french', coalesce(NEW.title, '')), 'A') ||
+            setweight(to_tsvector('french', coalesce(NEW.short_description, '')), 'B') ||
+            setweight(to_tsvector('french', coalesce(NEW.description, '')), 'C');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER website_joboffer_search_vector
+    BEFORE INSERT OR UPDATE OF title, short_description, description ON website_joboffer
+    FOR EACH ROW EXECUTE FUNCTION website_joboffer_search_vector_update()
+    """,
+    "UPDATE website_joboffer SET title = title",
+    "CREATE INDEX joboffer_search_idx ON website_joboffer USING gin (search_vector)",
+]
+
+POSTGRESQL_BACKWARD = [
+    "DROP INDEX IF EXISTS joboffer_search_idx",
+    "DROP TRIGGER IF EXISTS website_joboffer_search_vector ON website_joboffer",
+    "DROP FUNCTION IF EXISTS website_joboffer_search_vector_update()",
+]
+
+# Les triggers SQLite sont aussi (re)créés après chaque migrate : une
+# reconstruction de table par l'éditeur de schéma SQLite les supprime.
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE website_joboffer_fts USING fts5(
+        title, short_description, description,
+        content='website_joboffer', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    "INSERT INTO website_joboffer_fts(website_joboffer_fts) VALUES ('rebuild')",
+]
+
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS website_joboffer_fts_ai",
+    "DROP TRIGGER IF EXISTS website_joboffer_fts_ad",
+    "DROP TRIGGER IF EXISTS website_joboffer_fts_au",
+    "DROP TABLE IF EXISTS website_joboffer_fts",
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0011_joboffer_keyset'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='joboffer',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(
+            _run({"postgresql": POSTGRESQL_FORWARD, "sqlite": SQLITE_FORWARD}),
+            _run({"postgresql": POSTGRESQL_BACKWARD, "sqlite": SQLITE_BACKWARD}),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.27 on 2026-10-18 13:37
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0012_joboffer_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UploadSession',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('token', models.UUIDField(default=uuid.uuid4, editable=False, unique=True, verbose_name='Jeton')),
+                ('filename', models.CharField(max_length=255, verbose_name='Nom du fichier')),
+                ('size', models.PositiveBigIntegerField(verbose_name='Taille annoncée (octets)')),
+                ('offset', models.PositiveBigIntegerField(default=0, verbose_name='Octets reçus')),
+            ],
+            options={
+                'verbose_name': 'Téléversement en cours',
+                'verbose_name_plural': 'Téléversements en cours',
+                'indexes': [models.Index(fields=['updated_at'], name='upload_session_stale_idx')],
+            },
+        ),
+    ]
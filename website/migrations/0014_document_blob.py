@@ -0,0 +1,51 @@
+# Generated by Django 4.2.27 on 2026-10-18 15:02
+
+from django.db import migrations, models
+import django.db.models.deletion
+import website.models
+import website.storage
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0013_upload_session'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentBlob',
+            fields=[
+                ('sha256', models.CharField(max_length=64, primary_key=True, serialize=False, verbose_name='SHA-256')),
+                ('file', models.FileField(max_length=80, storage=website.storage.ContentAddressedStorage(), upload_to=website.models.document_blob_path, verbose_name='Fichier')),
+                ('size', models.PositiveBigIntegerField(verbose_name='Taille (octets)')),
+                ('ref_count', models.PositiveIntegerField(default=0, verbose_name='Candidatures liées')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Document stocké',
+                'verbose_name_plural': 'Documents stockés',
+                'indexes': [models.Index(condition=models.Q(('ref_count', 0)), fields=['sha256'], name='document_blob_orphan_idx')],
+            },
+        ),
+        migrations.AddField(
+            model_name='jobapplication',
+            name='cv_blob',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='website.documentblob', verbose_name='CV'),
+        ),
+        migrations.AddField(
+            model_name='jobapplication',
+            name='cv_filename',
+            field=models.CharField(blank=True, max_length=255, verbose_name="Nom d'origine du CV"),
+        ),
+        migrations.AddField(
+            model_name='jobapplication',
+            name='cover_letter_blob',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='website.documentblob', verbose_name='Lettre de motivation'),
+        ),
+        migrations.AddField(
+            model_name='jobapplication',
+            name='cover_letter_filename',
+            field=models.CharField(blank=True, max_length=255, verbose_name="Nom d'origine de la lettre"),
+        ),
+    ]
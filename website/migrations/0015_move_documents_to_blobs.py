@@ -0,0 +1,70 @@
+# Generated by Django 4.2.27 on 2026-10-18 15:02
+
+import hashlib
+import os
+import shutil
+
+from django.conf import settings
+from django.db import migrations
+from django.db.models import F
+
+from website.storage import ContentAddressedStorage, blob_name
+
+
+def _link_or_copy(path, target):
+    """Place ``path`` en ``target`` (lien physique, sinon copie) sans toucher l'original."""
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    temporary = f"{target}.{os.getpid()}.tmp"
+    try:
+        os.link(path, temporary)
+    except OSError:
+        shutil.copyfile(path, temporary)
+    os.replace(temporary, target)
+
+
+def move_documents(apps, schema_editor):
+    """
+    Range les documents existants sous leur SHA-256 ; les doublons ne sont
+    conservés qu'une fois. Les fichiers introuvables laissent le champ vide.
+
+    Les originaux restent en place : si la migration échoue, la transaction
+    est annulée sans perte de fichier, et une nouvelle exécution réutilise les
+    blobs déjà écrits. Ils sont supprimés par 0022_remove_original_documents,
+    une fois les anciens FileField retirés.
+    """
+    JobApplication = apps.get_model("website", "JobApplication")
+    DocumentBlob = apps.get_model("website", "DocumentBlob")
+    storage = ContentAddressedStorage()
+
+    for application in JobApplication.objects.iterator():
+        for field in ("cv", "cover_letter"):
+            name = getattr(application, field).name
+            path = os.path.join(settings.MEDIA_ROOT, name) if name else None
+            if not path or not os.path.isfile(path):
+                continue
+            hasher = hashlib.sha256()
+            with open(path, "rb") as source:
+                for chunk in iter(lambda: source.read(1024 * 1024), b""):
+                    hasher.update(chunk)
+            sha256 = hasher.hexdigest()
+            size = os.path.getsize(path)
+            target = storage.path(blob_name(sha256))
+            if not os.path.exists(target):
+                _link_or_copy(path, target)
+            DocumentBlob.objects.get_or_create(sha256=sha256, defaults={"file": blob_name(sha256), "size": size})
+            DocumentBlob.objects.filter(pk=sha256).update(ref_count=F("ref_count") + 1)
+            setattr(application, f"{field}_blob_id", sha256)
+            setattr(application, f"{field}_filename", os.path.basename(name)[:255])
+        application.save(update_fields=["cv_blob", "cv_filename", "cover_letter_blob", "cover_letter_filename"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0014_document_blob'),
+    ]
+
+    # Irréversible : les anciens FileField sont retirés par 0016.
+    operations = [
+        migrations.RunPython(move_documents),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.27 on 2026-10-18 15:02
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0015_move_documents_to_blobs'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='jobapplication',
+            name='cv',
+        ),
+        migrations.RemoveField(
+            model_name='jobapplication',
+            name='cover_letter',
+        ),
+        migrations.RenameField(
+            model_name='jobapplication',
+            old_name='cv_blob',
+            new_name='cv',
+        ),
+        migrations.RenameField(
+            model_name='jobapplication',
+            old_name='cover_letter_blob',
+            new_name='cover_letter',
+        ),
+    ]
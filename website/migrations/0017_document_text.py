@@ -0,0 +1,38 @@
+# Generated by Django 4.2.27 on 2026-10-18 13:47
+
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0016_jobapplication_documents'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='documentblob',
+            name='text',
+            field=models.TextField(blank=True, editable=False, verbose_name='Texte extrait'),
+        ),
+        migrations.AddField(
+            model_name='documentblob',
+            name='text_status',
+            field=models.CharField(choices=[('pending', 'En attente'), ('extracted', 'Extrait'), ('unsupported', 'Format non pris en charge'), ('failed', 'Échec')], default='pending', editable=False, max_length=12, verbose_name='Extraction du texte'),
+        ),
+        migrations.AddField(
+            model_name='jobapplication',
+            name='document_text',
+            field=models.TextField(blank=True, editable=False, verbose_name='Texte des documents'),
+        ),
+        migrations.AddField(
+            model_name='jobapplication',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='documentblob',
+            index=models.Index(condition=models.Q(('text_status', 'pending')), fields=['created_at'], name='document_blob_text_idx'),
+        ),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 4.2.27 on 2026-10-18 13:48
+
+from django.db import migrations
+
+POSTGRESQL_FORWARD = [
+    """
+    CREATE FUNCTION website_jobapplication_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('french', coalesce(NEW.last_name, '') || ' ' || coalesce(NEW.first_name, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(NEW.email, '') || ' ' || coalesce(NEW.phone, '')), 'B') ||
+            setweight(to_tsvector('french', coalesce(NEW.notes, '')), 'C') ||
+            setweight(to_tsvector('french', coalesce(NEW.document_text, '')), 'D');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER website_jobapplication_search_vector
+    BEFORE INSERT OR UPDATE OF last_name, first_name, email, phone, notes, document_text ON website_jobapplication
+    FOR EACH ROW EXECUTE FUNCTION website_jobapplication_search_vector_update()
+    """,
+    "UPDATE website_jobapplication SET last_name = last_name",
+    "CREATE INDEX jobapplication_search_idx ON website_jobapplication USING gin (search_vector)",
+]
+
+POSTGRESQL_BACKWARD = [
+    "DROP INDEX IF EXISTS jobapplication_search_idx",
+    "DROP TRIGGER IF EXISTS website_jobapplication_search_vector ON website_jobapplication",
+    "DROP FUNCTION IF EXISTS website_jobapplication_search_vector_update()",
+]
+
+# Triggers SQLite (re)créés après chaque migrate, voir 0012_joboffer_search.
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE website_jobapplication_fts USING fts5(
+        last_name, first_name, email, phone, notes, document_text,
+        content='website_jobapplication', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    "INSERT INTO website_jobapplication_fts(website_jobapplication_fts) VALUES ('rebuild')",
+]
+
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS website_jobapplication_fts_ai",
+    "DROP TRIGGER IF EXISTS website_jobapplication_fts_ad",
+    "DROP TRIGGER IF EXISTS website_jobapplication_fts_au",
+    "DROP TABLE IF EXISTS website_jobapplication_fts",
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0017_document_text'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({"postgresql": POSTGRESQL_FORWARD, "sqlite": SQLITE_FORWARD}),
+            _run({"postgresql": POSTGRESQL_BACKWARD, "sqlite": SQLITE_BACKWARD}),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.27 on 2026-10-18 13:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0018_jobapplication_search'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='joboffer',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['closing_date'], name='joboffer_closing_idx'),
+        ),
+    ]
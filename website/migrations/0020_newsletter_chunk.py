@@ -0,0 +1,36 @@
+# Generated by Django 4.2.27 on 2026-10-18 14:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0019_joboffer_closing_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NewsletterChunk',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('after_id', models.PositiveBigIntegerField(verbose_name="Après l'abonné")),
+                ('upto_id', models.PositiveBigIntegerField(blank=True, null=True, verbose_name="Jusqu'à l'abonné")),
+                ('dispatched_at', models.DateTimeField(blank=True, null=True, verbose_name='Planifiée le')),
+                ('leased_until', models.DateTimeField(blank=True, null=True, verbose_name="Réservée jusqu'au")),
+                ('lease_owner', models.CharField(blank=True, max_length=64, verbose_name='Tâche')),
+                ('completed_at', models.DateTimeField(blank=True, null=True, verbose_name='Terminée le')),
+                ('campaign', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chunks', to='website.newslettercampaign', verbose_name='Campagne')),
+            ],
+            options={
+                'verbose_name': "Tranche d'envoi",
+                'verbose_name_plural': "Tranches d'envoi",
+                'ordering': ['campaign', 'after_id'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='newsletterchunk',
+            constraint=models.UniqueConstraint(fields=('campaign', 'after_id'), name='newsletter_chunk_unique'),
+        ),
+    ]
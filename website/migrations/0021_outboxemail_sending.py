@@ -0,0 +1,18 @@
+# Generated by Django 4.2.27 on 2026-10-18 14:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0020_newsletter_chunk'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='outboxemail',
+            name='status',
+            field=models.CharField(choices=[('pending', 'En attente'), ('retry', 'Nouvel essai prévu'), ('sending', 'Envoi en cours'), ('sent', 'Envoyé'), ('dead', 'Abandonné')], default='pending', max_length=10, verbose_name='Statut'),
+        ),
+    ]
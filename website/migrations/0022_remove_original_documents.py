@@ -0,0 +1,50 @@
+# Generated by Django 4.2.27 on 2026-10-18 16:20
+
+import hashlib
+import os
+
+from django.conf import settings
+from django.db import migrations
+
+from website.storage import ContentAddressedStorage, blob_name
+
+ORIGINALS_DIRNAME = "candidatures"
+
+
+def _sha256(path):
+    hasher = hashlib.sha256()
+    with open(path, "rb") as source:
+        for chunk in iter(lambda: source.read(1024 * 1024), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def remove_original_documents(apps, schema_editor):
+    """
+    Supprime les anciens fichiers de MEDIA_ROOT/candidatures déjà rangés sous
+    leur SHA-256 par 0015_move_documents_to_blobs.
+
+    Un original n'est supprimé que si le blob de même contenu existe ; les
+    autres fichiers restent en place. Peut être rejouée sans risque.
+    """
+    storage = ContentAddressedStorage()
+    root = os.path.join(settings.MEDIA_ROOT, ORIGINALS_DIRNAME)
+    for directory, _subdirectories, filenames in os.walk(root, topdown=False):
+        for filename in filenames:
+            path = os.path.join(directory, filename)
+            target = storage.path(blob_name(_sha256(path)))
+            if os.path.isfile(target) and os.path.getsize(target) == os.path.getsize(path):
+                os.remove(path)
+        if directory != root and not os.listdir(directory):
+            os.rmdir(directory)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0021_outboxemail_sending'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_original_documents, migrations.RunPython.noop),
+    ]
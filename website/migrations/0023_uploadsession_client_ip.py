@@ -0,0 +1,22 @@
+# Generated by Django 4.2.27 on 2026-10-18 14:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0022_remove_original_documents'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uploadsession',
+            name='client_ip',
+            field=models.GenericIPAddressField(blank=True, editable=False, null=True, verbose_name='Adresse du client'),
+        ),
+        migrations.AddIndex(
+            model_name='uploadsession',
+            index=models.Index(fields=['client_ip'], name='upload_session_client_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.27 on 2026-10-18 17:05
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def fill_url_hash(apps, schema_editor):
+    CampaignLinkClicks = apps.get_model("website", "CampaignLinkClicks")
+    for link in CampaignLinkClicks.objects.only("url").iterator():
+        link.url_hash = hashlib.sha256(link.url.encode()).hexdigest()
+        link.save(update_fields=["url_hash"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0023_uploadsession_client_ip'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='campaignlinkclicks',
+            name='campaign_link_unique',
+        ),
+        migrations.AddField(
+            model_name='campaignlinkclicks',
+            name='url_hash',
+            field=models.CharField(default='', editable=False, max_length=64, verbose_name='Empreinte du lien'),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_url_hash, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='campaignlinkclicks',
+            name='url',
+            field=models.TextField(verbose_name='Lien'),
+        ),
+        migrations.AddConstraint(
+            model_name='campaignlinkclicks',
+            constraint=models.UniqueConstraint(fields=('campaign', 'url_hash'), name='campaign_link_unique'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.27 on 2026-10-18 14:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0024_campaignlinkclicks_url_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboxemail',
+            name='lease',
+            field=models.UUIDField(blank=True, editable=False, null=True, verbose_name='Réservation'),
+        ),
+    ]
@@ -1,5 +1,14 @@
 # website/models.py
-from django.db import models
+import re
+import uuid
+
+from django.contrib.postgres.search import SearchVectorField
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .storage import blob_name, document_storage
 
 
 class TimeStampedModel(models.Model):
@@ -33,7 +42,23 @@ class Service(TimeStampedModel):
         return self.title
 
 
+FEATURE_BULLET_RE = re.compile(r"^[\s\-•*·–]+")
+
+
+def parse_features(text):
+    """Une fonctionnalité par ligne : puces retirées, espaces normalisés, lignes vides ignorées."""
+    items = []
+    for line in (text or "").splitlines():
+        item = " ".join(FEATURE_BULLET_RE.sub("", line).split())
+        if item:
+            items.append(item)
+    return items
+
+
 class PricingPlan(TimeStampedModel):
+    MAX_FEATURES = 15
+    FEATURE_MAX_LENGTH = 160
+
     name = models.CharField("Nom du pack", max_length=150)
     slug = models.SlugField(unique=True)
     tagline = models.CharField("Sous-titre", max_length=255, blank=True)
@@ -60,6 +85,8 @@ class PricingPlan(TimeStampedModel):
         "Points forts (1 par ligne)",
         help_text="Saisir une fonctionnalité par ligne"
     )
+    # Liste déjà découpée, tenue à jour dans save() : aucun traitement au rendu.
+    features_list = models.JSONField("Points forts (liste)", default=list, editable=False)
     is_featured = models.BooleanField("Mettre en avant", default=False)
     order = models.PositiveIntegerField("Ordre d'affichage", default=0)
     is_active = models.BooleanField("Actif", default=True)
@@ -72,9 +99,34 @@ class PricingPlan(TimeStampedModel):
     def __str__(self):
         return self.name
 
-    @property
-    def features_list(self):
-        return [f.strip() for f in self.features.splitlines() if f.strip()]
+    def clean(self):
+        super().clean()
+        items = parse_features(self.features)
+        errors = []
+        if not items:
+            errors.append("Saisir au moins une fonctionnalité.")
+        if len(items) > self.MAX_FEATURES:
+            errors.append(f"{self.MAX_FEATURES} fonctionnalités maximum ({len(items)} saisies).")
+        too_long = [item for item in items if len(item) > self.FEATURE_MAX_LENGTH]
+        if too_long:
+            errors.append(
+                f"Chaque ligne doit faire au plus {self.FEATURE_MAX_LENGTH} caractères : « {too_long[0][:40]}… »."
+            )
+        seen = set()
+        duplicates = [item for item in items if item.casefold() in seen or seen.add(item.casefold())]
+        if duplicates:
+            errors.append(f"Ligne en double : « {duplicates[0]} ».")
+        if errors:
+            raise ValidationError({"features": errors})
+        # Texte source normalisé : ce qui est enregistré est ce qui est affiché.
+        self.features = "\n".join(items)
+
+    def save(self, *args, **kwargs):
+        self.features_list = parse_features(self.features)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "features" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "features_list"}
+        super().save(*args, **kwargs)
 
 
 class Testimonial(TimeStampedModel):
@@ -140,6 +192,14 @@ class ContactRequest(TimeStampedModel):
         "J’accepte d’être recontacté",
         default=True
     )
+    # Clé d'idempotence posée à la soumission : une entrée du flux Redis
+    # relivrée ne crée pas de doublon (voir ingest.py).
+    submission_key = models.UUIDField(
+        "Clé de soumission",
+        default=uuid.uuid4,
+        unique=True,
+        editable=False,
+    )
 
     class Meta:
         ordering = ["-created_at"]
@@ -164,14 +224,21 @@ class NewsletterSubscriber(models.Model):
     def __str__(self):
         return self.email
 
+    @staticmethod
+    def normalize_email(email):
+        """Forme canonique stockée (l'unicité de ``email`` est sensible à la casse)."""
+        return email.strip().lower()
+
 
 class NewsletterCampaign(models.Model):
     STATUS_DRAFT = "draft"
     STATUS_SCHEDULED = "scheduled"
+    STATUS_SENDING = "sending"
     STATUS_SENT = "sent"
     STATUS_CHOICES = [
         (STATUS_DRAFT, "Brouillon"),
         (STATUS_SCHEDULED, "Planifiée"),
+        (STATUS_SENDING, "En cours d'envoi"),
         (STATUS_SENT, "Envoyée"),
     ]
 
@@ -195,10 +262,25 @@ class NewsletterCampaign(models.Model):
     )
     created_at = models.DateTimeField("Créée le", auto_now_add=True)
 
+    # Suivi de l'envoi (voir newsletter.py)
+    delivery_started_at = models.DateTimeField("Envoi démarré le", null=True, blank=True)
+    recipients_total = models.PositiveIntegerField("Destinataires", default=0, editable=False)
+    chunks_total = models.PositiveIntegerField(default=0, editable=False)
+    chunks_done = models.PositiveIntegerField(default=0, editable=False)
+
     class Meta:
         ordering = ["-created_at"]
         verbose_name = "Campagne newsletter"
         verbose_name_plural = "Campagnes newsletter"
+        indexes = [
+            # Campagnes dues (claim_due_campaigns) : l'index ne contient que les
+            # campagnes planifiées, quel que soit l'historique envoyé.
+            models.Index(
+                fields=["scheduled_at"],
+                condition=models.Q(status="scheduled"),
+                name="newsletter_due_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.title} ({self.get_status_display()})"
@@ -212,6 +294,67 @@ class NewsletterCampaign(models.Model):
         )
 
 
+class NewsletterChunk(models.Model):
+    """
+    Tranche d'abonnés (after_id, upto_id] d'une campagne, envoyée par une
+    tâche deliver_newsletter_chunk (newsletter.py).
+
+    La tranche est terminée une seule fois (``completed_at``) : une tâche
+    relivrée ou relancée ne la compte pas deux fois. Le bail (``leased_until``,
+    ``lease_owner``) garantit qu'une seule tâche l'envoie à la fois.
+    """
+    campaign = models.ForeignKey(
+        NewsletterCampaign, on_delete=models.CASCADE, related_name="chunks", verbose_name="Campagne"
+    )
+    after_id = models.PositiveBigIntegerField("Après l'abonné")
+    upto_id = models.PositiveBigIntegerField("Jusqu'à l'abonné", null=True, blank=True)
+    dispatched_at = models.DateTimeField("Planifiée le", null=True, blank=True)
+    leased_until = models.DateTimeField("Réservée jusqu'au", null=True, blank=True)
+    lease_owner = models.CharField("Tâche", max_length=64, blank=True)
+    completed_at = models.DateTimeField("Terminée le", null=True, blank=True)
+
+    class Meta:
+        ordering = ["campaign", "after_id"]
+        verbose_name = "Tranche d'envoi"
+        verbose_name_plural = "Tranches d'envoi"
+        constraints = [
+            models.UniqueConstraint(fields=["campaign", "after_id"], name="newsletter_chunk_unique"),
+        ]
+
+    def __str__(self):
+        return f"{self.campaign_id} : ({self.after_id}, {self.upto_id or '∞'}]"
+
+
+class NewsletterDelivery(models.Model):
+    """État d'envoi par destinataire : une ligne courte par (campagne, abonné)."""
+    STATUS_SENT = 1
+    STATUS_FAILED = 2
+    STATUS_CHOICES = [
+        (STATUS_SENT, "Envoyé"),
+        (STATUS_FAILED, "Échec"),
+    ]
+
+    campaign = models.ForeignKey(
+        NewsletterCampaign, on_delete=models.CASCADE, related_name="deliveries", verbose_name="Campagne"
+    )
+    subscriber = models.ForeignKey(
+        NewsletterSubscriber, on_delete=models.CASCADE, related_name="deliveries", verbose_name="Abonné"
+    )
+    status = models.PositiveSmallIntegerField("Statut", choices=STATUS_CHOICES)
+    processed_at = models.DateTimeField("Traité le", default=timezone.now)
+    error = models.CharField("Erreur", max_length=255, blank=True)
+
+    class Meta:
+        verbose_name = "Envoi newsletter"
+        verbose_name_plural = "Envois newsletter"
+        constraints = [
+            models.UniqueConstraint(fields=["campaign", "subscriber"], name="newsletter_delivery_unique"),
+        ]
+
+    def __str__(self):
+        return f"{self.campaign_id} → {self.subscriber_id} ({self.get_status_display()})"
+
+
 class JobOffer(TimeStampedModel):
     CONTRACT_CHOICES = [
         ("cdi", "CDI"),
@@ -230,16 +373,54 @@ class JobOffer(TimeStampedModel):
     is_published = models.BooleanField("Publiée sur le site", default=True)
     published_at = models.DateTimeField("Date de publication", null=True, blank=True)
     closing_date = models.DateTimeField("Date limite de candidature", null=True, blank=True)
+    # Tenu à jour en base (trigger PostgreSQL) ; voir website/search.py
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
-        ordering = ["-published_at", "-created_at"]
+        ordering = ["-published_at", "-id"]
         verbose_name = "Offre d'emploi"
         verbose_name_plural = "Offres d'emploi"
+        indexes = [
+            # Liste publique (pagination par clé) : même ordre que la requête,
+            # limité aux offres publiées.
+            models.Index(
+                F("published_at").desc(), F("id").desc(),
+                condition=Q(is_published=True),
+                name="joboffer_published_idx",
+            ),
+            models.Index(
+                F("contract_type"), F("published_at").desc(), F("id").desc(),
+                condition=Q(is_published=True),
+                name="joboffer_contract_idx",
+            ),
+            # Expiration des offres (offers.expire_job_offers) : seules les
+            # offres encore publiées sont indexées.
+            models.Index(fields=["closing_date"], condition=Q(is_published=True), name="joboffer_closing_idx"),
+        ]
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        # La pagination par clé suppose une date de publication renseignée.
+        if self.is_published and self.published_at is None:
+            self.published_at = timezone.now()
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "published_at"}
+        super().save(*args, **kwargs)
+
+    @property
+    def is_open(self):
+        return self.closing_date is None or self.closing_date > timezone.now()
+
+    @property
+    def accepts_applications(self):
+        return self.is_published and self.is_open
+
 
+# Anciens emplacements des documents, conservés pour l'historique des migrations
+# (les documents sont désormais des DocumentBlob, voir website/storage.py).
 def cv_upload_path(instance, filename):
     return f"candidatures/{instance.job_offer.slug}/{instance.last_name}_{instance.first_name}_cv_{filename}"
 
@@ -248,14 +429,69 @@ def cover_letter_upload_path(instance, filename):
     return f"candidatures/{instance.job_offer.slug}/{instance.last_name}_{instance.first_name}_lm_{filename}"
 
 
+def document_blob_path(instance, filename):
+    return blob_name(instance.sha256)
+
+
+class DocumentBlob(models.Model):
+    """
+    Contenu d'un document de candidature, stocké une seule fois sous son
+    SHA-256 (website/storage.py) ; ``ref_count`` compte les candidatures qui
+    le référencent, les contenus orphelins sont supprimés par
+    documents.collect_orphan_blobs.
+    """
+    TEXT_PENDING = "pending"
+    TEXT_EXTRACTED = "extracted"
+    TEXT_UNSUPPORTED = "unsupported"
+    TEXT_FAILED = "failed"
+    TEXT_STATUS_CHOICES = [
+        (TEXT_PENDING, "En attente"),
+        (TEXT_EXTRACTED, "Extrait"),
+        (TEXT_UNSUPPORTED, "Format non pris en charge"),
+        (TEXT_FAILED, "Échec"),
+    ]
+
+    sha256 = models.CharField("SHA-256", max_length=64, primary_key=True)
+    file = models.FileField("Fichier", storage=document_storage, upload_to=document_blob_path, max_length=80)
+    size = models.PositiveBigIntegerField("Taille (octets)")
+    ref_count = models.PositiveIntegerField("Candidatures liées", default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Texte extrait en tâche de fond (website/extraction.py)
+    text = models.TextField("Texte extrait", blank=True, editable=False)
+    text_status = models.CharField(
+        "Extraction du texte",
+        max_length=12,
+        choices=TEXT_STATUS_CHOICES,
+        default=TEXT_PENDING,
+        editable=False,
+    )
+
+    class Meta:
+        verbose_name = "Document stocké"
+        verbose_name_plural = "Documents stockés"
+        indexes = [
+            models.Index(fields=["sha256"], condition=Q(ref_count=0), name="document_blob_orphan_idx"),
+            models.Index(fields=["created_at"], condition=Q(text_status="pending"), name="document_blob_text_idx"),
+        ]
+
+    def __str__(self):
+        return self.sha256
+
+
 class JobApplication(TimeStampedModel):
     job_offer = models.ForeignKey(JobOffer, on_delete=models.CASCADE, related_name="applications", verbose_name="Offre")
     first_name = models.CharField("Prénom", max_length=100)
     last_name = models.CharField("Nom", max_length=100)
     email = models.EmailField("Email")
     phone = models.CharField("Téléphone", max_length=50)
-    cv = models.FileField("CV", upload_to=cv_upload_path)
-    cover_letter = models.FileField("Lettre de motivation", upload_to=cover_letter_upload_path)
+    cv = models.ForeignKey(
+        DocumentBlob, on_delete=models.PROTECT, null=True, related_name="+", verbose_name="CV"
+    )
+    cv_filename = models.CharField("Nom d'origine du CV", max_length=255, blank=True)
+    cover_letter = models.ForeignKey(
+        DocumentBlob, on_delete=models.PROTECT, null=True, related_name="+", verbose_name="Lettre de motivation"
+    )
+    cover_letter_filename = models.CharField("Nom d'origine de la lettre", max_length=255, blank=True)
     notes = models.TextField("Message / Notes du candidat", blank=True)
     processed = models.BooleanField("Dossier traité", default=False)
     status = models.CharField(
@@ -264,6 +500,10 @@ class JobApplication(TimeStampedModel):
         default="reçu",
         help_text="Ex: reçu, en cours, retenu, rejeté..."
     )
+    # Texte du CV et de la lettre, recopié des DocumentBlob après extraction ;
+    # search_vector est tenu à jour en base (trigger PostgreSQL), voir search.py
+    document_text = models.TextField("Texte des documents", blank=True, editable=False)
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         ordering = ["-created_at"]
@@ -272,6 +512,38 @@ class JobApplication(TimeStampedModel):
 
     def __str__(self):
         return f"{self.last_name} {self.first_name} – {self.job_offer.title}"
+
+
+class UploadSession(TimeStampedModel):
+    """
+    Téléversement reprenable d'un document de candidature (website/uploads.py).
+
+    Le fichier est assemblé morceau par morceau sous MEDIA_ROOT ; la
+    candidature ne référence ensuite que ``token``.
+    """
+    token = models.UUIDField("Jeton", default=uuid.uuid4, unique=True, editable=False)
+    filename = models.CharField("Nom du fichier", max_length=255)
+    size = models.PositiveBigIntegerField("Taille annoncée (octets)")
+    offset = models.PositiveBigIntegerField("Octets reçus", default=0)
+    client_ip = models.GenericIPAddressField("Adresse du client", null=True, blank=True, editable=False)
+
+    class Meta:
+        verbose_name = "Téléversement en cours"
+        verbose_name_plural = "Téléversements en cours"
+        indexes = [
+            models.Index(fields=["updated_at"], name="upload_session_stale_idx"),
+            # Plafond de téléversements ouverts par client (uploads.create_upload)
+            models.Index(fields=["client_ip"], name="upload_session_client_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.filename} ({self.offset}/{self.size})"
+
+    @property
+    def is_complete(self):
+        return self.offset >= self.size
+
+
 class HeroSlide(models.Model):
     POSITION_TEXT = "text"
     POSITION_VISUAL = "visual"
@@ -388,6 +660,8 @@ class HeroSlide(models.Model):
         null=True,
         help_text="Image principale (pour les slides visuelles surtout)."
     )
+    # Rempli par la tâche generate_hero_slide_derivatives (voir website/images.py)
+    image_derivatives = models.JSONField("Déclinaisons de l'image", default=dict, blank=True, editable=False)
     visual_title = models.CharField(
         "Titre visuel",
         max_length=150,
@@ -416,6 +690,135 @@ class HeroSlide(models.Model):
 
     class Meta:
         ordering = ["order", "pair_key", "position"]
+        verbose_name = "Slide d'accueil"
+        verbose_name_plural = "Slides d'accueil"
+        indexes = [
+            # Reconstruction du slider : un seul parcours d'index, déjà trié.
+            models.Index(fields=["is_active", "order", "pair_key", "position"], name="heroslide_slider_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.get_position_display()} – {self.title or self.pair_key}"
+
+    def clean(self):
+        super().clean()
+        duplicate = HeroSlide.objects.filter(pair_key=self.pair_key, position=self.position).exclude(pk=self.pk)
+        if duplicate.exists():
+            raise ValidationError(
+                {"position": f"La paire « {self.pair_key} » a déjà une slide « {self.get_position_display()} »."}
+            )
+
+    @property
+    def partner(self):
+        """Slide associée (même pair_key, autre colonne), ou None si orpheline."""
+        other = self.POSITION_VISUAL if self.position == self.POSITION_TEXT else self.POSITION_TEXT
+        return HeroSlide.objects.filter(pair_key=self.pair_key, position=other).first()
+
+    @property
+    def image_derivatives_stale(self):
+        return bool(self.image) and self.image_derivatives.get("source") != self.image.name
+
+    def save(self, *args, **kwargs):
+        if not self.image and self.image_derivatives:
+            from .images import delete_derivatives
+
+            removed, self.image_derivatives = self.image_derivatives, {}
+            transaction.on_commit(lambda: delete_derivatives(removed))
+        super().save(*args, **kwargs)
+
+
+class OutboxEmail(TimeStampedModel):
+    """
+    Email en attente d'envoi, écrit dans la même transaction que la donnée
+    métier qui le déclenche ; relayé par la tâche relay_outbox (outbox.py).
+    """
+    STATUS_PENDING = "pending"
+    STATUS_RETRY = "retry"
+    STATUS_SENDING = "sending"
+    STATUS_SENT = "sent"
+    STATUS_DEAD = "dead"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "En attente"),
+        (STATUS_RETRY, "Nouvel essai prévu"),
+        (STATUS_SENDING, "Envoi en cours"),
+        (STATUS_SENT, "Envoyé"),
+        (STATUS_DEAD, "Abandonné"),
+    ]
+
+    category = models.CharField("Catégorie", max_length=40, blank=True)
+    from_email = models.CharField("Expéditeur", max_length=255, blank=True)
+    to = models.JSONField("Destinataires", default=list)
+    reply_to = models.JSONField("Répondre à", default=list, blank=True)
+    subject = models.CharField("Objet", max_length=255)
+    body_text = models.TextField("Texte")
+    body_html = models.TextField("HTML", blank=True)
+
+    status = models.CharField(
+        "Statut",
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField("Tentatives", default=0)
+    next_attempt_at = models.DateTimeField("Prochain essai", default=timezone.now)
+    last_error = models.TextField("Dernière erreur", blank=True)
+    sent_at = models.DateTimeField("Envoyé le", null=True, blank=True)
+    # Jeton de la réservation en cours (claim_batch) : seul le relais qui la
+    # détient peut enregistrer le résultat
+    lease = models.UUIDField("Réservation", null=True, blank=True, editable=False)
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name = "Email sortant"
+        verbose_name_plural = "Emails sortants"
+        indexes = [
+            # Sélection du relais : status IN (pending, retry, sending) AND next_attempt_at <= now
+            models.Index(fields=["status", "next_attempt_at"], name="outbox_due_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} → {', '.join(self.to)}"
+
+
+class CampaignEngagement(models.Model):
+    """Cumul des ouvertures / clics d'une campagne, reporté depuis Redis (tracking.py)."""
+    campaign = models.OneToOneField(
+        NewsletterCampaign,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="engagement",
+        verbose_name="Campagne",
+    )
+    opens = models.PositiveIntegerField("Ouvertures", default=0)
+    unique_opens = models.PositiveIntegerField("Ouvreurs uniques", default=0)
+    clicks = models.PositiveIntegerField("Clics", default=0)
+    unique_clicks = models.PositiveIntegerField("Cliqueurs uniques", default=0)
+    updated_at = models.DateTimeField("Mis à jour le", auto_now=True)
+
+    class Meta:
+        verbose_name = "Statistiques de campagne"
+        verbose_name_plural = "Statistiques de campagnes"
+
+    def __str__(self):
+        return f"{self.campaign_id} : {self.unique_opens} ouvreurs, {self.unique_clicks} cliqueurs"
+
+
+class CampaignLinkClicks(models.Model):
+    campaign = models.ForeignKey(
+        NewsletterCampaign, on_delete=models.CASCADE, related_name="link_clicks", verbose_name="Campagne"
+    )
+    url = models.TextField("Lien")
+    # SHA-256 du lien : unicité par campagne quelle que soit sa longueur
+    url_hash = models.CharField("Empreinte du lien", max_length=64, editable=False)
+    clicks = models.PositiveIntegerField("Clics", default=0)
+
+    class Meta:
+        ordering = ["-clicks"]
+        verbose_name = "Clics par lien"
+        verbose_name_plural = "Clics par lien"
+        constraints = [
+            models.UniqueConstraint(fields=["campaign", "url_hash"], name="campaign_link_unique"),
+        ]
 
     def __str__(self):
-        return f"{self.get_position_display()} – {self.title or self.pair_key}"
\ No newline at end of file
+        return f"{self.url} ({self.clicks})"
@@ -0,0 +1,305 @@
+# website/newsletter.py
+"""
+Moteur d'envoi des campagnes newsletter.
+
+start_delivery découpe les abonnés actifs en tranches par pagination sur clé
+(id > after AND id <= upto, sans OFFSET) et lance une tâche Celery par tranche.
+Chaque tranche envoie la campagne compilée (campaigns.py) sur une seule
+connexion SMTP, sous un plafond global d'envois par minute partagé via Redis,
+et consigne chaque destinataire dans NewsletterDelivery. Relancer une campagne en cours (crash, redéploiement) ne
+renvoie rien aux abonnés déjà servis : ils sont exclus à la lecture.
+
+Chaque tranche est une ligne NewsletterChunk : terminée une seule fois, elle
+ne peut pas être comptée deux fois (tâche relivrée ou relancée), et la
+campagne n'est close que lorsque toutes ses tranches le sont. Un bail par
+tranche empêche deux tâches de l'envoyer en même temps ; une reprise n'est
+acceptée que si l'envoi ne progresse plus (is_delivery_active).
+"""
+import logging
+import smtplib
+import time
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import get_connection
+from django.db import transaction
+from django.db.models import Count, Exists, F, Max, Min, OuterRef, Q
+from django.utils import timezone
+
+from .campaigns import compile_campaign
+from .models import NewsletterCampaign, NewsletterChunk, NewsletterDelivery, NewsletterSubscriber
+
+logger = logging.getLogger(__name__)
+
+RATE_KEY = "rhp:newsletter:rate:{window}"
+# Écritures d'état groupées : un crash renvoie au plus ce nombre d'emails.
+FLUSH_EVERY = 50
+# Bail d'une tranche, renouvelé à chaque écriture d'état
+CHUNK_LEASE = timedelta(minutes=5)
+
+
+class RateLimited(Exception):
+    """Plafond par minute atteint ; ``retry_in`` secondes avant la prochaine fenêtre."""
+
+    def __init__(self, retry_in):
+        super().__init__(f"plafond d'envoi atteint, reprise dans {retry_in:.0f}s")
+        self.retry_in = retry_in
+
+
+class ChunkBusy(Exception):
+    """Tranche en cours d'envoi par une autre tâche ; ``retry_in`` secondes avant la fin de son bail."""
+
+    def __init__(self, retry_in):
+        super().__init__(f"tranche réservée par une autre tâche, nouvel essai dans {retry_in:.0f}s")
+        self.retry_in = retry_in
+
+
+def _acquire_send_slot():
+    limit = settings.WEBSITE_NEWSLETTER_RATE_PER_MINUTE
+    if not limit:
+        return
+    now = time.time()
+    key = RATE_KEY.format(window=int(now // 60))
+    cache.add(key, 0, 120)
+    if cache.incr(key) > limit:
+        raise RateLimited(60 - now % 60 + 1)
+
+
+def chunk_bounds(chunk_size):
+    """Bornes (after_id, upto_id] des tranches d'abonnés actifs, par clé."""
+    active = NewsletterSubscriber.objects.filter(is_active=True).order_by("pk")
+    bounds, after = [], 0
+    while True:
+        last = active.filter(pk__gt=after).values_list("pk", flat=True)[chunk_size - 1:chunk_size].first()
+        if last is None:
+            if active.filter(pk__gt=after).exists():
+                bounds.append((after, None))
+            return bounds
+        bounds.append((after, last))
+        after = last
+
+
+def claim_due_campaigns(limit=10):
+    """
+    Réserve les campagnes planifiées arrivées à échéance ; renvoie leurs ids.
+
+    Une seule requête sur l'index partiel newsletter_due_idx ; FOR UPDATE SKIP
+    LOCKED + passage immédiat à « sending » : deux beats ou workers concurrents
+    ne peuvent pas réserver la même campagne.
+
+    Une campagne réservée dont l'envoi n'a jamais démarré (aucune tranche
+    créée, WEBSITE_NEWSLETTER_RESUME_AFTER écoulé : tâche perdue ou broker
+    indisponible au moment de la planifier) est réservée de nouveau.
+    """
+    now = timezone.now()
+    stalled_before = now - timedelta(seconds=settings.WEBSITE_NEWSLETTER_RESUME_AFTER)
+    locked = NewsletterCampaign.objects.select_for_update(skip_locked=True)
+    with transaction.atomic():
+        ids = list(
+            locked.filter(status=NewsletterCampaign.STATUS_SCHEDULED, scheduled_at__lte=now)
+            .order_by("scheduled_at")
+            .values_list("pk", flat=True)[:limit]
+        )
+        ids += list(
+            locked.filter(status=NewsletterCampaign.STATUS_SENDING, delivery_started_at__lt=stalled_before)
+            .filter(~Exists(NewsletterChunk.objects.filter(campaign=OuterRef("pk"))))
+            .order_by("delivery_started_at")
+            .values_list("pk", flat=True)[:max(limit - len(ids), 0)]
+        )
+        if ids:
+            NewsletterCampaign.objects.filter(pk__in=ids).update(
+                status=NewsletterCampaign.STATUS_SENDING,
+                delivery_started_at=now,
+            )
+    return ids
+
+
+def is_delivery_active(campaign_id):
+    """
+    Vrai si une tranche de la campagne est en cours d'envoi ou a été planifiée
+    récemment (WEBSITE_NEWSLETTER_RESUME_AFTER) : une reprise doublerait les envois.
+    """
+    now = timezone.now()
+    recent = now - timedelta(seconds=settings.WEBSITE_NEWSLETTER_RESUME_AFTER)
+    return NewsletterChunk.objects.filter(
+        Q(leased_until__gt=now) | Q(dispatched_at__gte=recent),
+        campaign_id=campaign_id,
+        completed_at__isnull=True,
+    ).exists()
+
+
+def start_delivery(campaign_id):
+    """
+    Passe la campagne en cours d'envoi et renvoie les tranches à distribuer.
+
+    Premier envoi : découpe les abonnés actifs et crée les tranches. Reprise
+    (crash, redéploiement, campagne repassée en brouillon) : renvoie les
+    tranches non terminées, ou rien si l'envoi progresse encore.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        campaign = (
+            NewsletterCampaign.objects.select_for_update()
+            .filter(pk=campaign_id)
+            .exclude(status=NewsletterCampaign.STATUS_SENT)
+            .first()
+        )
+        if campaign is None:
+            return []
+        if campaign.chunks.exists():
+            if is_delivery_active(campaign_id):
+                logger.info("Campagne %s : envoi en cours, reprise ignorée", campaign_id)
+                return []
+            pending = campaign.chunks.filter(completed_at__isnull=True)
+            bounds = list(pending.order_by("after_id").values_list("after_id", "upto_id"))
+            pending.update(dispatched_at=now)
+            campaign.status = NewsletterCampaign.STATUS_SENDING
+            campaign.save(update_fields=["status"])
+        else:
+            bounds = chunk_bounds(settings.WEBSITE_NEWSLETTER_CHUNK_SIZE)
+            NewsletterChunk.objects.bulk_create([
+                NewsletterChunk(campaign=campaign, after_id=after_id, upto_id=upto_id, dispatched_at=now)
+                for after_id, upto_id in bounds
+            ])
+            campaign.status = NewsletterCampaign.STATUS_SENDING
+            campaign.delivery_started_at = campaign.delivery_started_at or now
+            campaign.recipients_total = NewsletterSubscriber.objects.filter(is_active=True).count()
+            campaign.chunks_total = len(bounds)
+            campaign.chunks_done = 0
+            campaign.save(update_fields=[
+                "status", "delivery_started_at", "recipients_total", "chunks_total", "chunks_done",
+            ])
+    if not bounds:
+        _close_if_complete(campaign_id)
+    return bounds
+
+
+def _pending_recipients(campaign, after_id, upto_id):
+    already_sent = NewsletterDelivery.objects.filter(
+        campaign=campaign,
+        subscriber=OuterRef("pk"),
+        status=NewsletterDelivery.STATUS_SENT,
+    )
+    qs = NewsletterSubscriber.objects.filter(is_active=True, pk__gt=after_id)
+    if upto_id is not None:
+        qs = qs.filter(pk__lte=upto_id)
+    return qs.filter(~Exists(already_sent)).order_by("pk").only("pk", "email", "full_name")
+
+
+def _flush(campaign, records):
+    if records:
+        NewsletterDelivery.objects.bulk_create(
+            records,
+            update_conflicts=True,
+            unique_fields=["campaign", "subscriber"],
+            update_fields=["status", "processed_at", "error"],
+        )
+        records.clear()
+
+
+def _lease_chunk(campaign_id, after_id, owner):
+    """Réserve la tranche pour ``owner`` ; faux si elle est terminée ou réservée par une autre tâche."""
+    now = timezone.now()
+    return NewsletterChunk.objects.filter(
+        Q(leased_until__isnull=True) | Q(leased_until__lte=now) | Q(lease_owner=owner),
+        campaign_id=campaign_id,
+        after_id=after_id,
+        completed_at__isnull=True,
+    ).update(leased_until=now + CHUNK_LEASE, lease_owner=owner)
+
+
+def deliver_chunk(campaign_id, after_id, upto_id, owner=None):
+    """
+    Envoie une tranche ; renvoie le nombre d'emails envoyés.
+
+    ``owner`` identifie la tâche (son id Celery, stable d'un nouvel essai à
+    l'autre) : elle reprend son propre bail. Lève ChunkBusy si une autre tâche
+    envoie la tranche, RateLimited quand le plafond par minute est atteint :
+    la tâche est alors replanifiée et reprend après le dernier destinataire
+    consigné. Un refus définitif (5xx) d'un message est consigné comme échec de
+    ce destinataire ; une erreur de connexion ou un refus temporaire remonte
+    (nouvel essai de la tâche).
+    """
+    campaign = NewsletterCampaign.objects.filter(
+        pk=campaign_id, status=NewsletterCampaign.STATUS_SENDING
+    ).first()
+    if campaign is None:
+        return 0
+    owner = owner or uuid.uuid4().hex
+    if not _lease_chunk(campaign_id, after_id, owner):
+        chunk = NewsletterChunk.objects.filter(
+            campaign_id=campaign_id, after_id=after_id, completed_at__isnull=True
+        ).first()
+        if chunk is None:
+            return 0  # tranche déjà terminée
+        raise ChunkBusy(max((chunk.leased_until - timezone.now()).total_seconds(), 0) + 1)
+
+    compiled = compile_campaign(campaign)
+    records, sent = [], 0
+    connection = get_connection()
+    try:
+        with connection:
+            for subscriber in _pending_recipients(campaign, after_id, upto_id).iterator():
+                _acquire_send_slot()
+                try:
+                    connection.send_messages([compiled.render(subscriber, connection)])
+                except (smtplib.SMTPRecipientsRefused, ValueError, UnicodeError) as exc:
+                    # Adresse refusée (serveur ou construction) : échec propre à ce
+                    # destinataire, la connexion reste utilisable.
+                    status, error = NewsletterDelivery.STATUS_FAILED, str(exc)[:255]
+                except smtplib.SMTPResponseException as exc:
+                    if not 500 <= exc.smtp_code < 600:
+                        raise  # refus temporaire : nouvel essai de la tâche
+                    # Refus définitif de ce message (DATA, MAIL FROM) : smtplib a
+                    # réinitialisé la transaction, la connexion reste utilisable.
+                    status, error = NewsletterDelivery.STATUS_FAILED, str(exc)[:255]
+                else:
+                    status, error = NewsletterDelivery.STATUS_SENT, ""
+                    sent += 1
+                records.append(NewsletterDelivery(
+                    campaign=campaign, subscriber=subscriber, status=status,
+                    processed_at=timezone.now(), error=error,
+                ))
+                if len(records) >= FLUSH_EVERY:
+                    _flush(campaign, records)
+                    _lease_chunk(campaign_id, after_id, owner)
+    finally:
+        _flush(campaign, records)
+
+    complete_chunk(campaign_id, after_id)
+    return sent
+
+
+def complete_chunk(campaign_id, after_id):
+    """Marque une tranche terminée (une seule fois) ; clôt la campagne avec la dernière."""
+    completed = NewsletterChunk.objects.filter(
+        campaign_id=campaign_id, after_id=after_id, completed_at__isnull=True
+    ).update(completed_at=timezone.now(), leased_until=None)
+    if completed:
+        NewsletterCampaign.objects.filter(pk=campaign_id).update(chunks_done=F("chunks_done") + 1)
+    _close_if_complete(campaign_id)
+
+
+def _close_if_complete(campaign_id):
+    pending = NewsletterChunk.objects.filter(campaign=OuterRef("pk"), completed_at__isnull=True)
+    finished = NewsletterCampaign.objects.filter(
+        ~Exists(pending), pk=campaign_id, status=NewsletterCampaign.STATUS_SENDING
+    ).update(status=NewsletterCampaign.STATUS_SENT, sent_at=timezone.now())
+    if finished:
+        logger.info("Campagne %s envoyée", campaign_id)
+
+
+def delivery_stats(campaign):
+    """Compteurs d'envoi et débit moyen (messages/s) d'une campagne."""
+    stats = campaign.deliveries.aggregate(
+        sent=Count("pk", filter=Q(status=NewsletterDelivery.STATUS_SENT)),
+        failed=Count("pk", filter=Q(status=NewsletterDelivery.STATUS_FAILED)),
+        first=Min("processed_at"),
+        last=Max("processed_at"),
+    )
+    started = campaign.delivery_started_at or stats["first"]
+    elapsed = (stats["last"] - started).total_seconds() if started and stats["last"] else 0
+    stats["rate"] = stats["sent"] / elapsed if elapsed > 0 else None
+    return stats
@@ -0,0 +1,31 @@
+# website/offers.py
+"""
+Expiration des offres d'emploi dont la date limite est passée.
+
+Un seul UPDATE ensembliste, appuyé sur l'index partiel joboffer_closing_idx
+(closing_date des offres publiées) : le balayage ne lit que les offres à
+dépublier, quel que soit l'historique. QuerySet.update() n'émet pas post_save,
+l'invalidation des pages (liste et détail) est donc faite ici.
+"""
+import logging
+
+from django.db import transaction
+from django.utils import timezone
+
+from .cache import JOBS_SCOPE, bump_content_version
+from .models import JobOffer
+
+logger = logging.getLogger(__name__)
+
+
+def expire_job_offers(now=None):
+    """Dépublie les offres dont la date limite est passée ; renvoie leur nombre."""
+    now = now or timezone.now()
+    expired = JobOffer.objects.filter(is_published=True, closing_date__lte=now).update(
+        is_published=False, updated_at=now
+    )
+    if expired:
+        # updated_at avancé : Last-Modified des pages change aussi
+        transaction.on_commit(lambda: bump_content_version(JOBS_SCOPE))
+        logger.info("%s offre(s) expirée(s) dépubliée(s)", expired)
+    return expired
@@ -0,0 +1,202 @@
+# website/outbox.py
+"""
+Boîte d'envoi transactionnelle.
+
+Les vues et signaux n'envoient jamais d'email eux-mêmes : ils écrivent des
+lignes OutboxEmail dans la transaction de la donnée métier (pas d'email pour
+une demande annulée, pas de demande sans email). La tâche relay_outbox les
+envoie par lots sur une seule connexion SMTP, avec reprise exponentielle puis
+abandon (statut « dead ») après WEBSITE_OUTBOX_MAX_ATTEMPTS échecs.
+
+Un lot est réservé dans une transaction courte (statut « sending » et bail
+dans next_attempt_at, jeton ``lease``), envoyé hors transaction, puis chaque
+résultat est enregistré aussitôt : aucun verrou n'est tenu pendant les
+échanges SMTP. Un relais interrompu laisse ses lignes « sending » : elles sont
+reprises à l'expiration du bail (livraison au moins une fois), sous un nouveau
+jeton ; un relais attardé dont le bail a expiré n'écrase donc pas le résultat
+de celui qui l'a repris.
+
+En local : EMAIL_BACKEND=django.core.mail.backends.filebased.EmailBackend
+(ou locmem, ou un SMTP de test sur EMAIL_PORT) et
+``python manage.py relay_outbox``.
+"""
+import logging
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+logger = logging.getLogger(__name__)
+
+BACKOFF_BASE = timedelta(minutes=1)
+BACKOFF_MAX = timedelta(hours=6)
+# Durée de réservation d'un lot ; au-delà, le relais est tenu pour interrompu
+SEND_LEASE = timedelta(minutes=15)
+RESULT_FIELDS = ["status", "attempts", "next_attempt_at", "last_error", "sent_at", "lease", "updated_at"]
+
+
+def build_email(to, subject, template_name, context, category="", reply_to=()):
+    """OutboxEmail non enregistré ; corps texte rendu depuis ``template_name``."""
+    return OutboxEmail(
+        category=category,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=list(to),
+        reply_to=list(reply_to),
+        subject=subject,
+        body_text=render_to_string(template_name, context),
+    )
+
+
+def queue_emails(emails):
+    """Écrit les emails dans la boîte d'envoi (transaction de l'appelant)."""
+    return OutboxEmail.objects.bulk_create(emails)
+
+
+def queue_contact_notifications(contact_requests):
+    recipients = settings.WEBSITE_CONTACT_NOTIFY_EMAILS
+    if not recipients:
+        return []
+    return queue_emails([
+        build_email(
+            recipients,
+            f"Nouvelle demande de contact – {contact.full_name}",
+            "website/emails/contact_notification.txt",
+            {"contact": contact},
+            category="contact",
+            reply_to=[contact.email],
+        )
+        for contact in contact_requests
+    ])
+
+
+def queue_application_receipt(application):
+    return queue_emails([
+        build_email(
+            [application.email],
+            f"Votre candidature – {application.job_offer.title}",
+            "website/emails/application_receipt.txt",
+            {"application": application, "offer": application.job_offer},
+            category="application",
+        )
+    ])
+
+
+def _backoff(attempts):
+    return min(BACKOFF_BASE * 2 ** (attempts - 1), BACKOFF_MAX)
+
+
+def _to_message(email, connection):
+    message = EmailMultiAlternatives(
+        subject=email.subject,
+        body=email.body_text,
+        from_email=email.from_email or None,
+        to=email.to,
+        reply_to=email.reply_to or None,
+        connection=connection,
+    )
+    if email.body_html:
+        message.attach_alternative(email.body_html, "text/html")
+    return message
+
+
+def _record_failure(email, error, now):
+    email.attempts += 1
+    email.last_error = f"{type(error).__name__}: {error}"[:2000]
+    if email.attempts >= settings.WEBSITE_OUTBOX_MAX_ATTEMPTS:
+        email.status = OutboxEmail.STATUS_DEAD
+        logger.error("Email %s abandonné après %s tentatives : %s", email.pk, email.attempts, email.last_error)
+    else:
+        email.status = OutboxEmail.STATUS_RETRY
+        email.next_attempt_at = now + _backoff(email.attempts)
+
+
+def _mark_sent(email):
+    email.status = OutboxEmail.STATUS_SENT
+    email.attempts += 1
+    email.sent_at = timezone.now()
+    email.last_error = ""
+
+
+def _save_result(email):
+    """
+    Enregistre le résultat d'un envoi, si la réservation n'a pas été reprise
+    entre-temps ; renvoie vrai s'il a été enregistré.
+    """
+    lease, email.lease = email.lease, None
+    email.updated_at = timezone.now()
+    return bool(
+        OutboxEmail.objects.filter(pk=email.pk, status=OutboxEmail.STATUS_SENDING, lease=lease).update(
+            **{field: getattr(email, field) for field in RESULT_FIELDS}
+        )
+    )
+
+
+def _send_batch(batch, now):
+    connection = get_connection()
+    opened = False
+    for index, email in enumerate(batch):
+        if not opened:
+            try:
+                connection.open()
+                opened = True
+            except Exception as exc:
+                # Serveur injoignable : le reste du lot est reporté.
+                for pending in batch[index:]:
+                    _record_failure(pending, exc, now)
+                    _save_result(pending)
+                break
+        try:
+            if not connection.send_messages([_to_message(email, connection)]):
+                raise ValueError("aucun destinataire")
+        except Exception as exc:
+            _record_failure(email, exc, now)
+            # La connexion peut être morte : elle sera rouverte pour la suite.
+            connection.close()
+            opened = False
+        else:
+            _mark_sent(email)
+        _save_result(email)
+    connection.close()
+
+
+def claim_batch(batch_size=None):
+    """
+    Réserve un lot d'emails dus (statut « sending », bail SEND_LEASE).
+
+    Transaction courte avec SKIP LOCKED : deux relais concurrents se partagent
+    la file sans doublon. Les réservations expirées sont reprises sous un
+    nouveau jeton.
+    """
+    now = timezone.now()
+    lease = uuid.uuid4()
+    with transaction.atomic():
+        batch = list(
+            OutboxEmail.objects.select_for_update(skip_locked=True)
+            .filter(
+                status__in=[OutboxEmail.STATUS_PENDING, OutboxEmail.STATUS_RETRY, OutboxEmail.STATUS_SENDING],
+                next_attempt_at__lte=now,
+            )
+            .order_by("next_attempt_at")[: batch_size or settings.WEBSITE_OUTBOX_BATCH_SIZE]
+        )
+        if batch:
+            OutboxEmail.objects.filter(pk__in=[email.pk for email in batch]).update(
+                status=OutboxEmail.STATUS_SENDING, next_attempt_at=now + SEND_LEASE, lease=lease, updated_at=now
+            )
+    for email in batch:
+        email.status = OutboxEmail.STATUS_SENDING
+        email.lease = lease
+    return batch
+
+
+def relay_batch(batch_size=None):
+    """Réserve puis envoie un lot d'emails dus ; renvoie le nombre de lignes traitées."""
+    batch = claim_batch(batch_size)
+    if batch:
+        _send_batch(batch, timezone.now())
+    return len(batch)
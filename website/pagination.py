@@ -0,0 +1,46 @@
+# website/pagination.py
+"""
+Pagination par clé (keyset) : « les N suivants après (published_at, id) ».
+
+Contrairement à OFFSET, le coût d'une page ne dépend pas de sa profondeur et
+une offre publiée entre deux pages ne décale pas la suite. Le curseur est
+opaque pour le visiteur (base64 de « horodatage|id »).
+"""
+import base64
+from datetime import datetime
+
+from django.db.models import Q
+
+
+def encode_cursor(published_at, pk):
+    raw = f"{published_at.isoformat()}|{pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """(published_at, id) ou None si le curseur est absent ou invalide."""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        published_at, pk = raw.rsplit("|", 1)
+        return datetime.fromisoformat(published_at), int(pk)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def keyset_page(queryset, cursor, page_size):
+    """
+    Page suivant ``cursor`` sur un queryset trié par (-published_at, -id).
+
+    Renvoie (objets, curseur_suivant) ; curseur_suivant vaut None en fin de liste.
+    """
+    position = decode_cursor(cursor)
+    if position is not None:
+        published_at, pk = position
+        queryset = queryset.filter(Q(published_at__lt=published_at) | Q(published_at=published_at, pk__lt=pk))
+    rows = list(queryset.order_by("-published_at", "-pk")[: page_size + 1])
+    if len(rows) <= page_size:
+        return rows, None
+    rows = rows[:page_size]
+    return rows, encode_cursor(rows[-1].published_at, rows[-1].pk)
@@ -0,0 +1,185 @@
+# website/search.py
+"""
+Recherche plein texte des offres d'emploi et des candidatures.
+
+- PostgreSQL : colonne ``search_vector`` (configuration « french », poids
+  A/B/C par champ) tenue à jour par un trigger et indexée en GIN ;
+  classement ts_rank, extraits ts_headline.
+- SQLite (branche par défaut de settings/base.py) : table FTS5 <table>_fts à
+  contenu externe, tenue à jour par triggers ; classement bm25, extraits
+  snippet().
+
+Les deux branches renvoient le même queryset annoté ``rank`` (plus grand =
+plus pertinent) et ``headline`` (extrait balisé, voir render_headline).
+Voir les migrations 0012_joboffer_search et 0018_jobapplication_search.
+"""
+import re
+
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import F
+from django.db.models.expressions import RawSQL
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from .models import JobApplication, JobOffer
+
+SEARCH_CONFIG = "french"
+# Délimiteurs neutres : l'extrait est échappé avant d'y poser les <mark>.
+MARK_START, MARK_STOP = "\x02", "\x03"
+MAX_QUERY_TERMS = 8
+
+
+class FullTextIndex:
+    """
+    Index plein texte d'un modèle.
+
+    ``columns`` : colonnes indexées, dans l'ordre de la table FTS5 ;
+    ``bm25_weights`` : poids SQLite correspondants ; ``headline_field`` :
+    colonne dont est tiré l'extrait ; ``ordering`` : départage à pertinence
+    égale.
+    """
+
+    def __init__(self, model, columns, bm25_weights, headline_field, ordering):
+        self.model = model
+        self.columns = columns
+        self.bm25_weights = bm25_weights
+        self.headline_field = headline_field
+        self.ordering = ordering
+
+    @property
+    def table(self):
+        return self.model._meta.db_table
+
+    @property
+    def fts_table(self):
+        return f"{self.table}_fts"
+
+    def sqlite_triggers(self):
+        """Triggers de la table FTS5 (contenu externe), par nom."""
+        columns = ", ".join(self.columns)
+        new_values = ", ".join(f"new.{column}" for column in self.columns)
+        old_values = ", ".join(f"old.{column}" for column in self.columns)
+        insert = f"INSERT INTO {self.fts_table}(rowid, {columns}) VALUES (new.id, {new_values});"
+        delete = (
+            f"INSERT INTO {self.fts_table}({self.fts_table}, rowid, {columns}) "
+            f"VALUES ('delete', old.id, {old_values});"
+        )
+        return {
+            f"{self.fts_table}_ai": f"CREATE TRIGGER {self.fts_table}_ai AFTER INSERT ON {self.table} BEGIN {insert} END",
+            f"{self.fts_table}_ad": f"CREATE TRIGGER {self.fts_table}_ad AFTER DELETE ON {self.table} BEGIN {delete} END",
+            f"{self.fts_table}_au": (
+                f"CREATE TRIGGER {self.fts_table}_au AFTER UPDATE OF {columns} ON {self.table} "
+                f"BEGIN {delete} {insert} END"
+            ),
+        }
+
+    def ensure_sqlite_triggers(self, cursor):
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE (type = 'table' AND name = %s) OR type = 'trigger'",
+            [self.fts_table],
+        )
+        existing = {row[0] for row in cursor.fetchall()}
+        if self.fts_table not in existing:
+            return  # migration pas encore appliquée
+        triggers = self.sqlite_triggers()
+        missing = [name for name in triggers if name not in existing]
+        for name in missing:
+            cursor.execute(triggers[name])
+        if missing:
+            cursor.execute(f"INSERT INTO {self.fts_table}({self.fts_table}) VALUES ('rebuild')")
+
+    def _postgresql_search(self, queryset, terms):
+        search_query = SearchQuery(" ".join(terms), config=SEARCH_CONFIG, search_type="websearch")
+        rank = SearchRank(F("search_vector"), search_query)
+        headline = SearchHeadline(
+            self.headline_field,
+            search_query,
+            config=SEARCH_CONFIG,
+            start_sel=MARK_START,
+            stop_sel=MARK_STOP,
+            max_words=35,
+            min_words=15,
+        )
+        return queryset.filter(search_vector=search_query), rank, headline
+
+    def _sqlite_search(self, queryset, terms):
+        # Chaque mot devient un terme FTS5 entre guillemets avec préfixe : la
+        # saisie ne peut pas injecter la syntaxe MATCH.
+        match = " ".join('"{}"*'.format(term.replace('"', "")) for term in terms)
+        fts = self.fts_table
+        row = f"FROM {fts} WHERE {fts} MATCH %s AND rowid = {self.table}.id"
+        weights = ", ".join(str(weight) for weight in self.bm25_weights)
+        column = self.columns.index(self.headline_field)
+        rank = RawSQL(f"SELECT -bm25({fts}, {weights}) {row}", [match])
+        headline = RawSQL(f"SELECT snippet({fts}, {column}, %s, %s, '…', 24) {row}", [MARK_START, MARK_STOP, match])
+        matches = RawSQL(f"SELECT rowid FROM {fts} WHERE {fts} MATCH %s", [match])
+        return queryset.filter(pk__in=matches), rank, headline
+
+    def search(self, query, queryset=None, highlight=True):
+        """
+        Objets correspondant à ``query``, triés par pertinence décroissante.
+
+        Annotés ``rank`` et, si ``highlight``, ``headline``. Renvoie un
+        queryset vide si la saisie ne contient aucun mot.
+        """
+        if queryset is None:
+            queryset = self.model.objects.all()
+        terms = _terms(query)
+        if not terms:
+            return queryset.none()
+        backend = self._postgresql_search if connection.vendor == "postgresql" else self._sqlite_search
+        results, rank, headline = backend(queryset, terms)
+        results = results.annotate(rank=rank)
+        if highlight:
+            results = results.annotate(headline=headline)
+        return results.order_by("-rank", *self.ordering)
+
+
+JOB_OFFERS = FullTextIndex(
+    JobOffer,
+    columns=("title", "short_description", "description"),
+    bm25_weights=(10.0, 4.0, 1.0),
+    headline_field="short_description",
+    ordering=("-published_at", "-id"),
+)
+# Texte des CV et lettres : extrait en tâche de fond (website/extraction.py)
+APPLICATIONS = FullTextIndex(
+    JobApplication,
+    columns=("last_name", "first_name", "email", "phone", "notes", "document_text"),
+    bm25_weights=(10.0, 10.0, 5.0, 5.0, 2.0, 1.0),
+    headline_field="document_text",
+    ordering=("-created_at", "-id"),
+)
+INDEXES = (JOB_OFFERS, APPLICATIONS)
+
+
+def ensure_sqlite_fts_triggers(using_connection):
+    """
+    Crée les triggers FTS5 manquants et réindexe si besoin (SQLite seulement).
+
+    Appelée après chaque migrate : l'éditeur de schéma SQLite reconstruit les
+    tables modifiées et supprime leurs triggers au passage.
+    """
+    if using_connection.vendor != "sqlite":
+        return
+    with using_connection.cursor() as cursor:
+        for index in INDEXES:
+            index.ensure_sqlite_triggers(cursor)
+
+
+def _terms(query):
+    return re.findall(r"\w+", query or "")[:MAX_QUERY_TERMS]
+
+
+def search_job_offers(query, queryset=None, highlight=True):
+    """Offres correspondant à ``query`` (titre, résumé, description), par pertinence."""
+    return JOB_OFFERS.search(query, queryset, highlight)
+
+
+def render_headline(headline):
+    """Extrait HTML sûr : texte échappé, termes trouvés entre <mark>."""
+    if not headline:
+        return ""
+    html = escape(headline).replace(MARK_START, "<mark>").replace(MARK_STOP, "</mark>")
+    return mark_safe(html)
@@ -0,0 +1,111 @@
+# website/signals.py
+import logging
+
+from django.db import transaction
+from django.db.models.signals import post_migrate, post_save, post_delete
+from django.dispatch import Signal
+
+from .cache import HOME_SCOPE, SCOPE_MODELS, bump_content_version
+from .models import HeroSlide, JobApplication
+
+logger = logging.getLogger(__name__)
+
+# Envoyé par ingest.py, dans la transaction d'insertion, avec les demandes de
+# contact réellement créées (kwarg ``requests``) : point d'accroche des suites
+# (notification, CRM), hors du chemin de la requête HTTP.
+contact_requests_received = Signal()
+
+# Modèle -> scope de cache dont il invalide le contenu (et les pages).
+CONTENT_SCOPES = {model: scope for scope, models in SCOPE_MODELS.items() for model in models}
+
+
+def _enqueue(task_name, *args):
+    from . import tasks
+
+    try:
+        getattr(tasks, task_name).delay(*args)
+    except Exception:
+        # Broker indisponible : on ne fait pas échouer l'enregistrement
+        # (le snapshot est reconstruit au premier hit, les images via la
+        # commande backfill_hero_derivatives).
+        logger.exception("Impossible de planifier la tâche %s", task_name)
+
+
+def invalidate_content(sender, **kwargs):
+    scope = CONTENT_SCOPES[sender]
+
+    def _invalidate():
+        bump_content_version(scope)
+        if scope == HOME_SCOPE:
+            _enqueue("rebuild_home_snapshot")
+
+    # Après commit : une requête concurrente ne peut pas remettre en cache
+    # l'ancien contenu sous la nouvelle version.
+    transaction.on_commit(_invalidate)
+
+
+for _model in CONTENT_SCOPES:
+    post_save.connect(invalidate_content, sender=_model, dispatch_uid=f"content-save-{_model.__name__}")
+    post_delete.connect(invalidate_content, sender=_model, dispatch_uid=f"content-delete-{_model.__name__}")
+
+
+def generate_slide_derivatives(sender, instance, **kwargs):
+    if instance.image_derivatives_stale:
+        transaction.on_commit(lambda: _enqueue("generate_hero_slide_derivatives", instance.pk))
+
+
+post_save.connect(generate_slide_derivatives, sender=HeroSlide, dispatch_uid="hero-slide-derivatives")
+
+
+def delete_slide_derivatives(sender, instance, **kwargs):
+    from .images import delete_derivatives
+
+    derivatives = instance.image_derivatives
+    if derivatives:
+        transaction.on_commit(lambda: delete_derivatives(derivatives))
+
+
+post_delete.connect(delete_slide_derivatives, sender=HeroSlide, dispatch_uid="hero-slide-derivatives-delete")
+
+
+def notify_contact_requests(sender, requests, **kwargs):
+    from .outbox import queue_contact_notifications
+
+    queue_contact_notifications(requests)
+
+
+contact_requests_received.connect(notify_contact_requests, dispatch_uid="contact-requests-notify")
+
+
+def release_application_documents(sender, instance, **kwargs):
+    from .documents import release_documents
+
+    release_documents(instance)
+    transaction.on_commit(lambda: _enqueue("collect_orphan_documents"))
+
+
+post_delete.connect(release_application_documents, sender=JobApplication, dispatch_uid="application-documents-release")
+
+
+def extract_application_documents(sender, instance, created, **kwargs):
+    if not created:
+        return
+    for sha256 in {instance.cv_id, instance.cover_letter_id} - {None}:
+        transaction.on_commit(lambda sha256=sha256: _enqueue("extract_document_text", sha256))
+
+
+post_save.connect(extract_application_documents, sender=JobApplication, dispatch_uid="application-documents-extract")
+
+
+def install_search_triggers(sender, using, **kwargs):
+    if sender.name != "website":
+        return
+
+    from django.db import connections
+
+    from .search import ensure_sqlite_fts_triggers
+
+    ensure_sqlite_fts_triggers(connections[using])
+
+
+post_migrate.connect(install_search_triggers, dispatch_uid="website-search-triggers")
@@ -0,0 +1,134 @@
+# website/snapshot.py
+"""
+« Home snapshot » : contenu de la page d'accueil déjà sérialisé (dicts et
+listes simples), reconstruit par une tâche Celery à chaque modification et
+stocké dans Redis sous la version de contenu courante. HomePageView ne lit
+qu'une seule clé ; si la tâche n'est pas encore passée, la vue reconstruit
+elle-même le snapshot (jamais de contenu périmé).
+"""
+import logging
+
+from django.core.cache import cache
+
+from .cache import HOME_SCOPE, get_content_version, content_cache_timeout
+from .models import Service, PricingPlan, Testimonial, FAQ, HeroSlide
+
+logger = logging.getLogger(__name__)
+
+HOME_SNAPSHOT_KEY = "website:home-snapshot:v{version}"
+
+SLIDE_FIELDS = (
+    "pair_key", "position", "order", "theme_variant",
+    "badge_label", "badge_icon", "title", "highlighted_text", "subtitle",
+    "primary_label", "primary_url", "primary_icon",
+    "secondary_label", "secondary_url", "secondary_icon",
+    "visual_title", "visual_subtitle", "visual_badge", "image_derivatives",
+)
+
+
+def _serialize_service(service):
+    return {
+        "title": service.title,
+        "slug": service.slug,
+        "icon_class": service.icon_class,
+        "short_description": service.short_description,
+        "description": service.description,
+    }
+
+
+def _serialize_plan(plan):
+    return {
+        "name": plan.name,
+        "slug": plan.slug,
+        "tagline": plan.tagline,
+        "price_label": plan.price_label,
+        "price_amount": str(plan.price_amount) if plan.price_amount is not None else None,
+        "target_segment": plan.target_segment,
+        "features_list": plan.features_list,
+        "is_featured": plan.is_featured,
+    }
+
+
+def _serialize_testimonial(testimonial):
+    return {
+        "full_name": testimonial.full_name,
+        "initials": testimonial.initials,
+        "role": testimonial.role,
+        "company": testimonial.company,
+        "quote": testimonial.quote,
+        "rating": testimonial.rating,
+    }
+
+
+def _serialize_faq(faq):
+    return {"question": faq.question, "answer": faq.answer}
+
+
+def _serialize_slide(slide):
+    data = {name: getattr(slide, name) for name in SLIDE_FIELDS}
+    data["image_url"] = slide.image.url if slide.image else ""
+    data["stats"] = [
+        {"value": value, "label": label}
+        for value, label in (
+            (slide.stat_1_value, slide.stat_1_label),
+            (slide.stat_2_value, slide.stat_2_label),
+            (slide.stat_3_value, slide.stat_3_label),
+        )
+        if value
+    ]
+    return data
+
+
+def compile_hero_slider(slides):
+    """
+    Paires (texte, visuel) dans l'ordre du slider, calculées une fois par
+    version de contenu. `slides` doit suivre l'ordre de l'index
+    (order, pair_key, position) : une paire prend la place de sa première
+    slide. Les paires incomplètes et les doublons sont écartés et journalisés.
+    """
+    pairs = {}
+    for slide in slides:
+        pair = pairs.setdefault(slide.pair_key, {"pair_key": slide.pair_key, "text": None, "visual": None})
+        if pair[slide.position] is not None:
+            logger.warning("Slide en double ignorée : %s / %s (id %s)", slide.pair_key, slide.position, slide.pk)
+            continue
+        pair[slide.position] = _serialize_slide(slide)
+
+    compiled = []
+    for pair in pairs.values():
+        if pair["text"] is None or pair["visual"] is None:
+            logger.warning("Paire de slides incomplète ignorée : %s", pair["pair_key"])
+            continue
+        compiled.append(pair)
+    return compiled
+
+
+def build_home_snapshot():
+    """Seul endroit qui interroge la base pour la page d'accueil."""
+    plans = [_serialize_plan(plan) for plan in PricingPlan.objects.filter(is_active=True)]
+    return {
+        "services": [_serialize_service(s) for s in Service.objects.filter(is_active=True)],
+        "pricing_plans": plans,
+        "featured_plan": next((plan for plan in plans if plan["is_featured"]), None),
+        "testimonials": [_serialize_testimonial(t) for t in Testimonial.objects.filter(is_active=True)[:4]],
+        "faqs": [_serialize_faq(f) for f in FAQ.objects.filter(is_active=True)],
+        "hero_slides": compile_hero_slider(
+            HeroSlide.objects.filter(is_active=True).order_by("order", "pair_key", "position")
+        ),
+    }
+
+
+def rebuild_home_snapshot():
+    version = get_content_version(HOME_SCOPE)
+    snapshot = build_home_snapshot()
+    cache.set(HOME_SNAPSHOT_KEY.format(version=version), snapshot, content_cache_timeout())
+    return version
+
+
+def get_home_snapshot():
+    key = HOME_SNAPSHOT_KEY.format(version=get_content_version(HOME_SCOPE))
+    snapshot = cache.get(key)
+    if snapshot is None:
+        snapshot = build_home_snapshot()
+        cache.set(key, snapshot, content_cache_timeout())
+    return snapshot
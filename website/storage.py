@@ -0,0 +1,84 @@
+# website/storage.py
+"""
+Stockage adressé par contenu des documents de candidature.
+
+Un document est rangé sous MEDIA_ROOT/documents/ab/cd/<sha256> : deux niveaux
+de répertoires (256 x 256) gardent chaque dossier petit quel que soit le
+volume, et un même CV envoyé pour plusieurs offres n'est écrit qu'une fois.
+Le nom d'origine, choisi par le candidat, n'intervient jamais dans le chemin.
+Le comptage des références est tenu par DocumentBlob (website/documents.py).
+"""
+import hashlib
+import os
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+from django.utils.functional import cached_property
+
+DOCUMENTS_DIRNAME = "documents"
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def blob_name(sha256):
+    return f"{sha256[:2]}/{sha256[2:4]}/{sha256}"
+
+
+def file_sha256(content):
+    """SHA-256 d'un fichier Django ; réutilise celui calculé à la réception s'il existe."""
+    digest = getattr(content, "sha256", None)
+    if digest:
+        return digest
+    hasher = hashlib.sha256()
+    if hasattr(content, "seek"):
+        content.seek(0)
+    for chunk in content.chunks(HASH_CHUNK_SIZE):
+        hasher.update(chunk)
+    if hasattr(content, "seek"):
+        content.seek(0)
+    return hasher.hexdigest()
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    FileSystemStorage dont un nom existant désigne déjà le bon contenu.
+
+    Un fichier reçu sur le volume média (``temporary_file_path``) est lié
+    (lien physique) et non déplacé : il reste en place tant que la
+    transaction qui le rattache n'est pas validée (voir documents.store_blob).
+    """
+
+    @cached_property
+    def base_location(self):
+        return self._value_or_setting(self._location, os.path.join(settings.MEDIA_ROOT, DOCUMENTS_DIRNAME))
+
+    @cached_property
+    def base_url(self):
+        if self._base_url is not None and not self._base_url.endswith("/"):
+            self._base_url += "/"
+        return self._value_or_setting(self._base_url, f"{settings.MEDIA_URL}{DOCUMENTS_DIRNAME}/")
+
+    def get_available_name(self, name, max_length=None):
+        return name
+
+    def _save(self, name, content):
+        if self.exists(name):
+            return name  # contenu déjà stocké
+        if not hasattr(content, "temporary_file_path"):
+            return super()._save(name, content)
+        full_path = self.path(name)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        try:
+            os.link(content.temporary_file_path(), full_path)
+        except FileExistsError:
+            pass  # écrit entre-temps par une requête concurrente
+        except OSError:
+            # Autre volume : copie, le fichier reçu reste en place
+            with open(content.temporary_file_path(), "rb") as source:
+                return super()._save(name, File(source))
+        return name
+
+
+document_storage = ContentAddressedStorage()
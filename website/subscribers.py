@@ -0,0 +1,185 @@
+# website/subscribers.py
+"""
+Import / export en masse des abonnés newsletter.
+
+L'import lit le CSV ligne à ligne (mémoire constante) :
+- PostgreSQL : COPY dans une table temporaire alimentée par un flux, puis une
+  seule fusion ensembliste INSERT ... ON CONFLICT qui compte insertions et
+  réactivations ;
+- autres bases (SQLite en dev) : lots bulk_create(ignore_conflicts=True).
+
+L'export est un générateur pour StreamingHttpResponse.
+"""
+import csv
+import itertools
+
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import connection, transaction
+
+from .exports import csv_cell
+from .models import NewsletterSubscriber
+
+EMAIL_COLUMNS = ("email", "e-mail", "mail", "courriel")
+NAME_COLUMNS = ("full_name", "nom", "nom complet", "name")
+EMAIL_MAX_LENGTH = NewsletterSubscriber._meta.get_field("email").max_length
+NAME_MAX_LENGTH = NewsletterSubscriber._meta.get_field("full_name").max_length
+
+
+def _column(header, candidates):
+    for index, title in enumerate(header):
+        if title.strip().lower() in candidates:
+            return index
+    return None
+
+
+def iter_subscriber_rows(lines, stats):
+    """
+    (email, nom) normalisés et valides d'un CSV ; compte les lignes invalides.
+
+    Sans en-tête reconnu, la première colonne est l'email et la seconde le nom.
+    """
+    reader = csv.reader(lines)
+    first = next(reader, None)
+    if first is None:
+        return
+    email_col, name_col = _column(first, EMAIL_COLUMNS), _column(first, NAME_COLUMNS)
+    if email_col is None:
+        email_col, name_col = 0, 1
+        reader = itertools.chain([first], reader)
+
+    for row in reader:
+        if not row or not any(cell.strip() for cell in row):
+            continue
+        try:
+            email = NewsletterSubscriber.normalize_email(row[email_col])
+            if len(email) > EMAIL_MAX_LENGTH:
+                raise ValidationError("email trop long")
+            validate_email(email)
+        except (IndexError, ValidationError):
+            stats["invalid"] += 1
+            continue
+        full_name = row[name_col].strip()[:NAME_MAX_LENGTH] if name_col is not None and name_col < len(row) else ""
+        stats["read"] += 1
+        yield email, full_name
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+class _CsvStream:
+    """Objet fichier en lecture seule produisant du CSV à la demande (pour COPY)."""
+
+    def __init__(self, rows):
+        self._lines = self._encode(rows)
+        self._buffer = b""
+
+    @staticmethod
+    def _encode(rows):
+        writer = csv.writer(_Echo(), lineterminator="\n")
+        for row in rows:
+            yield writer.writerow(row).encode()
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._lines, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        if size < 0:
+            data, self._buffer = self._buffer, b""
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+MERGE_SQL = """
+WITH src AS (
+    SELECT DISTINCT ON (email) email, full_name
+    FROM subscriber_import
+    ORDER BY email
+), merged AS (
+    INSERT INTO {table} (email, full_name, is_active, created_at)
+    SELECT email, full_name, true, now() FROM src
+    ON CONFLICT (email) DO UPDATE SET is_active = true
+    WHERE {table}.is_active = false
+    RETURNING (xmax = 0) AS inserted
+)
+SELECT
+    count(*) FILTER (WHERE inserted),
+    count(*) FILTER (WHERE NOT inserted),
+    (SELECT count(*) FROM src)
+FROM merged
+"""
+
+
+def _import_postgresql(rows, stats):
+    table = connection.ops.quote_name(NewsletterSubscriber._meta.db_table)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            "CREATE TEMPORARY TABLE subscriber_import "
+            "(email varchar(254) NOT NULL, full_name varchar(150) NOT NULL) ON COMMIT DROP"
+        )
+        cursor.cursor.copy_expert(
+            "COPY subscriber_import (email, full_name) FROM STDIN WITH (FORMAT csv)",
+            _CsvStream(rows),
+        )
+        cursor.execute(MERGE_SQL.format(table=table))
+        inserted, reactivated, distinct = cursor.fetchone()
+    stats["inserted"] += inserted
+    stats["reactivated"] += reactivated
+    stats["unchanged"] += distinct - inserted - reactivated
+
+
+def _import_batches(rows, stats, batch_size):
+    while True:
+        batch = dict(itertools.islice(rows, batch_size))
+        if not batch:
+            return
+        with transaction.atomic():
+            existing = dict(
+                NewsletterSubscriber.objects.filter(email__in=batch).values_list("email", "is_active")
+            )
+            inactive = [email for email, active in existing.items() if not active]
+            stats["reactivated"] += NewsletterSubscriber.objects.filter(email__in=inactive).update(is_active=True)
+            created = NewsletterSubscriber.objects.bulk_create(
+                [
+                    NewsletterSubscriber(email=email, full_name=name, is_active=True)
+                    for email, name in batch.items() if email not in existing
+                ],
+                ignore_conflicts=True,
+            )
+        stats["inserted"] += len(created)
+        stats["unchanged"] += len(existing) - len(inactive)
+
+
+def import_subscribers(lines, batch_size=5000):
+    """
+    Importe un CSV (itérable de lignes texte) ; renvoie les compteurs.
+
+    ``read`` : lignes valides, ``inserted`` / ``reactivated`` / ``unchanged`` :
+    adresses par issue, ``invalid`` : lignes rejetées.
+    """
+    stats = dict.fromkeys(("read", "inserted", "reactivated", "unchanged", "invalid"), 0)
+    rows = iter_subscriber_rows(lines, stats)
+    if connection.vendor == "postgresql":
+        _import_postgresql(rows, stats)
+    else:
+        _import_batches(rows, stats, batch_size)
+    return stats
+
+
+def export_active_subscribers(chunk_size=2000):
+    """Lignes CSV des abonnés actifs, lues par paquets côté serveur."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(["email", "full_name", "created_at"])
+    rows = (
+        NewsletterSubscriber.objects.filter(is_active=True)
+        .order_by("pk")
+        .values_list("email", "full_name", "created_at")
+        .iterator(chunk_size=chunk_size)
+    )
+    for email, full_name, created_at in rows:
+        yield writer.writerow([csv_cell(email), csv_cell(full_name), created_at.isoformat()])
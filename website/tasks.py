@@ -0,0 +1,138 @@
+# website/tasks.py
+import logging
+import socket
+
+from celery import group, shared_task
+from celery.exceptions import SoftTimeLimitExceeded
+from django.conf import settings
+
+from . import documents, ingest, newsletter, offers, outbox, snapshot, tracking, uploads
+from .images import delete_derivatives, derivative_names, generate_derivatives
+from .models import DocumentBlob, HeroSlide
+
+logger = logging.getLogger(__name__)
+
+# Erreurs SMTP successives tolérées pour une tranche de newsletter
+CHUNK_MAX_FAILURES = 8
+
+
+@shared_task(ignore_result=True)
+def rebuild_home_snapshot():
+    """Reconstruit le snapshot de la page d'accueil pour la version courante."""
+    return snapshot.rebuild_home_snapshot()
+
+
+@shared_task(ignore_result=True)
+def generate_hero_slide_derivatives(slide_id, force=False):
+    """Déclinaisons AVIF/WebP + placeholder de l'image d'une slide."""
+    slide = HeroSlide.objects.filter(pk=slide_id).first()
+    if slide is None or not slide.image:
+        return
+    if not (force or slide.image_derivatives_stale):
+        return
+    previous = slide.image_derivatives
+    slide.image_derivatives = generate_derivatives(slide.image)
+    slide.save(update_fields=["image_derivatives", "updated_at"])
+    # Déclinaisons de l'image remplacée, une fois les nouvelles en place
+    delete_derivatives(previous, keep=derivative_names(slide.image_derivatives))
+
+
+@shared_task(ignore_result=True)
+def ingest_contact_requests():
+    """Vide le flux Redis des demandes de contact (planifiée par celery beat)."""
+    consumer = socket.gethostname()
+    batch_size = settings.WEBSITE_CONTACT_BATCH_SIZE
+    for _ in range(settings.WEBSITE_CONTACT_MAX_BATCHES):
+        if ingest.ingest_contact_batch(consumer, batch_size) < batch_size:
+            break
+
+
+@shared_task(ignore_result=True)
+def relay_outbox():
+    """Envoie les emails dus de la boîte d'envoi (planifiée par celery beat)."""
+    batch_size = settings.WEBSITE_OUTBOX_BATCH_SIZE
+    for _ in range(settings.WEBSITE_OUTBOX_MAX_BATCHES):
+        if outbox.relay_batch(batch_size) < batch_size:
+            break
+
+
+@shared_task(ignore_result=True)
+def send_due_campaigns():
+    """Réserve les campagnes dues et lance leur envoi (planifiée par celery beat)."""
+    for campaign_id in newsletter.claim_due_campaigns():
+        try:
+            send_newsletter_campaign.delay(campaign_id)
+        except Exception:
+            # Campagne réservée mais non planifiée : reprise par un passage ultérieur
+            logger.exception("Impossible de planifier l'envoi de la campagne %s", campaign_id)
+
+
+@shared_task(ignore_result=True)
+def send_newsletter_campaign(campaign_id):
+    """Lance (ou reprend) l'envoi d'une campagne : une tâche par tranche d'abonnés."""
+    bounds = newsletter.start_delivery(campaign_id)
+    if bounds:
+        group(deliver_newsletter_chunk.s(campaign_id, after_id, upto_id) for after_id, upto_id in bounds).apply_async()
+
+
+@shared_task(bind=True, ignore_result=True, acks_late=True, reject_on_worker_lost=True, max_retries=None)
+def deliver_newsletter_chunk(self, campaign_id, after_id, upto_id, failures=0):
+    # acks_late : une tranche interrompue (worker tué) est relivrée et reprend
+    # après le dernier destinataire consigné. ``failures`` compte les seules
+    # erreurs SMTP : les attentes du plafond d'envoi ne l'entament pas.
+    try:
+        return newsletter.deliver_chunk(campaign_id, after_id, upto_id, owner=self.request.id)
+    except (newsletter.RateLimited, newsletter.ChunkBusy) as exc:
+        raise self.retry(countdown=exc.retry_in)
+    except OSError as exc:
+        # Serveur SMTP injoignable, connexion perdue ou refus temporaire (4xx)
+        if failures >= CHUNK_MAX_FAILURES:
+            logger.error("Tranche %s de la campagne %s abandonnée : %s", after_id, campaign_id, exc)
+            raise
+        raise self.retry(
+            exc=exc,
+            countdown=min(60 * 2 ** failures, 3600),
+            kwargs={"failures": failures + 1},
+        )
+
+
+@shared_task(ignore_result=True)
+def flush_engagement():
+    """Reporte les compteurs d'ouverture / clic de Redis vers la base."""
+    tracking.flush_engagement()
+
+
+@shared_task(ignore_result=True)
+def purge_stale_uploads():
+    """Supprime les téléversements de candidature abandonnés (planifiée par celery beat)."""
+    return uploads.purge_stale_uploads()
+
+
+@shared_task(ignore_result=True)
+def collect_orphan_documents():
+    """Supprime les documents de candidature qui ne sont plus référencés."""
+    while documents.collect_orphan_blobs():
+        pass
+    documents.collect_unreferenced_blob_files()
+
+
+@shared_task(ignore_result=True)
+def expire_job_offers():
+    """Dépublie les offres dont la date limite est passée (planifiée par celery beat)."""
+    return offers.expire_job_offers()
+
+
+@shared_task(
+    ignore_result=True,
+    soft_time_limit=settings.WEBSITE_TEXT_EXTRACTION_TIMEOUT + 15,
+    time_limit=settings.WEBSITE_TEXT_EXTRACTION_TIMEOUT + 30,
+)
+def extract_document_text(sha256):
+    """Texte d'un document de candidature, recopié dans les candidatures pour la recherche."""
+    # L'analyse elle-même tourne dans un sous-processus borné (extraction.py) ;
+    # les limites Celery ne couvrent que le reste (base, lecture du résultat).
+    try:
+        documents.extract_blob_text(sha256)
+    except SoftTimeLimitExceeded:
+        documents.mark_blob_text(sha256, DocumentBlob.TEXT_FAILED)
+    documents.refresh_document_text(sha256)
@@ -0,0 +1,72 @@
+# website/templatetags/website_tags.py
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from django import template
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import mark_safe
+
+from ..cache import MESSAGES_HOLE, render_messages
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def flash_messages(context):
+    """Messages flash, ou un trou rempli par requête si la page part en cache."""
+    request = context.get("request")
+    if request is None:
+        return ""
+    if getattr(request, "page_cache_holes", False):
+        return mark_safe(MESSAGES_HOLE)
+    return render_messages(request)
+
+
+@register.simple_tag
+def responsive_image(derivatives, alt="", sizes="100vw", css_class="", eager=False):
+    """
+    <picture> AVIF/WebP à partir de HeroSlide.image_derivatives, avec
+    width/height (pas de décalage de mise en page), lazy-loading et
+    placeholder flou en fond. `eager=True` pour l'image LCP.
+    """
+    if not derivatives or not derivatives.get("sources"):
+        return ""
+    sources = derivatives["sources"]
+
+    def srcset(variants):
+        return ", ".join(f"{variant['url']} {variant['width']}w" for variant in variants)
+
+    # <img> de repli dans un format lisible partout (JPEG, sinon WebP).
+    fallback_mime = "image/jpeg" if "image/jpeg" in sources else "image/webp"
+    fallback = sources[fallback_mime]
+    source_tags = format_html_join(
+        "",
+        '<source type="{}" srcset="{}" sizes="{}">',
+        ((mime, srcset(variants), sizes) for mime, variants in sources.items() if mime != fallback_mime),
+    )
+    loading = 'loading="eager" fetchpriority="high"' if eager else 'loading="lazy"'
+    return format_html(
+        '<picture>{}<img src="{}" srcset="{}" sizes="{}" width="{}" height="{}" alt="{}" class="{}" '
+        '{} decoding="async" style="background-size:cover;background-image:url({})"></picture>',
+        source_tags,
+        fallback[-1]["url"],
+        srcset(fallback),
+        sizes,
+        fallback[-1]["width"],
+        fallback[-1]["height"],
+        alt,
+        css_class,
+        mark_safe(loading),
+        derivatives["placeholder"],
+    )
+
+
+@register.filter
+def width_srcset(url, widths="480,768,1100"):
+    """srcset pour une image distante redimensionnable via le paramètre `w` (Unsplash, imgix)."""
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query))
+    entries = []
+    for width in str(widths).split(","):
+        query["w"] = width.strip()
+        entries.append(f"{urlunsplit(parts._replace(query=urlencode(query)))} {query['w']}w")
+    return ", ".join(entries)
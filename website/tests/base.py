@@ -0,0 +1,41 @@
+import base64
+import io
+import shutil
+import tempfile
+
+from django.test import TestCase, override_settings
+
+from website import uploads
+from website.models import JobApplication, JobOffer
+
+PDF = b"%PDF-1.4 " + b"contenu du CV " * 100
+
+
+class MediaTestCase(TestCase):
+    """MEDIA_ROOT temporaire, vidé après chaque test."""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    @staticmethod
+    def metadata(filename):
+        return "filename " + base64.b64encode(filename.encode()).decode()
+
+    def upload(self, data=PDF, filename="cv.pdf"):
+        """Téléversement par morceaux complet ; renvoie sa session."""
+        session = uploads.create_upload(str(len(data)), self.metadata(filename))
+        uploads.append_chunk(session, "0", io.BytesIO(data), len(data))
+        return session
+
+    def application(self, **fields):
+        offer, _ = JobOffer.objects.get_or_create(
+            slug="comptable", defaults={"title": "Comptable", "short_description": "-", "description": "-"}
+        )
+        fields = {
+            "first_name": "Awa", "last_name": "Koné", "email": "awa@example.com", "phone": "0102030405", **fields,
+        }
+        return JobApplication.objects.create(job_offer=offer, **fields)
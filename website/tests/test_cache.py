@@ -0,0 +1,90 @@
+import re
+
+from django.core.cache import cache
+from django.test import Client, RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from website.cache import (
+    CSRF_TOKEN_HOLE,
+    HOME_SCOPE,
+    JOBS_SCOPE,
+    MAX_PARAM_LENGTH,
+    bump_content_version,
+    page_cache_key,
+)
+
+CSRF_INPUT_RE = re.compile(r'name="csrfmiddlewaretoken" value="([^"]+)"')
+JOB_LIST_PARAMS = ("contrat", "lieu", "ouvertes", "apres")
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class PageCacheTests(TestCase):
+    """Cache des pages anonymes et validateurs HTTP (cache.py)."""
+
+    def setUp(self):
+        cache.clear()
+
+    def key(self, url):
+        request = RequestFactory().get(url)
+        return page_cache_key(request, JOBS_SCOPE, JOB_LIST_PARAMS, uncached_params=("q",))
+
+    def test_unread_query_parameters_do_not_create_entries(self):
+        self.assertEqual(self.key("/recrutement/?x=1"), self.key("/recrutement/"))
+        self.assertEqual(self.key("/recrutement/?x=2&contrat=CDI"), self.key("/recrutement/?contrat=CDI"))
+        self.assertNotEqual(self.key("/recrutement/?contrat=CDI"), self.key("/recrutement/"))
+
+    def test_free_text_search_and_oversized_values_are_not_cached(self):
+        self.assertIsNone(self.key("/recrutement/?q=comptable"))
+        self.assertIsNone(self.key("/recrutement/?lieu=" + "a" * (MAX_PARAM_LENGTH + 1)))
+
+    def test_cached_page_is_served_without_queries(self):
+        url = reverse("website:job_list")
+        self.client.get(url + "?x=1")
+        with self.assertNumQueries(0):
+            response = self.client.get(url + "?x=2")
+        self.assertEqual(response.status_code, 200)
+
+    def test_csrf_hole_is_filled_per_visitor(self):
+        url = reverse("website:home")
+        Client().get(url)
+        self.assertIn(CSRF_TOKEN_HOLE, cache.get(page_cache_key(RequestFactory().get(url), HOME_SCOPE)))
+
+        client = Client(enforce_csrf_checks=True)
+        content = client.get(url).content.decode()
+        self.assertNotIn(CSRF_TOKEN_HOLE, content)
+        token = CSRF_INPUT_RE.search(content).group(1)
+        response = client.post(
+            reverse("website:newsletter_subscribe"),
+            {"email": "visiteur@example.com", "csrfmiddlewaretoken": token},
+        )
+        self.assertEqual(response.status_code, 302)
+
+    def test_messages_hole_is_filled_from_the_cached_page(self):
+        url = reverse("website:home")
+        self.client.get(url)
+        self.client.post(reverse("website:newsletter_subscribe"), {"email": "visiteur@example.com"})
+
+        response = self.client.get(url)
+        self.assertContains(response, "Merci, vous êtes inscrit à notre newsletter.")
+        self.assertNotContains(self.client.get(url), "Merci, vous êtes inscrit")
+
+    def test_unchanged_page_is_revalidated_with_304(self):
+        url = reverse("website:home")
+        self.client.get(url)  # pose le cookie CSRF, qui entre dans l'ETag
+        response = self.client.get(url)
+        etag = response["ETag"]
+        self.assertIn("no-cache", response["Cache-Control"])
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        bump_content_version(HOME_SCOPE)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_no_validators_while_messages_are_pending(self):
+        url = reverse("website:home")
+        self.client.get(url)
+        etag = self.client.get(url)["ETag"]
+        self.client.post(reverse("website:newsletter_subscribe"), {"email": "visiteur@example.com"})
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header("ETag"))
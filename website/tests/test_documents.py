@@ -0,0 +1,64 @@
+import hashlib
+from datetime import timedelta
+
+from django.core.files.base import ContentFile
+from django.db import transaction
+
+from website import documents, uploads
+from website.models import DocumentBlob, UploadSession
+from website.storage import blob_name, document_storage
+
+from .base import PDF, MediaTestCase
+
+PDF_BLOB = blob_name(hashlib.sha256(PDF).hexdigest())
+
+
+class StoreBlobTests(MediaTestCase):
+    def test_same_content_is_stored_once_and_counted(self):
+        first = documents.store_blob(ContentFile(PDF, name="cv.pdf"))
+        second = documents.store_blob(ContentFile(PDF, name="autre.pdf"))
+
+        self.assertEqual(first.pk, second.pk)
+        self.assertEqual(DocumentBlob.objects.get().ref_count, 2)
+        self.assertTrue(document_storage.exists(first.file.name))
+
+    def test_deleted_application_releases_its_documents(self):
+        blob = documents.store_blob(ContentFile(PDF, name="cv.pdf"))
+        self.application(cv=blob).delete()
+
+        self.assertEqual(DocumentBlob.objects.get().ref_count, 0)
+        self.assertEqual(documents.collect_orphan_blobs(), 1)
+        self.assertFalse(DocumentBlob.objects.exists())
+        self.assertFalse(document_storage.exists(blob.file.name))
+
+    def test_received_file_removed_once_committed(self):
+        session = self.upload()
+        path = uploads.part_path(session)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                blob = documents.store_blob(uploads.claim_upload(session.token))
+
+        self.assertFalse(path.exists())
+        with document_storage.open(blob.file.name) as stored:
+            self.assertEqual(stored.read(), PDF)
+
+    def test_rollback_keeps_the_upload_reusable(self):
+        session = self.upload()
+        path = uploads.part_path(session)
+
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                documents.store_blob(uploads.claim_upload(session.token))
+                raise RuntimeError("enregistrement de la candidature impossible")
+
+        self.assertFalse(DocumentBlob.objects.exists())
+        self.assertTrue(UploadSession.objects.filter(pk=session.pk).exists())
+        self.assertTrue(path.exists())
+        self.assertTrue(uploads.is_ready(session.token))
+        self.assertTrue(document_storage.exists(PDF_BLOB))
+
+        # Le fichier de contenu laissé sans ligne est collecté
+        self.assertEqual(documents.collect_unreferenced_blob_files(max_age=timedelta(0)), 1)
+        self.assertFalse(document_storage.exists(PDF_BLOB))
+
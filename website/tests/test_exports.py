@@ -0,0 +1,64 @@
+import csv
+import io
+import zipfile
+
+from django.core.files.base import ContentFile
+
+from website.documents import store_blob
+from website.exports import MANIFEST_NAME, iter_applications_zip
+from website.models import JobApplication
+
+from .base import PDF, MediaTestCase
+
+DOCX = b"PK\x03\x04" + b"document word " * 200
+
+
+class ApplicationsZipTests(MediaTestCase):
+    """Archive ZIP des candidatures produite en flux (exports.py)."""
+
+    def archive(self):
+        data = b"".join(iter_applications_zip(JobApplication.objects.all(), chunk_size=1))
+        return zipfile.ZipFile(io.BytesIO(data))
+
+    def test_streamed_archive_opens_with_manifest_and_documents(self):
+        first = self.application(
+            cv=store_blob(ContentFile(PDF, name="cv.pdf")), cv_filename="cv.pdf",
+            cover_letter=store_blob(ContentFile(DOCX, name="lettre.docx")), cover_letter_filename="lettre.docx",
+        )
+        self.application(last_name="Traoré", notes="Disponible")
+
+        with self.archive() as archive:
+            self.assertIsNone(archive.testzip())
+            names = archive.namelist()
+            self.assertEqual(names[0], MANIFEST_NAME)
+            self.assertEqual(len(names), 3)
+            cv_name = next(name for name in names if "/CV_" in name)
+            self.assertTrue(cv_name.startswith(f"{first.pk}_"))
+            self.assertEqual(archive.read(cv_name), PDF)
+            manifest = archive.read(MANIFEST_NAME).decode("utf-8-sig")
+
+        rows = list(csv.reader(io.StringIO(manifest), delimiter=";"))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[1][8], cv_name)
+
+    def test_compressed_formats_are_stored(self):
+        self.application(
+            cv=store_blob(ContentFile(PDF, name="cv.pdf")), cv_filename="cv.pdf",
+            cover_letter=store_blob(ContentFile(b"lettre " * 200, name="lettre.txt")), cover_letter_filename="lettre.txt",
+        )
+
+        with self.archive() as archive:
+            methods = {info.filename.rsplit("_", 1)[-1]: info.compress_type for info in archive.infolist()}
+        self.assertEqual(methods["cv.pdf"], zipfile.ZIP_STORED)
+        self.assertEqual(methods["lettre.txt"], zipfile.ZIP_DEFLATED)
+        self.assertEqual(methods[MANIFEST_NAME], zipfile.ZIP_DEFLATED)
+
+    def test_manifest_neutralizes_spreadsheet_formulas(self):
+        self.application(last_name="=HYPERLINK(\"http://example.com\")", first_name="@SUM(A1)", notes="-2+3")
+
+        with self.archive() as archive:
+            manifest = archive.read(MANIFEST_NAME).decode("utf-8-sig")
+        row = list(csv.reader(io.StringIO(manifest), delimiter=";"))[1]
+        self.assertEqual(row[1], "'=HYPERLINK(\"http://example.com\")")
+        self.assertEqual(row[2], "'@SUM(A1)")
+        self.assertEqual(row[10], "'-2+3")
@@ -0,0 +1,57 @@
+import io
+import os
+import tempfile
+import zipfile
+
+from django.test import SimpleTestCase
+
+from website.extraction import OLE_MAGIC, ExtractionError, UnsupportedDocument, extract_file_text
+
+MEMORY = 512 * 1024 * 1024
+
+DOCX_BODY = (
+    '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+    "<w:body><w:p><w:r><w:t>Comptable confirmée</w:t></w:r></w:p>"
+    "<w:p><w:r><w:t>Abidjan</w:t></w:r></w:p></w:body></w:document>"
+)
+
+
+def docx(body=DOCX_BODY):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("word/document.xml", body)
+    return buffer.getvalue()
+
+
+class IsolatedExtractionTests(SimpleTestCase):
+    """Extraction dans un sous-processus borné (extract_file_text)."""
+
+    def document(self, data):
+        descriptor, path = tempfile.mkstemp()
+        with os.fdopen(descriptor, "wb") as target:
+            target.write(data)
+        self.addCleanup(os.unlink, path)
+        return path
+
+    def test_text_is_extracted_in_a_subprocess(self):
+        text = extract_file_text(self.document(docx()), timeout=30, memory_limit=MEMORY)
+        self.assertIn("Comptable confirmée", text)
+        self.assertIn("Abidjan", text)
+
+    def test_unsupported_format_is_reported(self):
+        with self.assertRaises(UnsupportedDocument):
+            extract_file_text(self.document(OLE_MAGIC + b"\0" * 512), timeout=30, memory_limit=MEMORY)
+
+    def test_malformed_document_fails_cleanly(self):
+        with self.assertRaises(ExtractionError):
+            extract_file_text(self.document(b"%PDF-1.4 tronque"), timeout=30, memory_limit=MEMORY)
+
+    def test_memory_limit_stops_the_subprocess(self):
+        # Un seul paragraphe de 16 Mo, sous MAX_XML_SIZE mais pas sous 48 Mo de mémoire
+        path = self.document(docx(DOCX_BODY.replace("Abidjan", "x" * (16 * 1024 * 1024))))
+        with self.assertRaises(ExtractionError):
+            extract_file_text(path, timeout=30, memory_limit=48 * 1024 * 1024)
+
+    def test_timeout_kills_the_subprocess(self):
+        with self.assertRaises(ExtractionError):
+            extract_file_text(self.document(docx()), timeout=0, memory_limit=MEMORY)
@@ -0,0 +1,68 @@
+import io
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image
+
+from website import tasks
+from website.images import derivative_names
+from website.models import HeroSlide
+
+from .base import MediaTestCase
+
+
+def png(color):
+    buffer = io.BytesIO()
+    Image.new("RGB", (640, 360), color).save(buffer, "PNG")
+    return ContentFile(buffer.getvalue())
+
+
+class HeroDerivativeTests(MediaTestCase):
+    """Déclinaisons de l'image des slides d'accueil (images.py)."""
+
+    def setUp(self):
+        super().setUp()
+        self.slide = HeroSlide(pair_key="accueil", position=HeroSlide.POSITION_VISUAL)
+        self.slide.image.save("bureau.png", png("navy"))
+        tasks.generate_hero_slide_derivatives(self.slide.pk)
+        self.slide.refresh_from_db()
+        self.names = derivative_names(self.slide.image_derivatives)
+
+    def assertStored(self, names, stored=True):
+        for name in names:
+            self.assertEqual(default_storage.exists(name), stored, name)
+
+    def test_derivatives_are_recorded_and_stored(self):
+        self.assertTrue(self.names)
+        self.assertStored(self.names)
+
+    def test_replaced_image_derivatives_are_deleted(self):
+        self.slide.image.save("equipe.png", png("orange"))
+        tasks.generate_hero_slide_derivatives(self.slide.pk)
+        self.slide.refresh_from_db()
+
+        current = derivative_names(self.slide.image_derivatives)
+        self.assertTrue(current.isdisjoint(self.names))
+        self.assertStored(current)
+        self.assertStored(self.names, stored=False)
+
+    def test_same_name_regeneration_keeps_the_files(self):
+        tasks.generate_hero_slide_derivatives(self.slide.pk, force=True)
+        self.slide.refresh_from_db()
+
+        self.assertEqual(derivative_names(self.slide.image_derivatives), self.names)
+        self.assertStored(self.names)
+
+    def test_removed_image_derivatives_are_deleted(self):
+        self.slide.image = None
+        with self.captureOnCommitCallbacks(execute=True):
+            self.slide.save()
+
+        self.assertEqual(self.slide.image_derivatives, {})
+        self.assertStored(self.names, stored=False)
+
+    def test_deleted_slide_derivatives_are_deleted(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.slide.delete()
+
+        self.assertStored(self.names, stored=False)
@@ -0,0 +1,180 @@
+import smtplib
+from datetime import timedelta
+from unittest import mock
+
+from django.core import mail
+from django.core.mail.backends import locmem
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from website import newsletter, tasks
+from website.models import NewsletterCampaign, NewsletterChunk, NewsletterDelivery, NewsletterSubscriber
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+    WEBSITE_NEWSLETTER_CHUNK_SIZE=2,
+    WEBSITE_NEWSLETTER_RATE_PER_MINUTE=0,
+    WEBSITE_NEWSLETTER_TRACKING=False,
+)
+class NewsletterDeliveryTests(TestCase):
+    """Comptage des tranches et reprise des envois (newsletter.py)."""
+
+    def setUp(self):
+        for index in range(5):
+            NewsletterSubscriber.objects.create(email=f"abonne{index}@example.com")
+        self.campaign = NewsletterCampaign.objects.create(
+            title="Test", subject="Actualités", body_html="<p>Bonjour</p>"
+        )
+
+    def refresh(self):
+        self.campaign.refresh_from_db()
+        return self.campaign
+
+    def deliver(self, bounds, owner="tache"):
+        return [newsletter.deliver_chunk(self.campaign.pk, after_id, upto_id, owner=owner) for after_id, upto_id in bounds]
+
+    def test_campaign_closed_when_every_chunk_is_done(self):
+        bounds = newsletter.start_delivery(self.campaign.pk)
+        self.assertEqual(len(bounds), 3)
+        self.assertEqual(self.campaign.chunks.count(), 3)
+
+        self.deliver(bounds[:2])
+        self.assertEqual(self.refresh().status, NewsletterCampaign.STATUS_SENDING)
+
+        self.deliver(bounds[2:])
+        campaign = self.refresh()
+        self.assertEqual(campaign.status, NewsletterCampaign.STATUS_SENT)
+        self.assertEqual(campaign.chunks_done, 3)
+        self.assertEqual(len(mail.outbox), 5)
+
+    def test_redelivered_chunk_is_counted_once(self):
+        bounds = newsletter.start_delivery(self.campaign.pk)
+        # Relivraison (acks_late) d'une tranche déjà terminée
+        self.deliver([bounds[0], bounds[0]])
+        newsletter.complete_chunk(self.campaign.pk, bounds[0][0])
+
+        campaign = self.refresh()
+        self.assertEqual(campaign.chunks_done, 1)
+        self.assertEqual(campaign.status, NewsletterCampaign.STATUS_SENDING)
+        self.assertEqual(len(mail.outbox), 2)
+
+        self.deliver(bounds[1:])
+        self.assertEqual(self.refresh().status, NewsletterCampaign.STATUS_SENT)
+        self.assertEqual(len(mail.outbox), 5)
+
+    def test_resume_refused_while_delivery_is_active(self):
+        bounds = newsletter.start_delivery(self.campaign.pk)
+        self.deliver(bounds[:1])
+
+        self.assertTrue(newsletter.is_delivery_active(self.campaign.pk))
+        self.assertEqual(newsletter.start_delivery(self.campaign.pk), [])
+        self.assertEqual(self.refresh().chunks_done, 1)
+
+    def test_stalled_delivery_resumes_pending_chunks_only(self):
+        bounds = newsletter.start_delivery(self.campaign.pk)
+        self.deliver(bounds[:1])
+        NewsletterChunk.objects.filter(campaign=self.campaign).update(
+            dispatched_at=timezone.now() - timedelta(hours=1)
+        )
+
+        self.assertFalse(newsletter.is_delivery_active(self.campaign.pk))
+        resumed = newsletter.start_delivery(self.campaign.pk)
+        self.assertEqual(resumed, bounds[1:])
+        self.assertEqual(self.refresh().chunks_done, 1)
+
+        self.deliver(resumed, owner="reprise")
+        self.assertEqual(self.refresh().status, NewsletterCampaign.STATUS_SENT)
+        self.assertEqual(len(mail.outbox), 5)
+
+    def test_chunk_leased_by_another_task_is_not_sent_twice(self):
+        bounds = newsletter.start_delivery(self.campaign.pk)
+        after_id, upto_id = bounds[0]
+        NewsletterChunk.objects.filter(campaign=self.campaign, after_id=after_id).update(
+            leased_until=timezone.now() + timedelta(minutes=5), lease_owner="autre"
+        )
+
+        with self.assertRaises(newsletter.ChunkBusy):
+            newsletter.deliver_chunk(self.campaign.pk, after_id, upto_id, owner="tache")
+        self.assertEqual(len(mail.outbox), 0)
+
+        # Nouvel essai de la tâche titulaire du bail
+        self.assertEqual(newsletter.deliver_chunk(self.campaign.pk, after_id, upto_id, owner="autre"), 2)
+
+    def test_recipients_already_served_are_skipped(self):
+        bounds = newsletter.start_delivery(self.campaign.pk)
+        first = NewsletterSubscriber.objects.order_by("pk").first()
+        NewsletterDelivery.objects.create(
+            campaign=self.campaign, subscriber=first, status=NewsletterDelivery.STATUS_SENT
+        )
+
+        self.deliver(bounds)
+        self.assertEqual(len(mail.outbox), 4)
+
+    def test_campaign_without_subscribers_is_closed(self):
+        NewsletterSubscriber.objects.update(is_active=False)
+
+        self.assertEqual(newsletter.start_delivery(self.campaign.pk), [])
+        self.assertEqual(self.refresh().status, NewsletterCampaign.STATUS_SENT)
+
+    def test_claimed_campaign_never_started_is_claimed_again(self):
+        NewsletterCampaign.objects.filter(pk=self.campaign.pk).update(
+            status=NewsletterCampaign.STATUS_SCHEDULED, scheduled_at=timezone.now() - timedelta(minutes=1)
+        )
+        self.assertEqual(newsletter.claim_due_campaigns(), [self.campaign.pk])
+        # Envoi jamais planifié (broker indisponible) : pas de nouvelle réservation tout de suite…
+        self.assertEqual(newsletter.claim_due_campaigns(), [])
+
+        # … mais une fois le délai de reprise écoulé
+        NewsletterCampaign.objects.filter(pk=self.campaign.pk).update(
+            delivery_started_at=timezone.now() - timedelta(hours=1)
+        )
+        self.assertEqual(newsletter.claim_due_campaigns(), [self.campaign.pk])
+
+        newsletter.start_delivery(self.campaign.pk)
+        NewsletterCampaign.objects.filter(pk=self.campaign.pk).update(
+            delivery_started_at=timezone.now() - timedelta(hours=1)
+        )
+        self.assertEqual(newsletter.claim_due_campaigns(), [])
+
+    def test_permanent_refusal_of_one_message_is_recorded(self):
+        bounds = newsletter.start_delivery(self.campaign.pk)
+        refused = NewsletterSubscriber.objects.order_by("pk").first().email
+        send_messages = locmem.EmailBackend.send_messages
+
+        def refuse_one(backend, messages):
+            if messages[0].to == [refused]:
+                raise smtplib.SMTPDataError(554, b"Message rejete")
+            return send_messages(backend, messages)
+
+        with mock.patch.object(locmem.EmailBackend, "send_messages", refuse_one):
+            self.deliver(bounds)
+
+        failed = NewsletterDelivery.objects.get(status=NewsletterDelivery.STATUS_FAILED)
+        self.assertEqual(failed.subscriber.email, refused)
+        self.assertEqual(len(mail.outbox), 4)
+        self.assertEqual(self.refresh().status, NewsletterCampaign.STATUS_SENT)
+
+    def test_temporary_refusal_retries_the_task(self):
+        bounds = newsletter.start_delivery(self.campaign.pk)
+        with mock.patch.object(
+            locmem.EmailBackend, "send_messages", side_effect=smtplib.SMTPDataError(451, b"Plus tard")
+        ):
+            with self.assertRaises(smtplib.SMTPDataError):
+                self.deliver(bounds[:1])
+        self.assertFalse(NewsletterDelivery.objects.exists())
+
+    def test_rate_limit_waits_do_not_use_the_failure_budget(self):
+        outcomes = [newsletter.RateLimited(0)] * 20 + [ConnectionError()] * tasks.CHUNK_MAX_FAILURES + [2]
+        with mock.patch.object(newsletter, "deliver_chunk", side_effect=outcomes) as deliver_chunk:
+            result = tasks.deliver_newsletter_chunk.apply(args=(self.campaign.pk, 0, 2))
+        self.assertEqual(result.get(), 2)
+        self.assertEqual(deliver_chunk.call_count, len(outcomes))
+
+    def test_chunk_given_up_after_repeated_connection_errors(self):
+        with mock.patch.object(newsletter, "deliver_chunk", side_effect=ConnectionError()) as deliver_chunk:
+            result = tasks.deliver_newsletter_chunk.apply(args=(self.campaign.pk, 0, 2))
+        with self.assertRaises(ConnectionError):
+            result.get()
+        self.assertEqual(deliver_chunk.call_count, tasks.CHUNK_MAX_FAILURES + 1)
@@ -0,0 +1,60 @@
+from datetime import timedelta
+
+from django.core import mail
+from django.test import TestCase
+from django.utils import timezone
+
+from website import outbox
+from website.models import OutboxEmail
+
+
+class RelayTests(TestCase):
+    """Relais de la boîte d'envoi (outbox.py)."""
+
+    def setUp(self):
+        self.email = OutboxEmail.objects.create(to=["candidat@example.com"], subject="Reçu", body_text="Merci")
+
+    def expire_lease(self):
+        OutboxEmail.objects.filter(pk=self.email.pk).update(next_attempt_at=timezone.now() - timedelta(seconds=1))
+
+    def test_batch_is_sent_and_lease_released(self):
+        self.assertEqual(outbox.relay_batch(), 1)
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.email.refresh_from_db()
+        self.assertEqual(self.email.status, OutboxEmail.STATUS_SENT)
+        self.assertIsNone(self.email.lease)
+
+    def test_expired_lease_is_reclaimed_under_a_new_token(self):
+        [stale] = outbox.claim_batch()
+        self.assertEqual(outbox.claim_batch(), [])
+        self.expire_lease()
+        [current] = outbox.claim_batch()
+
+        self.assertNotEqual(stale.lease, current.lease)
+
+    def test_stale_relay_does_not_overwrite_the_result(self):
+        [stale] = outbox.claim_batch()
+        self.expire_lease()
+        [current] = outbox.claim_batch()
+
+        outbox._mark_sent(current)
+        self.assertTrue(outbox._save_result(current))
+        outbox._record_failure(stale, OSError("connexion perdue"), timezone.now())
+        self.assertFalse(outbox._save_result(stale))
+
+        self.email.refresh_from_db()
+        self.assertEqual(self.email.status, OutboxEmail.STATUS_SENT)
+        self.assertEqual(self.email.attempts, 1)
+        self.assertEqual(self.email.last_error, "")
+
+    def test_stale_relay_cannot_finish_a_reclaimed_send(self):
+        [stale] = outbox.claim_batch()
+        self.expire_lease()
+        [current] = outbox.claim_batch()
+
+        outbox._mark_sent(stale)
+        self.assertFalse(outbox._save_result(stale))
+        self.email.refresh_from_db()
+        self.assertEqual(self.email.status, OutboxEmail.STATUS_SENDING)
+        self.assertEqual(self.email.lease, current.lease)
@@ -0,0 +1,50 @@
+import csv
+import io
+
+from django.test import TestCase
+
+from website.models import NewsletterSubscriber
+from website.subscribers import export_active_subscribers, import_subscribers
+
+
+class SubscriberImportTests(TestCase):
+    """Import / export CSV des abonnés (subscribers.py, branche par lots)."""
+
+    def test_header_columns_are_detected_in_any_order(self):
+        lines = ["Nom,Courriel", "Awa Koné,AWA@Example.com ", "Sans adresse,", "Moussa,moussa@example.com"]
+
+        stats = import_subscribers(lines)
+
+        self.assertEqual(stats["read"], 2)
+        self.assertEqual(stats["invalid"], 1)
+        self.assertEqual(NewsletterSubscriber.objects.get(email="awa@example.com").full_name, "Awa Koné")
+
+    def test_without_header_first_column_is_the_email(self):
+        stats = import_subscribers(["awa@example.com,Awa", "moussa@example.com"])
+
+        self.assertEqual(stats["inserted"], 2)
+        self.assertEqual(NewsletterSubscriber.objects.get(email="awa@example.com").full_name, "Awa")
+
+    def test_batches_count_each_outcome(self):
+        NewsletterSubscriber.objects.create(email="actif@example.com")
+        NewsletterSubscriber.objects.create(email="inactif@example.com", is_active=False)
+        lines = [
+            "email",
+            "actif@example.com", "inactif@example.com",
+            "nouveau1@example.com", "nouveau2@example.com", "nouveau1@example.com",
+            "pas-une-adresse",
+        ]
+
+        stats = import_subscribers(lines, batch_size=2)
+
+        self.assertEqual(stats, {"read": 5, "inserted": 2, "reactivated": 1, "unchanged": 2, "invalid": 1})
+        self.assertEqual(NewsletterSubscriber.objects.filter(is_active=True).count(), 4)
+
+    def test_export_neutralizes_spreadsheet_formulas(self):
+        NewsletterSubscriber.objects.create(email="awa@example.com", full_name="=HYPERLINK(\"http://example.com\")")
+        NewsletterSubscriber.objects.create(email="moussa@example.com", full_name="Moussa", is_active=False)
+
+        rows = list(csv.reader(io.StringIO("".join(export_active_subscribers()))))
+
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[1][:2], ["awa@example.com", "'=HYPERLINK(\"http://example.com\")"])
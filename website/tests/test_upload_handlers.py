@@ -0,0 +1,76 @@
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from website import uploads
+from website.models import DocumentBlob, JobApplication, JobOffer, OutboxEmail
+
+from .base import PDF, MediaTestCase
+
+
+class ApplicationDocumentUploadTests(MediaTestCase):
+    """Documents joints au formulaire de candidature (upload_handlers.py)."""
+
+    def setUp(self):
+        super().setUp()
+        self.offer = JobOffer.objects.create(
+            title="Comptable", slug="comptable", short_description="-", description="-", published_at=timezone.now()
+        )
+        self.url = reverse("website:job_detail", args=[self.offer.slug])
+
+    def post(self, **files):
+        data = {
+            "first_name": "Awa", "last_name": "Koné", "email": "awa@example.com", "phone": "0102030405",
+            **files,
+        }
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(self.url, data)
+
+    def leftover_uploads(self):
+        directory = uploads.upload_dir()
+        return list(directory.iterdir()) if directory.is_dir() else []
+
+    def assertRejected(self, response, message):
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, message)
+        self.assertFalse(JobApplication.objects.exists())
+        self.assertEqual(self.leftover_uploads(), [])
+
+    def test_valid_documents_are_stored(self):
+        response = self.post(
+            cv=SimpleUploadedFile("cv.pdf", PDF),
+            cover_letter=SimpleUploadedFile("lettre.pdf", PDF + b"lettre"),
+        )
+
+        self.assertRedirects(response, self.url, fetch_redirect_response=False)
+        application = JobApplication.objects.get()
+        self.assertEqual(application.cv_filename, "cv.pdf")
+        self.assertEqual(DocumentBlob.objects.count(), 2)
+        self.assertTrue(OutboxEmail.objects.filter(to=["awa@example.com"]).exists())
+        self.assertEqual(self.leftover_uploads(), [])
+
+    def test_content_not_matching_extension_is_rejected(self):
+        response = self.post(cv=SimpleUploadedFile("cv.pdf", b"GIF89a" + PDF))
+        self.assertRejected(response, "ne correspond pas à un document PDF, DOC, DOCX ou ODT")
+
+    def test_unsupported_extension_is_rejected(self):
+        response = self.post(cv=SimpleUploadedFile("cv.exe", PDF))
+        self.assertRejected(response, "Formats acceptés : PDF, DOC, DOCX, ODT.")
+
+    @override_settings(WEBSITE_UPLOAD_MAX_SIZE=len(PDF) - 1)
+    def test_file_over_the_size_cap_is_rejected(self):
+        response = self.post(cv=SimpleUploadedFile("cv.pdf", PDF))
+        self.assertRejected(response, "Fichier trop volumineux.")
+
+    @override_settings(WEBSITE_APPLICATION_MAX_REQUEST_SIZE=len(PDF))
+    def test_request_over_the_size_cap_is_rejected(self):
+        response = self.post(
+            cv=SimpleUploadedFile("cv.pdf", PDF),
+            cover_letter=SimpleUploadedFile("lettre.pdf", PDF),
+        )
+        self.assertRejected(response, "Les documents joints dépassent la taille autorisée.")
+
+    def test_unexpected_file_field_is_rejected(self):
+        response = self.post(photo=SimpleUploadedFile("photo.pdf", PDF), cv=SimpleUploadedFile("cv.pdf", PDF))
+        self.assertRejected(response, "Pièce jointe inattendue.")
@@ -0,0 +1,97 @@
+import fcntl
+
+from django.test import override_settings
+from django.urls import reverse
+
+from website import uploads
+from website.models import UploadSession
+
+from .base import PDF, MediaTestCase
+
+
+class ResumableUploadTests(MediaTestCase):
+    """Téléversements par morceaux (uploads.py, vues upload_create / upload_detail)."""
+
+    def create(self, size=len(PDF), filename="cv.pdf", **extra):
+        return self.client.post(
+            reverse("website:upload_create"),
+            HTTP_UPLOAD_LENGTH=str(size), HTTP_UPLOAD_METADATA=self.metadata(filename), **extra,
+        )
+
+    def patch(self, location, offset, data):
+        return self.client.generic(
+            "PATCH", location, data,
+            content_type="application/offset+octet-stream", HTTP_UPLOAD_OFFSET=str(offset),
+        )
+
+    def test_chunks_appended_at_the_announced_offset(self):
+        location = self.create()["Location"]
+        self.assertEqual(self.patch(location, 0, PDF[:600]).status_code, 204)
+        response = self.patch(location, 600, PDF[600:])
+
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(response["Upload-Offset"], str(len(PDF)))
+        session = UploadSession.objects.get()
+        self.assertEqual(uploads.part_path(session).read_bytes(), PDF)
+
+    def test_unexpected_offset_is_rejected(self):
+        location = self.create()["Location"]
+        self.patch(location, 0, PDF[:600])
+
+        response = self.patch(location, 0, PDF[:600])
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response["Upload-Offset"], "600")
+
+    def test_chunk_beyond_announced_length_is_rejected(self):
+        location = self.create(size=100)["Location"]
+        self.assertEqual(self.patch(location, 0, PDF[:101]).status_code, 413)
+        self.assertEqual(UploadSession.objects.get().offset, 0)
+
+    def test_chunk_written_concurrently_is_rejected(self):
+        location = self.create()["Location"]
+        session = UploadSession.objects.get()
+        with open(uploads.part_path(session), "r+b") as other:
+            fcntl.flock(other, fcntl.LOCK_EX)
+            self.assertEqual(self.patch(location, 0, PDF).status_code, 409)
+        self.assertEqual(UploadSession.objects.get().offset, 0)
+        self.assertEqual(uploads.part_path(session).read_bytes(), b"")
+
+    def test_content_not_matching_extension_is_discarded(self):
+        location = self.create()["Location"]
+        self.assertEqual(self.patch(location, 0, b"GIF89a" + PDF[6:]).status_code, 415)
+        self.assertFalse(UploadSession.objects.exists())
+
+    @override_settings(WEBSITE_UPLOAD_MAX_SESSIONS_PER_CLIENT=2)
+    def test_open_uploads_capped_per_client(self):
+        self.assertEqual(self.create().status_code, 201)
+        self.assertEqual(self.create().status_code, 201)
+        self.assertEqual(self.create().status_code, 429)
+        self.assertEqual(self.create(REMOTE_ADDR="10.0.0.2").status_code, 201)
+
+    @override_settings(WEBSITE_TRUSTED_PROXY_HOPS=1, WEBSITE_UPLOAD_MAX_SESSIONS_PER_CLIENT=1)
+    def test_client_address_read_behind_proxy(self):
+        self.assertEqual(self.create(HTTP_X_FORWARDED_FOR="203.0.113.7").status_code, 201)
+        self.assertEqual(self.create(HTTP_X_FORWARDED_FOR="203.0.113.8").status_code, 201)
+        self.assertEqual(self.create(HTTP_X_FORWARDED_FOR="203.0.113.7").status_code, 429)
+
+    @override_settings(WEBSITE_UPLOAD_MAX_PENDING_BYTES=2 * len(PDF))
+    def test_total_pending_bytes_capped(self):
+        self.assertEqual(self.create(REMOTE_ADDR="10.0.0.1").status_code, 201)
+        self.assertEqual(self.create(REMOTE_ADDR="10.0.0.2").status_code, 201)
+        self.assertEqual(self.create(REMOTE_ADDR="10.0.0.3").status_code, 503)
+
+    def test_complete_upload_claimed_once(self):
+        session = self.upload()
+        document = uploads.claim_upload(session.token)
+        self.assertEqual(document.temporary_file_path(), str(uploads.part_path(session)))
+        document.close()
+
+        with self.assertRaises(uploads.UploadError):
+            uploads.claim_upload(session.token)
+
+    def test_incomplete_upload_cannot_be_claimed(self):
+        location = self.create()["Location"]
+        self.patch(location, 0, PDF[:600])
+        with self.assertRaises(uploads.UploadError) as raised:
+            uploads.claim_upload(UploadSession.objects.get().token)
+        self.assertEqual(raised.exception.status, 404)
@@ -0,0 +1,141 @@
+# website/tracking.py
+"""
+Suivi des ouvertures et des clics des newsletters, en écriture différée.
+
+Les endpoints (pixel, redirection) ne touchent pas la base : un pipeline Redis
+incrémente un hash de compteurs par campagne (opens, clicks, link:<url>) et
+alimente deux HyperLogLogs (ouvreurs et cliqueurs uniques). La tâche
+flush_engagement renomme chaque hash avant de le lire, reporte les deltas dans
+CampaignEngagement / CampaignLinkClicks puis supprime la copie : le nombre
+d'écritures par passage dépend du nombre de campagnes et de liens actifs, pas
+du trafic.
+"""
+import base64
+import hashlib
+import logging
+
+from django.db import transaction
+from django.db.models import F
+from django_redis import get_redis_connection
+from redis.exceptions import ResponseError
+
+from .models import CampaignEngagement, CampaignLinkClicks, NewsletterCampaign
+
+logger = logging.getLogger(__name__)
+
+DIRTY_KEY = "rhp:track:dirty"
+COUNTERS_KEY = "rhp:track:{campaign_id}"
+FLUSHING_KEY = "rhp:track:{campaign_id}:flushing"
+UNIQUE_KEY = "rhp:track:{campaign_id}:{event}:uniq"
+LINK_PREFIX = "link:"
+
+# GIF transparent 1x1
+PIXEL_GIF = base64.b64decode("R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7")
+
+
+def _redis():
+    return get_redis_connection("default")
+
+
+def _record(campaign_id, event, subscriber_id, link=None):
+    try:
+        pipe = _redis().pipeline(transaction=False)
+        key = COUNTERS_KEY.format(campaign_id=campaign_id)
+        pipe.hincrby(key, event, 1)
+        if link:
+            pipe.hincrby(key, LINK_PREFIX + link, 1)
+        if subscriber_id is not None:
+            pipe.pfadd(UNIQUE_KEY.format(campaign_id=campaign_id, event=event), subscriber_id)
+        pipe.sadd(DIRTY_KEY, campaign_id)
+        pipe.execute()
+    except Exception:
+        # Le suivi ne doit jamais casser le pixel ni la redirection.
+        logger.exception("Suivi newsletter indisponible")
+
+
+def record_open(campaign_id, subscriber_id=None):
+    _record(campaign_id, "opens", subscriber_id)
+
+
+def record_click(campaign_id, url, subscriber_id=None):
+    _record(campaign_id, "clicks", subscriber_id, link=url)
+
+
+def link_hash(url):
+    """Clé d'unicité de CampaignLinkClicks."""
+    return hashlib.sha256(url.encode()).hexdigest()
+
+
+def _flush_campaign(conn, campaign_id):
+    key = COUNTERS_KEY.format(campaign_id=campaign_id)
+    flushing = FLUSHING_KEY.format(campaign_id=campaign_id)
+    # Une copie restée d'un passage interrompu est reprise avant toute nouvelle.
+    if not conn.exists(flushing):
+        try:
+            conn.rename(key, flushing)
+        except ResponseError:
+            return  # aucun compteur depuis le dernier passage
+    counters = {name.decode(): int(value) for name, value in conn.hgetall(flushing).items()}
+    pipe = conn.pipeline(transaction=False)
+    pipe.pfcount(UNIQUE_KEY.format(campaign_id=campaign_id, event="opens"))
+    pipe.pfcount(UNIQUE_KEY.format(campaign_id=campaign_id, event="clicks"))
+    unique_opens, unique_clicks = pipe.execute()
+
+    links = {
+        name[len(LINK_PREFIX):]: count for name, count in counters.items() if name.startswith(LINK_PREFIX)
+    }
+    with transaction.atomic():
+        CampaignEngagement.objects.get_or_create(campaign_id=campaign_id)
+        CampaignEngagement.objects.filter(campaign_id=campaign_id).update(
+            opens=F("opens") + counters.get("opens", 0),
+            clicks=F("clicks") + counters.get("clicks", 0),
+            # HyperLogLogs jamais remis à zéro : valeur absolue
+            unique_opens=unique_opens,
+            unique_clicks=unique_clicks,
+        )
+        if links:
+            hashes = {url: link_hash(url) for url in links}
+            CampaignLinkClicks.objects.bulk_create(
+                [CampaignLinkClicks(campaign_id=campaign_id, url=url, url_hash=hashes[url]) for url in links],
+                ignore_conflicts=True,
+            )
+            for url, count in links.items():
+                CampaignLinkClicks.objects.filter(campaign_id=campaign_id, url_hash=hashes[url]).update(
+                    clicks=F("clicks") + count
+                )
+    conn.delete(flushing)
+
+
+def _discard_campaign(conn, campaign_id):
+    conn.delete(
+        COUNTERS_KEY.format(campaign_id=campaign_id),
+        FLUSHING_KEY.format(campaign_id=campaign_id),
+        *(UNIQUE_KEY.format(campaign_id=campaign_id, event=event) for event in ("opens", "clicks")),
+    )
+
+
+def flush_engagement():
+    """Reporte les compteurs Redis en base ; renvoie le nombre de campagnes traitées."""
+    conn = _redis()
+    campaign_ids = [int(value) for value in conn.smembers(DIRTY_KEY)]
+    if not campaign_ids:
+        return 0
+    # Le pixel accepte tout identifiant : campagne supprimée ou inventée,
+    # ses compteurs sont abandonnés au lieu d'échouer sur la clé étrangère.
+    existing = set(NewsletterCampaign.objects.filter(pk__in=campaign_ids).values_list("pk", flat=True))
+    flushed = 0
+    for campaign_id in campaign_ids:
+        # Retiré avant lecture : un hit concurrent le remet pour le prochain passage.
+        conn.srem(DIRTY_KEY, campaign_id)
+        if campaign_id not in existing:
+            _discard_campaign(conn, campaign_id)
+            continue
+        try:
+            _flush_campaign(conn, campaign_id)
+        except Exception:
+            # La copie :flushing reste et sera reprise ; les autres campagnes passent.
+            logger.exception("Report des statistiques de la campagne %s impossible", campaign_id)
+            conn.sadd(DIRTY_KEY, campaign_id)
+        else:
+            flushed += 1
+    return flushed
@@ -0,0 +1,145 @@
+# website/upload_handlers.py
+"""
+Réception en flux des documents joints au formulaire de candidature.
+
+Remplace, pour JobOfferDetailView.post, les handlers par défaut de Django
+(mémoire jusqu'à 2,5 Mo puis /tmp, un tmpfs de 128 Mo sur rhp_web) : chaque
+morceau est écrit directement sur le volume média (MEDIA_ROOT/televersements,
+lié sans copie à l'enregistrement), son SHA-256 calculé au fil de l'eau,
+et la réception est interrompue (StopUpload) dès qu'une règle est enfreinte :
+format réel (octets de tête) différent de l'extension, fichier ou requête
+trop volumineux, champ inattendu.
+
+Après un refus, le reste du corps est lu sans être écrit, ce qui est borné
+par WEBSITE_APPLICATION_MAX_REQUEST_SIZE : le formulaire est réaffiché avec
+l'erreur. Une requête annoncée (Content-Length) au-delà de cette limite n'est
+pas lue : le serveur répond sans attendre la fin de l'envoi et le navigateur
+affiche en général une connexion réinitialisée, pas le formulaire.
+"""
+import hashlib
+import os
+import uuid
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, StopFutureHandlers, StopUpload
+
+from .documents import DOCUMENT_FIELDS
+from .uploads import ALLOWED_EXTENSIONS, SNIFF_SIZE, sniff_document, upload_dir
+
+
+class StreamedDocument(UploadedFile):
+    """Document reçu, déjà sur le volume média ; ``sha256`` en hexadécimal."""
+
+    def __init__(self, path, name, content_type, size, charset, sha256):
+        super().__init__(open(path, "rb"), name, content_type, size, charset)
+        self._path = path
+        self.sha256 = sha256
+
+    def temporary_file_path(self):
+        return self._path
+
+    def close(self):
+        try:
+            return self.file.close()
+        except FileNotFoundError:
+            pass  # déjà supprimé après enregistrement
+
+
+class ApplicationDocumentUploadHandler(FileUploadHandler):
+    chunk_size = 64 * 1024
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.request_total = 0
+        self.request_length = 0
+        self.destination = None
+        self.path = None
+        self.paths = []
+
+    def reject(self, message):
+        """Abandonne la réception ; la suite du corps n'est lue que sous la taille maximale."""
+        self._discard()
+        if self.request is not None:
+            self.request.upload_error = message
+        raise StopUpload(connection_reset=self.request_length > settings.WEBSITE_APPLICATION_MAX_REQUEST_SIZE)
+
+    def _discard(self):
+        if self.destination is not None:
+            self.destination.close()
+            self.destination = None
+        for path in self.paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        self.paths = []
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        # Refus différé au premier fichier : les champs qui le précèdent (jeton
+        # CSRF compris) restent lus et l'erreur peut être affichée.
+        self.request_length = content_length
+
+    def new_file(self, field_name, file_name, content_type, content_length, charset=None, content_type_extra=None):
+        super().new_file(field_name, file_name, content_type, content_length, charset, content_type_extra)
+        if self.request_length > settings.WEBSITE_APPLICATION_MAX_REQUEST_SIZE:
+            self.reject("Les documents joints dépassent la taille autorisée.")
+        if field_name not in DOCUMENT_FIELDS:
+            self.reject("Pièce jointe inattendue.")
+        if not file_name.lower().endswith(ALLOWED_EXTENSIONS):
+            self.reject("Formats acceptés : PDF, DOC, DOCX, ODT.")
+        directory = upload_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        # Nommé comme les téléversements par morceaux : les fichiers d'une
+        # requête interrompue sont purgés par purge_stale_uploads.
+        self.path = str(directory / f"{uuid.uuid4()}.part")
+        self.paths.append(self.path)
+        self.destination = open(self.path, "wb")
+        self.hasher = hashlib.sha256()
+        self.head = b""
+        self.size = 0
+        raise StopFutureHandlers()
+
+    def receive_data_chunk(self, raw_data, start):
+        self.size += len(raw_data)
+        self.request_total += len(raw_data)
+        if self.size > settings.WEBSITE_UPLOAD_MAX_SIZE:
+            self.reject("Fichier trop volumineux.")
+        if self.request_total > settings.WEBSITE_APPLICATION_MAX_REQUEST_SIZE:
+            self.reject("Les documents joints dépassent la taille autorisée.")
+        if len(self.head) < SNIFF_SIZE:
+            self.head += raw_data[:SNIFF_SIZE - len(self.head)]
+            if len(self.head) >= SNIFF_SIZE:
+                self._check_format()
+        self.hasher.update(raw_data)
+        self.destination.write(raw_data)
+        return None
+
+    def _check_format(self):
+        if not sniff_document(self.file_name, self.head):
+            self.reject("Le contenu du fichier ne correspond pas à un document PDF, DOC, DOCX ou ODT.")
+
+    def file_complete(self, file_size):
+        if self.destination is None:
+            return None
+        if len(self.head) < SNIFF_SIZE:
+            self._check_format()
+        self.destination.close()
+        self.destination = None
+        return StreamedDocument(
+            self.path, self.file_name, self.content_type, file_size, self.charset, self.hasher.hexdigest()
+        )
+
+    def upload_interrupted(self):
+        self._discard()
+
+
+def discard_documents(files):
+    """Supprime les documents reçus d'une candidature finalement refusée."""
+    for document in files.values():
+        if isinstance(document, StreamedDocument):
+            document.close()
+            try:
+                os.remove(document.temporary_file_path())
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,262 @@
+# website/uploads.py
+"""
+Téléversements reprenables des documents de candidature (sous-ensemble de
+tus 1.0 : creation, HEAD, PATCH, termination).
+
+    POST   recrutement/televersements/          Upload-Length, Upload-Metadata
+                                                -> 201, Location
+    HEAD   recrutement/televersements/<token>/  -> Upload-Offset, Upload-Length
+    PATCH  recrutement/televersements/<token>/  Upload-Offset + morceau
+                                                (application/offset+octet-stream)
+                                                -> 204, Upload-Offset
+    DELETE recrutement/televersements/<token>/  abandon
+
+Chaque PATCH est court (WEBSITE_UPLOAD_CHUNK_MAX) : une coupure réseau ne fait
+perdre que le morceau en cours et ne bloque un worker que le temps de ce
+morceau ; le client reprend au décalage renvoyé par HEAD. Les morceaux sont
+écrits à leur position dans MEDIA_ROOT/televersements/<token>.part ; le
+fichier complet est lié (lien physique, sans copie) à son emplacement
+définitif, puis supprimé une fois la candidature qui le référence enregistrée.
+purge_stale_uploads supprime les téléversements abandonnés.
+"""
+import base64
+import binascii
+import fcntl
+import logging
+import os
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files import File
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from .extraction import OLE_MAGIC, ZIP_MAGIC
+from .models import UploadSession
+
+logger = logging.getLogger(__name__)
+
+TUS_VERSION = "1.0.0"
+UPLOAD_DIRNAME = "televersements"
+READ_SIZE = 64 * 1024
+
+# Signatures (octets de tête) attendues par extension. Un ODT est un zip dont
+# la première entrée, non compressée, est « mimetype ».
+ODT_MIMETYPE = b"mimetypeapplication/vnd.oasis.opendocument.text"
+SIGNATURES = {
+    ".pdf": ((0, b"%PDF-"),),
+    ".doc": ((0, OLE_MAGIC),),
+    ".docx": ((0, ZIP_MAGIC),),
+    ".odt": ((0, ZIP_MAGIC), (30, ODT_MIMETYPE)),
+}
+ALLOWED_EXTENSIONS = tuple(SIGNATURES)
+# Octets de tête suffisant à reconnaître tous les formats
+SNIFF_SIZE = max(offset + len(magic) for rules in SIGNATURES.values() for offset, magic in rules)
+
+
+class UploadError(Exception):
+    """Requête de téléversement refusée ; ``status`` est le code HTTP à renvoyer."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+class AssembledUpload(File):
+    """
+    Fichier assemblé, prêt à être rattaché à un FileField.
+
+    ``temporary_file_path`` permet au stockage de le lier au lieu de le
+    recopier.
+    """
+
+    def __init__(self, path, name):
+        super().__init__(open(path, "rb"), name=name)
+        self._path = path
+
+    def temporary_file_path(self):
+        return self._path
+
+
+def sniff_document(filename, head):
+    """Vrai si les premiers octets ``head`` correspondent à l'extension de ``filename``."""
+    extension = os.path.splitext(filename.lower())[1]
+    rules = SIGNATURES.get(extension)
+    return bool(rules) and all(head[offset:offset + len(magic)] == magic for offset, magic in rules)
+
+
+def upload_dir():
+    return Path(settings.MEDIA_ROOT) / UPLOAD_DIRNAME
+
+
+def part_path(session):
+    return upload_dir() / f"{session.token}.part"
+
+
+def _parse_metadata(header):
+    """En-tête Upload-Metadata : « clé valeur-base64 » séparés par des virgules."""
+    metadata = {}
+    for pair in filter(None, (item.strip() for item in header.split(","))):
+        key, _, value = pair.partition(" ")
+        try:
+            metadata[key] = base64.b64decode(value, validate=True).decode() if value else ""
+        except (binascii.Error, UnicodeDecodeError):
+            raise UploadError("Upload-Metadata invalide.")
+    return metadata
+
+
+def client_ip(request):
+    """Adresse du client ; derrière WEBSITE_TRUSTED_PROXY_HOPS proxys, lue dans X-Forwarded-For."""
+    hops = settings.WEBSITE_TRUSTED_PROXY_HOPS
+    if hops:
+        forwarded = [part.strip() for part in request.META.get("HTTP_X_FORWARDED_FOR", "").split(",") if part.strip()]
+        if len(forwarded) >= hops:
+            return forwarded[-hops]
+    return request.META.get("REMOTE_ADDR") or None
+
+
+def create_upload(length_header, metadata_header, client_ip=None):
+    """
+    Ouvre un téléversement. Plafonds : WEBSITE_UPLOAD_MAX_SESSIONS_PER_CLIENT
+    téléversements ouverts par adresse (429) et WEBSITE_UPLOAD_MAX_PENDING_BYTES
+    annoncés au total (503) : des sessions ouvertes en masse ne remplissent
+    pas le disque d'ici leur purge.
+    """
+    try:
+        size = int(length_header)
+    except (TypeError, ValueError):
+        raise UploadError("Upload-Length manquant ou invalide.")
+    if size <= 0:
+        raise UploadError("Fichier vide.")
+    if size > settings.WEBSITE_UPLOAD_MAX_SIZE:
+        raise UploadError("Fichier trop volumineux.", status=413)
+
+    filename = os.path.basename(_parse_metadata(metadata_header or "").get("filename", "")).strip()
+    if not filename.lower().endswith(ALLOWED_EXTENSIONS):
+        raise UploadError("Formats acceptés : PDF, DOC, DOCX, ODT.", status=415)
+
+    open_sessions = UploadSession.objects.filter(client_ip=client_ip)
+    if client_ip and open_sessions.count() >= settings.WEBSITE_UPLOAD_MAX_SESSIONS_PER_CLIENT:
+        raise UploadError("Trop de téléversements en cours, merci de réessayer plus tard.", status=429)
+    pending = UploadSession.objects.aggregate(total=Sum("size"))["total"] or 0
+    if pending + size > settings.WEBSITE_UPLOAD_MAX_PENDING_BYTES:
+        logger.warning("Téléversements en cours : %s octets, nouvelle ouverture refusée", pending)
+        raise UploadError("Téléversement momentanément indisponible, merci de réessayer plus tard.", status=503)
+
+    session = UploadSession.objects.create(filename=filename[-255:], size=size, client_ip=client_ip)
+    upload_dir().mkdir(parents=True, exist_ok=True)
+    part_path(session).touch()
+    return session
+
+
+def append_chunk(session, offset_header, stream, content_length):
+    """
+    Écrit un morceau à ``Upload-Offset`` ; renvoie le nouveau décalage.
+
+    Le fichier .part est verrouillé (flock) pendant l'écriture et la mise à
+    jour du décalage : d'un PATCH concurrent, un seul écrit, l'autre reçoit
+    409 sans toucher au fichier. Le décalage est relu sous le verrou et le
+    fichier n'est jamais tronqué en deçà.
+    """
+    try:
+        offset = int(offset_header)
+    except (TypeError, ValueError):
+        raise UploadError("Upload-Offset manquant ou invalide.")
+    if offset != session.offset:
+        raise UploadError("Décalage inattendu.", status=409)
+    if content_length > settings.WEBSITE_UPLOAD_CHUNK_MAX or offset + content_length > session.size:
+        raise UploadError("Morceau trop volumineux.", status=413)
+
+    path = part_path(session)
+    try:
+        destination = open(path, "r+b")
+    except FileNotFoundError:
+        raise UploadError("Téléversement introuvable.", status=404)
+    with destination:
+        try:
+            fcntl.flock(destination, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            raise UploadError("Morceau déjà en cours d'écriture.", status=409)
+        committed = UploadSession.objects.filter(pk=session.pk).values_list("offset", flat=True).first()
+        if committed is None:
+            raise UploadError("Téléversement introuvable.", status=404)
+        if committed != offset:
+            raise UploadError("Décalage inattendu.", status=409)
+
+        written = 0
+        destination.seek(offset)
+        while written < content_length:
+            try:
+                data = stream.read(min(READ_SIZE, content_length - written))
+            except OSError:  # UnreadablePostError
+                data = b""
+            if not data:
+                break  # connexion coupée : on garde ce qui est arrivé
+            destination.write(data)
+            written += len(data)
+        # Restes d'un morceau interrompu au-delà ; jamais en deçà de ``offset``
+        destination.truncate()
+        destination.flush()
+
+        new_offset = offset + written
+        # Contrôle du format dès que l'en-tête du fichier est complet
+        if offset < min(SNIFF_SIZE, session.size) <= new_offset:
+            destination.seek(0)
+            if not sniff_document(session.filename, destination.read(SNIFF_SIZE)):
+                discard_upload(session)
+                raise UploadError("Le contenu du fichier ne correspond pas à un document PDF, DOC, DOCX ou ODT.", status=415)
+
+        updated = UploadSession.objects.filter(pk=session.pk, offset=offset).update(
+            offset=new_offset, updated_at=timezone.now()
+        )
+    if not updated:
+        raise UploadError("Décalage inattendu.", status=409)
+    return new_offset
+
+
+def discard_upload(session):
+    part_path(session).unlink(missing_ok=True)
+    session.delete()
+
+
+def is_ready(token):
+    """Le téléversement ``token`` existe et est complet."""
+    return UploadSession.objects.filter(token=token, offset__gte=F("size")).exists()
+
+
+def claim_upload(token):
+    """
+    Consomme un téléversement complet et renvoie le fichier à rattacher.
+
+    À appeler dans la transaction qui enregistre la candidature : la session
+    est verrouillée puis supprimée, un jeton ne sert qu'une fois.
+    """
+    session = UploadSession.objects.select_for_update().filter(token=token).first()
+    if session is None or not session.is_complete:
+        raise UploadError("Document introuvable ou incomplet, merci de le téléverser à nouveau.", status=404)
+    path = part_path(session)
+    if not path.exists():
+        raise UploadError("Document introuvable ou incomplet, merci de le téléverser à nouveau.", status=404)
+    session.delete()
+    return AssembledUpload(str(path), session.filename)
+
+
+def purge_stale_uploads(max_age=None):
+    """Supprime les téléversements inactifs depuis ``max_age`` ; renvoie leur nombre."""
+    max_age = max_age or timedelta(seconds=settings.WEBSITE_UPLOAD_TTL)
+    cutoff = timezone.now() - max_age
+    stale = list(UploadSession.objects.filter(updated_at__lt=cutoff))
+    for session in stale:
+        discard_upload(session)
+
+    # Fichiers sans session (session supprimée mais déplacement interrompu)
+    directory = upload_dir()
+    if directory.is_dir():
+        known = {f"{token}.part" for token in UploadSession.objects.values_list("token", flat=True)}
+        for path in directory.glob("*.part"):
+            if path.name not in known and path.stat().st_mtime < cutoff.timestamp():
+                path.unlink(missing_ok=True)
+    if stale:
+        logger.info("%s téléversement(s) abandonné(s) supprimé(s)", len(stale))
+    return len(stale)
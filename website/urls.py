@@ -19,12 +19,19 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import path
 
-from website.views import HomePageView, JobOfferListView, JobOfferDetailView, newsletter_subscribe
+from website.views import HomePageView, JobOfferListView, JobOfferDetailView, newsletter_subscribe, \
+    newsletter_unsubscribe, newsletter_open, newsletter_click, upload_create, upload_detail
 
 urlpatterns = [
                   path("", HomePageView.as_view(), name="home"),
                   path("newsletter/subscribe/", newsletter_subscribe, name="newsletter_subscribe"),
+                  path("newsletter/desinscription/<str:token>/", newsletter_unsubscribe,
+                       name="newsletter_unsubscribe"),
+                  path("newsletter/o/<int:campaign_id>/", newsletter_open, name="newsletter_open"),
+                  path("newsletter/c/<str:token>/", newsletter_click, name="newsletter_click"),
                   path("recrutement/", JobOfferListView.as_view(), name="job_list"),
+                  path("recrutement/televersements/", upload_create, name="upload_create"),
+                  path("recrutement/televersements/<uuid:token>/", upload_detail, name="upload_detail"),
                   path("recrutement/<slug:slug>/", JobOfferDetailView.as_view(), name="job_detail"),
 
               ] + static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
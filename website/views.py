@@ -1,17 +1,45 @@
-from django.http import HttpResponseRedirect
-from django.shortcuts import render, redirect
+import logging
+
+from django.conf import settings
+from django.core import signing
+from django.core.signing import BadSignature
+from django.db import transaction
+from django.db.models import Q
+from django.http import Http404, HttpResponse, HttpResponseRedirect, JsonResponse
+from django.shortcuts import get_object_or_404, render, redirect
 
 # Create your views here.
 # website/views.py
-from django.urls import reverse_lazy
-from django.views.decorators.http import require_POST
+from django.urls import reverse, reverse_lazy
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.utils.http import urlencode
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
+from django.views.decorators.http import require_GET, require_POST, require_http_methods
 from django.views.generic import FormView, ListView, DetailView
 from django.contrib import messages
 
-from .models import Service, PricingPlan, Testimonial, FAQ, NewsletterSubscriber, JobOffer
+from .campaigns import CLICK_SALT, unsubscribe_signer
+from .cache import HOME_SCOPE, JOBS_SCOPE, cache_anonymous_page, conditional_page
+from .documents import attach_document
+from .ingest import enqueue_contact_request
+from .models import ContactRequest, NewsletterSubscriber, JobOffer, UploadSession
+from .outbox import queue_application_receipt
+from .pagination import keyset_page
+from .search import render_headline, search_job_offers
+from .signals import contact_requests_received
+from .snapshot import get_home_snapshot
+from .tracking import PIXEL_GIF, record_click, record_open
+from .upload_handlers import ApplicationDocumentUploadHandler, discard_documents
+from .uploads import (
+    TUS_VERSION, UploadError, append_chunk, claim_upload, client_ip, create_upload, discard_upload,
+)
 from .forms import ContactForm, JobApplicationForm, NewsletterSubscribeForm
 
+logger = logging.getLogger(__name__)
+
 
+@method_decorator([conditional_page(HOME_SCOPE), cache_anonymous_page(HOME_SCOPE)], name="dispatch")
 class HomePageView(FormView):
     """
     One-page pour tout le site (sections Accueil, À propos, Services,
@@ -22,53 +50,189 @@ class HomePageView(FormView):
     success_url = reverse_lazy("website:home")
 
     def form_valid(self, form):
-        form.save()  # enregistrement en base
-        # Optionnel: ici tu peux ajouter un envoi d’email
+        self.store_contact_request(form)
         messages.success(
             self.request,
             "Votre demande a bien été envoyée. Un consultant vous contactera rapidement."
         )
         return super().form_valid(form)
 
+    def store_contact_request(self, form):
+        # Écriture différée : la demande part dans le flux Redis et sera
+        # insérée (puis notifiée) par la tâche ingest_contact_requests.
+        if settings.WEBSITE_CONTACT_WRITE_BEHIND:
+            try:
+                enqueue_contact_request(form.cleaned_data)
+                return
+            except Exception:
+                logger.exception("Flux contact indisponible, enregistrement direct")
+        with transaction.atomic():
+            contact = form.save()
+            contact_requests_received.send(sender=ContactRequest, requests=[contact])
+
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
+        # services, pricing_plans, featured_plan, testimonials, faqs, hero_slides
+        # (snapshot pré-sérialisé, une seule lecture Redis)
+        ctx.update(get_home_snapshot())
+        return ctx
 
-        ctx["services"] = Service.objects.filter(is_active=True)
-        ctx["pricing_plans"] = PricingPlan.objects.filter(is_active=True)
-        ctx["featured_plan"] = ctx["pricing_plans"].filter(is_featured=True).first()
-        ctx["testimonials"] = Testimonial.objects.filter(is_active=True)[:4]
-        ctx["faqs"] = FAQ.objects.filter(is_active=True)
 
-        return ctx
+def _wants_json(request):
+    return (
+        request.headers.get("x-requested-with") == "XMLHttpRequest"
+        or "application/json" in request.headers.get("accept", "")
+    )
 
 
 @require_POST
 def newsletter_subscribe(request):
     form = NewsletterSubscribeForm(request.POST)
     if form.is_valid():
-        subscriber, created = NewsletterSubscriber.objects.get_or_create(
-            email=form.cleaned_data["email"],
-            defaults={"full_name": form.cleaned_data.get("full_name", "")},
+        # Une seule requête : INSERT ... ON CONFLICT (email) DO UPDATE SET is_active = true
+        NewsletterSubscriber.objects.bulk_create(
+            [NewsletterSubscriber(
+                email=form.cleaned_data["email"],
+                full_name=form.cleaned_data.get("full_name", ""),
+                is_active=True,
+            )],
+            update_conflicts=True,
+            unique_fields=["email"],
+            update_fields=["is_active"],
         )
-        if not created and not subscriber.is_active:
-            subscriber.is_active = True
-            subscriber.save(update_fields=["is_active"])
-        messages.success(request, "Merci, vous êtes inscrit à notre newsletter.")
+        ok, message = True, "Merci, vous êtes inscrit à notre newsletter."
     else:
-        messages.error(request, "Veuillez saisir un email valide.")
+        ok, message = False, "Veuillez saisir un email valide."
+
+    if _wants_json(request):
+        # Formulaire du pied de page soumis en fetch : pas de rechargement.
+        return JsonResponse({"ok": ok, "message": message}, status=200 if ok else 400)
+    (messages.success if ok else messages.error)(request, message)
     return HttpResponseRedirect(request.META.get("HTTP_REFERER", reverse_lazy("website:home")))
 
 
+@csrf_exempt
+@require_http_methods(["GET", "POST"])
+def newsletter_unsubscribe(request, token):
+    """
+    Lien de désinscription signé des newsletters.
+
+    GET affiche une confirmation (les antivirus de messagerie suivent les
+    liens) ; POST désinscrit, y compris le POST « one-click » des clients mail
+    (RFC 8058, sans jeton CSRF : la signature fait foi).
+    """
+    try:
+        subscriber_id = unsubscribe_signer().unsign(token)
+    except BadSignature:
+        raise Http404("Lien de désinscription invalide.")
+    subscriber = get_object_or_404(NewsletterSubscriber, pk=subscriber_id)
+    done = request.method == "POST"
+    if done and subscriber.is_active:
+        NewsletterSubscriber.objects.filter(pk=subscriber.pk).update(is_active=False)
+    return render(request, "website/newsletter_unsubscribe.html", {"subscriber": subscriber, "done": done})
+
+
+def _tracked_subscriber(request):
+    try:
+        return int(unsubscribe_signer().unsign(request.GET.get("s", "")))
+    except (BadSignature, ValueError):
+        return None
+
+
+@require_GET
+def newsletter_open(request, campaign_id):
+    """Pixel d'ouverture : réponse immédiate, comptage dans Redis (tracking.py)."""
+    record_open(campaign_id, _tracked_subscriber(request))
+    response = HttpResponse(PIXEL_GIF, content_type="image/gif")
+    response["Cache-Control"] = "no-store, private"
+    return response
+
+
+@require_GET
+def newsletter_click(request, token):
+    """Redirection d'un lien de newsletter ; la cible est signée dans le jeton."""
+    try:
+        data = signing.loads(token, salt=CLICK_SALT)
+    except BadSignature:
+        raise Http404("Lien invalide.")
+    record_click(data["c"], data["u"], _tracked_subscriber(request))
+    return HttpResponseRedirect(data["u"])
+
+
+@method_decorator(
+    [
+        conditional_page(JOBS_SCOPE),
+        cache_anonymous_page(JOBS_SCOPE, query_params=("contrat", "lieu", "ouvertes", "apres"), uncached_params=("q",)),
+    ],
+    name="dispatch",
+)
 class JobOfferListView(ListView):
+    """
+    Offres publiées, paginées par clé (?apres=<curseur>) et filtrables par
+    type de contrat, lieu et offres encore ouvertes (?ouvertes=1).
+
+    Avec ?q=, les offres sont recherchées en plein texte (search.py) et
+    triées par pertinence ; seuls les meilleurs résultats sont affichés.
+
+    Seules les colonnes affichées sont lues : la description complète n'est
+    chargée que sur la page de détail.
+    """
     model = JobOffer
     template_name = "website/job_list.html"
     context_object_name = "offers"
+    page_size = 20
+    search_limit = 50
+    list_fields = ("title", "slug", "location", "contract_type", "short_description", "published_at")
+
+    def get_filters(self):
+        params = self.request.GET
+        contract_type = params.get("contrat", "")
+        if contract_type not in dict(JobOffer.CONTRACT_CHOICES):
+            contract_type = ""
+        return {
+            "contrat": contract_type,
+            "lieu": params.get("lieu", "").strip(),
+            "ouvertes": params.get("ouvertes") == "1",
+            "q": params.get("q", "").strip()[:100],
+        }
 
     def get_queryset(self):
-        qs = JobOffer.objects.filter(is_published=True)
-        return qs
+        self.filters = self.get_filters()
+        qs = JobOffer.objects.filter(is_published=True, published_at__isnull=False)
+        if self.filters["contrat"]:
+            qs = qs.filter(contract_type=self.filters["contrat"])
+        if self.filters["lieu"]:
+            qs = qs.filter(location=self.filters["lieu"])
+        if self.filters["ouvertes"]:
+            qs = qs.filter(Q(closing_date__isnull=True) | Q(closing_date__gt=timezone.now()))
+        return qs.only(*self.list_fields)
+
+    def get_context_data(self, **kwargs):
+        if self.filters["q"]:
+            offers, next_cursor = list(search_job_offers(self.filters["q"], self.object_list)[:self.search_limit]), None
+            for offer in offers:
+                offer.highlight = render_headline(offer.headline)
+        else:
+            offers, next_cursor = keyset_page(self.object_list, self.request.GET.get("apres"), self.page_size)
+        kwargs["object_list"] = offers
+        ctx = super().get_context_data(**kwargs)
+        query = {key: value for key, value in self.filters.items() if value}
+        if query.get("ouvertes"):
+            query["ouvertes"] = "1"
+        ctx["filters"] = self.filters
+        ctx["contract_choices"] = JobOffer.CONTRACT_CHOICES
+        ctx["locations"] = (
+            JobOffer.objects.filter(is_published=True)
+            .order_by("location").values_list("location", flat=True).distinct()
+        )
+        ctx["filter_query"] = urlencode(query)
+        ctx["is_first_page"] = bool(self.filters["q"]) or not self.request.GET.get("apres")
+        if next_cursor:
+            ctx["next_query"] = urlencode({**query, "apres": next_cursor})
+        return ctx
 
 
+@method_decorator([csrf_exempt, conditional_page(JOBS_SCOPE), cache_anonymous_page(JOBS_SCOPE)], name="dispatch")
 class JobOfferDetailView(DetailView):
     model = JobOffer
     template_name = "website/job_detail.html"
@@ -79,21 +243,100 @@ class JobOfferDetailView(DetailView):
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
         ctx["form"] = JobApplicationForm()
+        ctx["upload_chunk_size"] = settings.WEBSITE_UPLOAD_CHUNK_SIZE
         return ctx
 
     def post(self, request, *args, **kwargs):
+        # Offre close : refus avant de lire le corps (ni documents reçus, ni
+        # formulaire analysé).
         self.object = self.get_object()
+        if not self.object.accepts_applications:
+            messages.error(request, "Cette offre n'accepte plus de candidatures.")
+            return redirect("website:job_detail", slug=self.object.slug)
+        # Les documents sont reçus en flux (upload_handlers.py) : le handler doit
+        # être installé avant toute lecture du corps, donc avant la vérification
+        # CSRF du middleware (vue exemptée, contrôle rétabli par csrf_protect).
+        request.upload_handlers = [ApplicationDocumentUploadHandler(request)]
+        return self.submit_application(request, *args, **kwargs)
+
+    @method_decorator(csrf_protect)
+    def submit_application(self, request, *args, **kwargs):
         form = JobApplicationForm(request.POST, request.FILES)
+        upload_error = getattr(request, "upload_error", None)
+        if upload_error:
+            form.add_error(None, upload_error)
         if form.is_valid():
             application = form.save(commit=False)
             application.job_offer = self.object
-            application.save()
-            messages.success(
-                request,
-                "Votre candidature a bien été envoyée. Merci pour votre intérêt."
-            )
-            return redirect("website:job_detail", slug=self.object.slug)
+            try:
+                with transaction.atomic():
+                    # Documents téléversés par morceaux (uploads.py) ou reçus avec
+                    # le formulaire, stockés par contenu (documents.py). Tous les
+                    # jetons sont réservés avant de stocker le moindre fichier.
+                    documents = {field: claim_upload(token) for field, token in form.upload_tokens().items()}
+                    documents.update(form.uploaded_documents())
+                    for field, document in documents.items():
+                        attach_document(application, field, document)
+                    application.save()
+                    queue_application_receipt(application)
+            except UploadError as exc:
+                form.add_error(None, str(exc))
+            else:
+                messages.success(
+                    request,
+                    "Votre candidature a bien été envoyée. Merci pour votre intérêt."
+                )
+                return redirect("website:job_detail", slug=self.object.slug)
 
+        discard_documents(request.FILES)
         ctx = self.get_context_data()
         ctx["form"] = form
         return self.render_to_response(ctx)
+
+
+def _tus_response(status, message="", session=None):
+    response = HttpResponse(message, status=status, content_type="text/plain; charset=utf-8")
+    response["Tus-Resumable"] = TUS_VERSION
+    response["Cache-Control"] = "no-store"
+    if session is not None:
+        response["Upload-Offset"] = str(session.offset)
+        response["Upload-Length"] = str(session.size)
+    return response
+
+
+@require_POST
+def upload_create(request):
+    """Ouvre un téléversement reprenable (voir website/uploads.py)."""
+    try:
+        session = create_upload(
+            request.headers.get("Upload-Length"), request.headers.get("Upload-Metadata"), client_ip(request)
+        )
+    except UploadError as exc:
+        return _tus_response(exc.status, str(exc))
+    response = _tus_response(201, session=session)
+    response["Location"] = reverse("website:upload_detail", args=[session.token])
+    return response
+
+
+@require_http_methods(["HEAD", "PATCH", "DELETE"])
+def upload_detail(request, token):
+    """Décalage courant (HEAD), ajout d'un morceau (PATCH) ou abandon (DELETE)."""
+    session = UploadSession.objects.filter(token=token).first()
+    if session is None:
+        return _tus_response(404, "Téléversement introuvable.")
+    if request.method == "HEAD":
+        return _tus_response(200, session=session)
+    if request.method == "DELETE":
+        discard_upload(session)
+        return _tus_response(204)
+
+    if request.content_type != "application/offset+octet-stream":
+        return _tus_response(415, "Content-Type attendu : application/offset+octet-stream.")
+    try:
+        content_length = int(request.META.get("CONTENT_LENGTH") or 0)
+        session.offset = append_chunk(session, request.headers.get("Upload-Offset"), request, content_length)
+    except ValueError:
+        return _tus_response(400, "Content-Length invalide.")
+    except UploadError as exc:
+        return _tus_response(exc.status, str(exc), session=session)
+    return _tus_response(204, session=session)
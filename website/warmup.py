@@ -0,0 +1,70 @@
+# website/warmup.py
+"""
+Préchauffage d'un worker fraîchement forké (voir gunicorn.conf.py).
+
+Un worker gunicorn est recyclé toutes les ~800 requêtes : sans préchauffage,
+sa première requête paie la compilation de home.html et de ses layouts, la
+construction du resolver d'URLs, la lecture du manifeste des statiques et le
+snapshot de la home. On fait tout cela au démarrage du worker, avant qu'il
+n'accepte des connexions.
+"""
+import logging
+import time
+
+from django.contrib.auth.models import AnonymousUser
+from django.template.loader import get_template
+from django.test import RequestFactory
+from django.urls import get_resolver, resolve, reverse
+
+from .cache import JOBS_SCOPE, get_content_version
+from .snapshot import get_home_snapshot
+
+logger = logging.getLogger(__name__)
+
+# Gabarits publics, compilés une fois puis gardés par le loader "cached"
+# (actif par défaut quand TEMPLATES ne précise pas de loaders).
+PUBLIC_TEMPLATES = (
+    "layout/base.html",
+    "layout/nav.html",
+    "website/home.html",
+    "website/job_list.html",
+    "website/job_detail.html",
+    "website/partials/messages.html",
+    "website/partials/hero_text_slide.html",
+    "website/partials/hero_visual_slide.html",
+)
+
+# Pages rendues à blanc : exerce tags, filtres et {% static %} (manifeste)
+# et remplit le cache de pages anonymes s'il est vide.
+WARMUP_URL_NAMES = ("website:home", "website:job_list")
+
+
+def _render(path):
+    request = RequestFactory().get(path)
+    request.user = AnonymousUser()
+    response = resolve(path).func(request)
+    if hasattr(response, "render") and callable(response.render):
+        response.render()
+    return response.status_code
+
+
+def warm_up():
+    """Prépare le worker courant ; renvoie la durée en secondes."""
+    started = time.perf_counter()
+    steps = (
+        ("templates", lambda: [get_template(name) for name in PUBLIC_TEMPLATES]),
+        ("urls", lambda: get_resolver().reverse_dict),
+        ("home_snapshot", get_home_snapshot),
+        ("jobs_version", lambda: get_content_version(JOBS_SCOPE)),
+        ("pages", lambda: [_render(reverse(name)) for name in WARMUP_URL_NAMES]),
+    )
+    for label, step in steps:
+        try:
+            step()
+        except Exception:
+            # Un préchauffage raté ne doit jamais empêcher le worker de servir.
+            logger.exception("Préchauffage : étape %s en échec", label)
+
+    elapsed = time.perf_counter() - started
+    logger.info("Préchauffage du worker terminé en %.0f ms", elapsed * 1000)
+    return elapsed